@@ -0,0 +1,73 @@
+"""Differential check and parse-time benchmark for the HTML parser engines.
+
+Runs CodeforcesHTMLParser.parse_problem (BeautifulSoup) and
+CodeforcesHTMLParser.parse_problem_lxml (lxml + XPath) over every page in
+benchmarks/fixtures, fails if their results differ and reports the speedup.
+
+Usage: python3 benchmarks/parser_benchmark.py [--repeat N]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from src.html_parser import CodeforcesHTMLParser
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def time_parser(parse, html: str, repeat: int) -> float:
+    """Best-of-repeat parse time in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(html)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20, help='Timing repetitions per page')
+    args = parser.parse_args()
+    
+    fixtures = sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html")))
+    if not fixtures:
+        print(f"No fixtures found in {FIXTURE_DIR}")
+        return 1
+    
+    mismatches = 0
+    total_bs4 = total_lxml = 0.0
+    print(f"{'page':<40} {'KB':>7} {'bs4 ms':>9} {'lxml ms':>9} {'speedup':>8}")
+    for path in fixtures:
+        with open(path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        name = os.path.basename(path)
+        reference = CodeforcesHTMLParser.parse_problem(html)
+        fast = CodeforcesHTMLParser.parse_problem_lxml(html)
+        if not CodeforcesHTMLParser.results_match(reference, fast):
+            mismatches += 1
+            print(f"MISMATCH {name}")
+            for key in reference:
+                if key != 'created_date' and reference[key] != fast.get(key):
+                    print(f"  {key}: bs4={reference[key]!r:.200} lxml={fast.get(key)!r:.200}")
+            continue
+        
+        bs4_ms = time_parser(CodeforcesHTMLParser.parse_problem, html, args.repeat)
+        lxml_ms = time_parser(CodeforcesHTMLParser.parse_problem_lxml, html, args.repeat)
+        total_bs4 += bs4_ms
+        total_lxml += lxml_ms
+        print(f"{name:<40} {len(html) / 1024:>7.1f} {bs4_ms:>9.2f} {lxml_ms:>9.2f} {bs4_ms / lxml_ms:>7.1f}x")
+    
+    if total_lxml:
+        print(f"{'total':<40} {'':>7} {total_bs4:>9.2f} {total_lxml:>9.2f} {total_bs4 / total_lxml:>7.1f}x")
+    if mismatches:
+        print(f"{mismatches} page(s) parsed differently")
+        return 1
+    print(f"All {len(fixtures)} pages parsed identically")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
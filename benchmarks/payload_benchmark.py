@@ -0,0 +1,100 @@
+"""Size and latency of full-page vs statement-only payloads, plain and gzip-compressed.
+
+Every fixture page in benchmarks/fixtures is sent to /receive through the
+Flask test client in four forms: the full page and just the
+.problem-statement fragment (what the extension sends in compact mode),
+each as plain JSON and gzip-compressed. Each request is timed until its
+job has finished, so parsing and writing the files are included.
+
+Usage: python3 benchmarks/payload_benchmark.py [--repeat N]
+"""
+import argparse
+import glob
+import gzip
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def make_workspace() -> str:
+    """Create a scratch directory with settings that write problems into it"""
+    workspace = tempfile.mkdtemp(prefix='cf-payload-bench-')
+    with open(os.path.join(ROOT, 'config', 'settings.json'), 'r', encoding='utf-8') as f:
+        settings = json.load(f)
+    settings['output_directory'] = os.path.join(workspace, 'problems')
+    settings['template_directory'] = os.path.join(ROOT, 'templates')
+    settings['auto_open_files'] = False
+    settings['archive'] = {'enabled': False}
+    os.makedirs(os.path.join(workspace, 'config'))
+    with open(os.path.join(workspace, 'config', 'settings.json'), 'w', encoding='utf-8') as f:
+        json.dump(settings, f)
+    return workspace
+
+def extract_statement(html: str) -> str:
+    """The .problem-statement fragment, as document.querySelector(...).outerHTML would give it"""
+    from lxml import html as lxml_html
+    root = lxml_html.document_fromstring(html)
+    statement = root.find_class('problem-statement')
+    return lxml_html.tostring(statement[0], encoding='unicode') if statement else html
+
+def send(client, html: str, url: str, compress: bool) -> tuple:
+    """POST one payload and wait for its job; returns (body bytes, seconds)"""
+    body = json.dumps({'html': html, 'url': url}).encode('utf-8')
+    headers = {'Content-Type': 'application/json'}
+    if compress:
+        body = gzip.compress(body)
+        headers['Content-Encoding'] = 'gzip'
+    start = time.perf_counter()
+    response = client.post('/receive', data=body, headers=headers)
+    job_id = response.get_json()['job_id']
+    while client.get(f'/jobs/{job_id}').get_json()['status'] in ('queued', 'running'):
+        time.sleep(0.0005)
+    return len(body), time.perf_counter() - start
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10, help='Requests per page and payload form')
+    args = parser.parse_args()
+    
+    workspace = make_workspace()
+    os.chdir(workspace)
+    sys.path.insert(0, ROOT)
+    import io
+    import contextlib
+    with contextlib.redirect_stdout(io.StringIO()):
+        import cf_receiver
+    client = cf_receiver.app.test_client()
+    
+    forms = [('full', False, False), ('full+gzip', False, True),
+             ('compact', True, False), ('compact+gzip', True, True)]
+    print(f"{'page':<34} {'payload':<13} {'KB':>8} {'median ms':>10}")
+    try:
+        for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.html'))):
+            with open(path, 'r', encoding='utf-8') as f:
+                page = f.read()
+            fragment = extract_statement(page)
+            for name, compact, compress in forms:
+                html = fragment if compact else page
+                timings = []
+                for i in range(args.repeat):
+                    # A distinct URL per request, so submissions are not merged into one job
+                    url = f"https://codeforces.com/contest/{900000 + i}/problem/A"
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        size, seconds = send(client, html, url, compress)
+                    timings.append(seconds)
+                timings.sort()
+                print(f"{os.path.basename(path):<34} {name:<13} {size / 1024:>8.1f} "
+                      f"{timings[len(timings) // 2] * 1000:>10.2f}")
+    finally:
+        cf_receiver.jobs.shutdown()
+        os.chdir(ROOT)
+        shutil.rmtree(workspace, ignore_errors=True)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Receiver startup cost: import time per module and first vs later request latency.
+
+Runs `python -X importtime -c "import cf_receiver"` in a fresh interpreter
+and reports the total and the most expensive top-level imports. Then, in
+fresh interpreters with and without the pre-warm step, sends a series of
+/receive requests through the Flask test client and compares the first
+request with the later ones.
+
+Usage: python3 benchmarks/startup_benchmark.py [--repeat N] [--requests N] [--top N]
+                                               [--importtime-log FILE] [--output results.json]
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+from typing import Dict, Any, List, Tuple
+
+from suite import ROOT, FIXTURE_DIR, make_workspace, scratch_root
+
+IMPORTTIME_PATTERN = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+# Runs in the child interpreter: import the receiver, optionally pre-warm, then time requests
+REQUEST_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import cf_receiver
+import_ms = (time.perf_counter() - start) * 1000
+prewarm_ms = 0.0
+if sys.argv[1] == 'prewarm':
+    start = time.perf_counter()
+    cf_receiver.prewarm()
+    prewarm_ms = (time.perf_counter() - start) * 1000
+html = open(sys.argv[2], encoding='utf-8').read()
+client = cf_receiver.app.test_client()
+timings = []
+for i in range(int(sys.argv[3])):
+    start = time.perf_counter()
+    job_id = client.post('/receive', json={'html': html, 'url': f'https://codeforces.com/contest/{int(sys.argv[4]) + i}/problem/A'}).get_json()['job_id']
+    while client.get(f'/jobs/{job_id}').get_json()['status'] in ('queued', 'running'):
+        time.sleep(0.0002)
+    timings.append((time.perf_counter() - start) * 1000)
+cf_receiver.jobs.shutdown()
+print(json.dumps({'import_ms': import_ms, 'prewarm_ms': prewarm_ms, 'requests_ms': timings}))
+'''
+
+def parse_importtime(log: str) -> List[Tuple[str, int, int, int]]:
+    """(module, depth, self us, cumulative us) for every line of an importtime log"""
+    modules = []
+    for line in log.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match:
+            modules.append((match.group(4), len(match.group(3)) // 2, int(match.group(1)), int(match.group(2))))
+    return modules
+
+def child_env() -> Dict[str, str]:
+    """Environment for child interpreters that can import the repository modules"""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    return env
+
+def measure_imports(workspace: str, repeat: int) -> Tuple[float, List[Tuple[str, int, int, int]], str]:
+    """Best total import time of cf_receiver in milliseconds, with the module breakdown of that run"""
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import cf_receiver'],
+                                cwd=workspace, env=child_env(), capture_output=True, text=True)
+        modules = parse_importtime(result.stderr)
+        total = next((cumulative for name, depth, _, cumulative in modules if name == 'cf_receiver'), None)
+        if total is None:
+            raise RuntimeError(f"Importing cf_receiver failed:\n{result.stderr[-2000:]}")
+        if best is None or total < best[0]:
+            best = (total, modules, result.stderr)
+    return best[0] / 1000, best[1], best[2]
+
+def measure_requests(workspace: str, page: str, requests: int, prewarm: bool, first_contest: int) -> Dict[str, Any]:
+    """Import, pre-warm and per-request times from a fresh interpreter"""
+    # Every request uses a new contest number, so none hits the unchanged-page shortcut
+    command = [sys.executable, '-c', REQUEST_SCRIPT, 'prewarm' if prewarm else 'cold', page,
+               str(requests), str(first_contest)]
+    result = subprocess.run(command, cwd=workspace, env=child_env(), capture_output=True, text=True)
+    lines = [line for line in result.stdout.splitlines() if line.startswith('{')]
+    if result.returncode != 0 or not lines:
+        raise RuntimeError(f"Request benchmark failed:\n{result.stderr[-2000:]}")
+    return json.loads(lines[-1])
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh interpreters per measurement')
+    parser.add_argument('--requests', type=int, default=10, help='Requests sent by each interpreter')
+    parser.add_argument('--top', type=int, default=15, help='Number of top-level imports to list')
+    parser.add_argument('--page', default=os.path.join(FIXTURE_DIR, 'contest_1850A.html'), help='Page sent to /receive')
+    parser.add_argument('--importtime-log', help='Save the raw -X importtime output of the fastest run here')
+    parser.add_argument('--output', help='Write results to this JSON file')
+    args = parser.parse_args()
+    
+    workspace = make_workspace(scratch_root())
+    try:
+        import_ms, modules, log = measure_imports(workspace, args.repeat)
+        if args.importtime_log:
+            with open(args.importtime_log, 'w', encoding='utf-8') as f:
+                f.write(log)
+        # Direct imports of cf_receiver, i.e. depth 1 under it
+        top_level = sorted((m for m in modules if m[1] == 1), key=lambda m: -m[3])[:args.top]
+        print(f"import cf_receiver: {import_ms:.1f} ms (best of {args.repeat})")
+        print(f"{'module':<40} {'cumulative ms':>14} {'self ms':>9}")
+        for name, _, self_us, cumulative_us in top_level:
+            print(f"{name:<40} {cumulative_us / 1000:>14.2f} {self_us / 1000:>9.2f}")
+        
+        requests = {}
+        print(f"\n{'mode':<10} {'prewarm ms':>11} {'first ms':>9} {'later median ms':>16}")
+        first_contest = 700000
+        for mode in ('cold', 'prewarm'):
+            runs = []
+            for _ in range(args.repeat):
+                runs.append(measure_requests(workspace, args.page, args.requests, mode == 'prewarm', first_contest))
+                first_contest += args.requests
+            firsts = sorted(run['requests_ms'][0] for run in runs)
+            later = sorted(ms for run in runs for ms in run['requests_ms'][1:])
+            prewarms = sorted(run['prewarm_ms'] for run in runs)
+            requests[mode] = {
+                'prewarm_ms': round(prewarms[len(prewarms) // 2], 3),
+                'first_request_ms': round(firsts[len(firsts) // 2], 3),
+                'later_request_median_ms': round(later[len(later) // 2], 3) if later else None
+            }
+            stats = requests[mode]
+            print(f"{mode:<10} {stats['prewarm_ms']:>11.2f} {stats['first_request_ms']:>9.2f} "
+                  f"{(stats['later_request_median_ms'] or 0):>16.2f}")
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+    
+    if args.output:
+        report = {
+            'import_ms': round(import_ms, 3),
+            'imports': [{'module': name, 'cumulative_ms': cumulative_us / 1000, 'self_ms': self_us / 1000}
+                        for name, _, self_us, cumulative_us in top_level],
+            'requests': requests
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""Benchmark suite for the import pipeline, with JSON results for regression comparison.
+
+For every page in the fixture corpus (benchmarks/fixtures by default) it times the
+stages below. The bundled pages are synthetic, hand-written in the Codeforces
+markup; they are not copies of real problem pages. Real saved pages can be
+added to the corpus, or passed with --fixtures. It times:
+  parse_bs4 / parse_lxml / parse_fast  CodeforcesHTMLParser on the page
+  render                               TemplateManager.customize_template for the solution and metadata
+  create / create_unchanged            ProblemCreator.create_problem for a new problem and a re-import
+  receive / receive_unchanged          POST /receive through the Flask test client until the job is done
+
+Problems are written under a scratch directory on tmpfs (/dev/shm) when
+available, so disk speed does not dominate. Fixture names follow
+<contest|gym|problemset>_<contest><letter>[_note].html and give each page the URL
+the import pipeline is run with.
+
+Usage:
+  python3 benchmarks/suite.py [--repeat N] [--filter TEXT] [--output results.json]
+  python3 benchmarks/suite.py --compare baseline.json [--threshold 0.15]
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+FIXTURE_NAME_PATTERN = re.compile(r'^(contest|gym|problemset)_(\d+)([A-Z])')
+
+def fixture_url(name: str) -> str:
+    """The problem URL a fixture page is imported under"""
+    match = FIXTURE_NAME_PATTERN.match(name)
+    if not match:
+        return ''
+    kind, contest, letter = match.groups()
+    if kind == 'problemset':
+        return f"https://codeforces.com/problemset/problem/{contest}/{letter}"
+    return f"https://codeforces.com/{kind}/{contest}/problem/{letter}"
+
+def scratch_root() -> Optional[str]:
+    """A tmpfs directory for scratch output, or None to use the default temp directory"""
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    return None
+
+def make_workspace(root: Optional[str]) -> str:
+    """Create a scratch directory with settings that write problems into it"""
+    workspace = tempfile.mkdtemp(prefix='cf-bench-', dir=root)
+    with open(os.path.join(ROOT, 'config', 'settings.json'), 'r', encoding='utf-8') as f:
+        settings = json.load(f)
+    settings['output_directory'] = os.path.join(workspace, 'problems')
+    settings['template_directory'] = os.path.join(ROOT, 'templates')
+    settings['auto_open_files'] = False
+    settings['archive'] = {'enabled': True, 'directory': os.path.join(workspace, 'archive')}
+    settings['metrics'] = {'log_requests': False}
+    os.makedirs(os.path.join(workspace, 'config'))
+    with open(os.path.join(workspace, 'config', 'settings.json'), 'w', encoding='utf-8') as f:
+        json.dump(settings, f)
+    return workspace
+
+def measure(func: Callable[[int], Any], repeat: int) -> Dict[str, float]:
+    """Run func(i) once to warm up and repeat times timed; returns statistics in milliseconds"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(-1)
+        timings = []
+        for i in range(repeat):
+            start = time.perf_counter()
+            func(i)
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        'runs': repeat,
+        'min_ms': round(timings[0], 4),
+        'median_ms': round(timings[len(timings) // 2], 4),
+        'p90_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.9))], 4),
+        'mean_ms': round(sum(timings) / len(timings), 4)
+    }
+
+def wait_for_job(client, response) -> None:
+    """Block until the job behind a /receive response has finished"""
+    job_id = response.get_json()['job_id']
+    if job_id is None:
+        return
+    while client.get(f'/jobs/{job_id}').get_json()['status'] in ('queued', 'running'):
+        time.sleep(0.0002)
+
+def run_suite(fixtures: List[str], repeat: int, name_filter: str, workspace: str) -> Dict[str, Dict[str, float]]:
+    """Time every benchmark on every fixture"""
+    os.chdir(workspace)
+    sys.path.insert(0, ROOT)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import cf_receiver
+        from src.html_parser import CodeforcesHTMLParser
+        creator = cf_receiver.context.get_creator()
+    client = cf_receiver.app.test_client()
+    template_manager = creator.template_manager
+    
+    results = {}
+    try:
+        for path in fixtures:
+            name = os.path.basename(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                html = f.read()
+            url = fixture_url(name)
+            parsed = CodeforcesHTMLParser.parse_problem_fast(html)
+            parsed.update(problem_id=name, url=url, language='cpp')
+            solution_variables = template_manager.prepare_solution_variables(parsed)
+            metadata_variables = template_manager.prepare_metadata_variables(parsed)
+            
+            def render(i):
+                template_manager.customize_template('cpp_template', solution_variables)
+                template_manager.customize_template('metadata_template', metadata_variables)
+            
+            def receive(i, unchanged=False):
+                # A distinct URL per request unless timing the unchanged-page shortcut
+                page_url = url if unchanged else f"https://codeforces.com/contest/{800000 + i + 1}/problem/A"
+                wait_for_job(client, client.post('/receive', json={'html': html, 'url': page_url}))
+            
+            benchmarks = {
+                'parse_bs4': lambda i: CodeforcesHTMLParser.parse_problem(html),
+                'parse_lxml': lambda i: CodeforcesHTMLParser.parse_problem_lxml(html),
+                'parse_fast': lambda i: CodeforcesHTMLParser.parse_problem_fast(html),
+                'render': render,
+                'create': lambda i: creator.create_problem(f"bench{i + 1}_{name}", dict(parsed)),
+                'create_unchanged': lambda i: creator.create_problem(f"bench_{name}", dict(parsed)),
+                'receive': receive,
+                'receive_unchanged': lambda i: receive(i, unchanged=True)
+            }
+            for benchmark, func in benchmarks.items():
+                key = f"{benchmark}/{name}"
+                if name_filter and name_filter not in key:
+                    continue
+                results[key] = measure(func, repeat)
+                print(f"{key:<60} {results[key]['median_ms']:>10.3f} ms")
+    finally:
+        cf_receiver.jobs.shutdown()
+        os.chdir(ROOT)
+    return results
+
+def get_metadata(repeat: int, scratch: str) -> Dict[str, Any]:
+    """Describe the environment the results were measured in"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'repeat': repeat,
+        'scratch': scratch
+    }
+
+def compare(current: Dict[str, Dict[str, float]], baseline_path: str, threshold: float) -> int:
+    """Print median changes against a saved run; returns the number of regressions"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+    regressions = 0
+    print(f"\n{'benchmark':<60} {'base ms':>10} {'now ms':>10} {'change':>8}")
+    for key in sorted(current):
+        if key not in baseline:
+            continue
+        before = baseline[key]['median_ms']
+        after = current[key]['median_ms']
+        change = (after - before) / before if before else 0.0
+        flag = ''
+        if change > threshold:
+            regressions += 1
+            flag = '  REGRESSION'
+        print(f"{key:<60} {before:>10.3f} {after:>10.3f} {change:>+8.1%}{flag}")
+    print(f"\n{regressions} regression(s) above {threshold:.0%}")
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fixtures', default=FIXTURE_DIR, help='Directory of .html problem pages')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed runs per benchmark and page')
+    parser.add_argument('--filter', default='', help='Only run benchmarks whose name/page contains this text')
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Compare medians against results saved by an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='Relative slowdown reported as a regression (default: 0.15)')
+    args = parser.parse_args()
+    
+    fixtures = sorted(glob.glob(os.path.join(args.fixtures, '*.html')))
+    if not fixtures:
+        print(f"No fixtures found in {args.fixtures}")
+        return 1
+    
+    root = scratch_root()
+    workspace = make_workspace(root)
+    try:
+        results = run_suite(fixtures, args.repeat, args.filter, workspace)
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+    
+    report = {'meta': get_metadata(args.repeat, root or tempfile.gettempdir()), 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
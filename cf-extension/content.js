@@ -1,10 +1,25 @@
 (async () => {
-  const html = document.documentElement.outerHTML;
+  // Only the statement is needed; fall back to the whole page if it is missing
+  const statement = document.querySelector(".problem-statement");
+  const html = statement ? statement.outerHTML : document.documentElement.outerHTML;
   const url = window.location.href;
-  await fetch("http://localhost:8765/receive", {
+  const json = JSON.stringify({ html, url });
+  const body = await new Response(
+    new Blob([json]).stream().pipeThrough(new CompressionStream("gzip"))
+  ).arrayBuffer();
+  const response = await fetch("http://localhost:8765/receive", {
     method: "POST",
-    headers: {"Content-Type": "application/json"},
-    body: JSON.stringify({ html, url })
+    headers: {"Content-Type": "application/json", "Content-Encoding": "gzip"},
+    body
   });
-  alert("Codeforces problem HTML sent to your script!");
-})(); 
\ No newline at end of file
+  const job = await response.json();
+  if (!response.ok) {
+    alert(`Failed to send problem: ${job.error}`);
+    return;
+  }
+  if (job.status === "unchanged") {
+    alert(`Codeforces problem ${job.problem_id} is already up to date`);
+    return;
+  }
+  alert(`Codeforces problem ${job.problem_id || ""} queued (job ${job.job_id})`);
+})();
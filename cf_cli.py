@@ -0,0 +1,453 @@
+import sys
+import os
+import argparse
+import json
+from src.utils.config_parser import ConfigParser
+
+def cmd_import(args, config):
+    from src.batch_importer import BatchImporter
+    from src.problem_creator import ProblemCreator
+    if args.json:
+        with open(args.json, 'r', encoding='utf-8') as f:
+            pages = json.load(f)
+    else:
+        pages = BatchImporter.load_pages(args.paths)
+    if not pages:
+        print("No pages to import")
+        return 1
+    if args.no_open:
+        config.config['auto_open_files'] = False
+    creator = ProblemCreator(config)
+    importer = BatchImporter(creator, processes=args.processes or config.get('batch.processes'))
+    summary = importer.import_pages(pages)
+    # Let the editor launcher open everything in one go before exiting
+    creator.file_opener.flush()
+    for entry in summary:
+        if entry['status'] == 'created':
+            print(f"{entry['problem_id']:<12} created  {entry['test_case_count']} test(s)  {entry['problem_name']}")
+        else:
+            print(f"{str(entry['problem_id']):<12} failed   {entry['error']}")
+    failed = sum(1 for entry in summary if entry['status'] != 'created')
+    print(f"Imported {len(summary) - failed}/{len(summary)} problems")
+    return 1 if failed else 0
+
+def print_results(results):
+    from src.judge import RESULT_HEADER, format_result
+    print(RESULT_HEADER)
+    for result in results:
+        print(format_result(result))
+    passed = sum(1 for result in results if result['verdict'] == 'OK')
+    print(f"Passed {passed}/{len(results)} tests")
+
+def make_checker(args, config):
+    from src.checker import OutputChecker
+    return OutputChecker(
+        mode='exact' if args.exact else config.get('checker.mode', 'tokens'),
+        abs_eps=args.abs_eps if args.abs_eps is not None else config.get('checker.abs_eps', 0.0),
+        rel_eps=args.rel_eps if args.rel_eps is not None else config.get('checker.rel_eps', 0.0)
+    )
+
+def add_checker_arguments(subparser):
+    subparser.add_argument('--abs-eps', type=float, help="Accept numbers within this absolute error")
+    subparser.add_argument('--rel-eps', type=float, help="Accept numbers within this relative error")
+    subparser.add_argument('--exact', action='store_true', help="Compare output byte for byte")
+
+def cmd_ingest(args, config):
+    from src.bulk_ingest import BulkIngester
+    from src.problem_creator import ProblemCreator
+    missing = [path for path in args.paths if not os.path.exists(path)]
+    if missing:
+        print(f"Not found: {', '.join(missing)}")
+        return 1
+    # Opening thousands of problems in the editor is never wanted
+    config.config['auto_open_files'] = False
+    checkpoint = args.checkpoint or BulkIngester.get_checkpoint_path(config.get('output_directory'))
+    ingester = BulkIngester(ProblemCreator(config), checkpoint, processes=args.processes or config.get('batch.processes'),
+                            window=args.window)
+    counts = ingester.run(args.paths, restart=args.restart)
+    print(f"Created {counts['created']}, failed {counts['failed']}, skipped {counts['skipped']} already done")
+    return 1 if counts['failed'] else 0
+
+def cmd_judge(args, config):
+    from src.judge import Judge, CompilationError
+    judge = Judge(config)
+    judge.checker = make_checker(args, config)
+    if args.workers:
+        judge.workers = args.workers
+    try:
+        results = judge.run(args.problem_dir, args.tests)
+    except CompilationError as e:
+        print("Compilation failed:")
+        print(e)
+        return 1
+    except OSError as e:
+        print(f"Failed to judge {args.problem_dir}: {e}")
+        return 1
+    finally:
+        judge.close()
+    if not results:
+        print(f"No tests found in {args.problem_dir}")
+        return 1
+    print_results(results)
+    return 0 if all(result['verdict'] == 'OK' for result in results) else 1
+
+def cmd_check(args, config):
+    result = make_checker(args, config).check(args.actual, args.expected)
+    print(("OK: " if result['ok'] else "WA: ") + result['message'])
+    return 0 if result['ok'] else 1
+
+def cmd_watch(args, config):
+    from src.watcher import SolutionWatcher
+    path = args.path or config.get('output_directory')
+    if not os.path.isdir(path):
+        print(f"Not a directory: {path}")
+        return 1
+    watcher = SolutionWatcher(config)
+    watcher.judge.checker = make_checker(args, config)
+    if args.workers:
+        watcher.judge.workers = args.workers
+    if args.stop_on_failure:
+        watcher.stop_on_failure = True
+    if args.debounce is not None:
+        watcher.debounce = args.debounce
+    watcher.watch(path, poll=args.poll)
+    return 0
+
+def find_source(problem_dir, explicit, names):
+    if explicit:
+        return explicit
+    for name in names:
+        path = os.path.join(problem_dir, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+def cmd_stress(args, config):
+    from src.stress_tester import StressTester
+    from src.judge import CompilationError
+    generator = find_source(args.problem_dir, args.gen, [config.get('stress.generator_file', 'gen.cpp'), 'gen.py'])
+    brute = find_source(args.problem_dir, args.brute, [config.get('stress.brute_file', 'brute.cpp'), 'brute.py'])
+    if not generator or not brute:
+        print("Need a generator and a brute force solution (gen.cpp/gen.py and brute.cpp/brute.py, or --gen/--brute)")
+        return 1
+    validator = find_source(args.problem_dir, args.validator,
+                            [config.get('stress.validator_file', 'validator.cpp'), 'validator.py'])
+    tester = StressTester(config)
+    tester.judge.checker = make_checker(args, config)
+    if args.workers:
+        tester.workers = args.workers
+    try:
+        result = tester.run(args.problem_dir, generator, brute, iterations=args.iterations, seed=args.seed,
+                            shrink=not args.no_shrink, save=not args.no_save, validator_source=validator)
+    except CompilationError as e:
+        print("Compilation failed:")
+        print(e)
+        return 1
+    if result['error']:
+        print(f"Stopped: {result['error']}")
+        return 1
+    failure = result['failure']
+    if not failure:
+        print(f"No differences in {result['iterations']} iterations ({result['rate']:.0f} it/s)")
+        return 0
+    print(f"Mismatch: {failure['reason']}")
+    print("Input:")
+    print(failure['input'].decode('utf-8', errors='replace'))
+    if 'saved_test' in result:
+        print(f"Saved as test {result['saved_test']}")
+    if result.get('unvalidated'):
+        print("Warning: the input was reduced line by line without a validator and may not satisfy the input "
+              "format; add validator.cpp/validator.py (or --validator) to check reductions")
+    return 1
+
+def cmd_compact(args, config):
+    from src.test_storage import TestStorage
+    try:
+        storage = TestStorage(config)
+    except ValueError as e:
+        print(e)
+        return 1
+    if args.format:
+        storage.format = args.format
+    if args.threshold is not None:
+        storage.threshold = args.threshold
+    if args.paths:
+        problem_dirs = args.paths
+    else:
+        output_directory = config.get('output_directory')
+        problem_dirs = [entry.path for entry in os.scandir(output_directory)
+                        if entry.is_dir() and not entry.name.startswith('.')] if os.path.isdir(output_directory) else []
+    summary = storage.compact(problem_dirs, workers=args.workers)
+    for error in summary['errors']:
+        print(f"Failed to compress {error}")
+    saved = summary['before'] - summary['after']
+    print(f"Compressed {summary['files']} test file(s) in {len(problem_dirs)} problem(s): "
+          f"{summary['before'] / 1e6:.1f} MB -> {summary['after'] / 1e6:.1f} MB, saved {saved / 1e6:.1f} MB")
+    return 1 if summary['errors'] else 0
+
+def cmd_profile(args, config):
+    from src.profiler import PerformanceProfiler
+    from src.judge import CompilationError
+    generator = find_source(args.problem_dir, args.gen, [config.get('stress.generator_file', 'gen.cpp'), 'gen.py'])
+    if not generator:
+        print("Need a generator that takes `<seed> <size>` (gen.cpp/gen.py, or --gen)")
+        return 1
+    profiler = PerformanceProfiler(config)
+    for option in ('start_size', 'max_size', 'growth', 'repeat'):
+        if getattr(args, option) is not None:
+            setattr(profiler, option, getattr(args, option))
+    try:
+        report = profiler.run(args.problem_dir, generator, target_size=args.target_size)
+    except CompilationError as e:
+        print("Compilation failed:")
+        print(e)
+        return 1
+    if report['stopped']:
+        print(f"Stopped: {report['stopped']}")
+    for key, unit, limit in (('time', 'ms CPU', report['time_limit_ms']), ('memory', 'MB', report['memory_limit_mb'])):
+        estimate = report[key]
+        if not estimate:
+            print(f"Not enough sizes to fit a {key} curve")
+            continue
+        exponent = f", n^{estimate['exponent']:.2f} locally" if estimate['exponent'] is not None else ''
+        print(f"{key.capitalize()}: looks like {estimate['complexity']}{exponent}; projected {estimate['projected']:.1f} {unit} "
+              f"at n={report['target_size']} against a limit of {limit:.0f} ({estimate['headroom']:.1f}x headroom)")
+    if not report['ok']:
+        print(f"Warning: less than {profiler.min_headroom}x headroom, this may fail on the judge")
+        return 1
+    return 0
+
+def cmd_history(args, config):
+    from src.run_history import RunHistory
+    history = RunHistory(RunHistory.get_directory(config), config.get_file_naming())
+    problem_id, _ = history.get_problem(args.problem_dir)
+    revisions = history.get_revisions(history.load(problem_id))
+    if not revisions:
+        print(f"No runs recorded for {problem_id}")
+        return 1
+    if args.compare is None:
+        print(f"{'source':<12}  {'first run':<19}  {'last run':<19}  {'runs':>4}  {'tests':>5}  {'total best ms':>13}")
+        for revision in revisions:
+            total = sum(test['cpu_ms'] for test in revision['tests'].values())
+            print(f"{revision['source'] or '?':<12}  {revision['first_run']:<19}  {revision['last_run']:<19}  "
+                  f"{revision['runs']:>4}  {len(revision['tests']):>5}  {total:>13.1f}")
+        return 0
+    
+    by_source = {revision['source']: revision for revision in revisions}
+    if len(args.compare) not in (0, 2):
+        print("--compare takes two source hashes, or none for the last two revisions")
+        return 1
+    if args.compare:
+        names = args.compare
+    elif len(revisions) >= 2:
+        # The two revisions run most recently, older one first
+        recent = sorted(revisions, key=lambda revision: revision['last_run'])[-2:]
+        names = [revision['source'] for revision in recent]
+    else:
+        print("Only one revision recorded, nothing to compare")
+        return 1
+    # Hashes can be abbreviated like git's
+    selected = []
+    for name in names:
+        matches = [source for source in by_source if source and source.startswith(name)]
+        if len(matches) != 1:
+            print(f"{'Unknown' if not matches else 'Ambiguous'} revision: {name}")
+            return 1
+        selected.append(by_source[matches[0]])
+    threshold = args.threshold if args.threshold is not None else config.get('history.threshold', 0.1)
+    min_difference = config.get('history.min_difference_ms', 2.0)
+    rows = history.compare(selected[0], selected[1], threshold=threshold, min_difference_ms=min_difference)
+    print(f"{selected[0]['source']} -> {selected[1]['source']}")
+    print(f"{'test':<6} {'before ms':>10} {'after ms':>10} {'change':>8}")
+    for row in rows:
+        flag = '' if row['status'] == 'same' else f"  {row['status'].upper()}"
+        print(f"{row['test']:<6} {row['before_ms']:>10.1f} {row['after_ms']:>10.1f} {row['change']:>+8.1%}{flag}")
+    slower = sum(1 for row in rows if row['status'] == 'slower')
+    print(f"{slower} test(s) slower beyond {threshold:.0%} and {min_difference} ms")
+    return 1 if slower else 0
+
+def cmd_index(args, config):
+    from src.problem_creator import ProblemCreator
+    from src.problem_index import ProblemIndex
+    index = ProblemIndex(ProblemCreator.get_index_path(config))
+    if args.action == 'rebuild':
+        count = index.rebuild(config.get('output_directory'), config.get_file_naming(), workers=args.workers)
+        print(f"Indexed {count} problems from {config.get('output_directory')}")
+        return 0
+    rows = index.search(id_prefix=args.id, name=args.name, contest=args.contest,
+                        since=args.since, until=args.until, limit=args.limit)
+    for row in rows:
+        print(f"{row['problem_id']:<10} {row['created_date']:<19}  {row['test_count']:>2} tests  "
+              f"{row['time_limit']:<10} {row['memory_limit']:<14} {row['name']}")
+    if not rows:
+        print("No matching problems")
+    return 0
+
+def cmd_archive(args, config):
+    from src.html_archive import HtmlArchive
+    archive = HtmlArchive(HtmlArchive.get_directory(config))
+    pages = archive.get_latest_pages()
+    if args.action == 'list':
+        for url, html_hash in pages:
+            result = archive.get_result(url, html_hash)
+            status = result['problem_id'] if result else 'failed'
+            print(f"{html_hash[:12]}  {status:<12} {url}")
+        print(f"{len(pages)} archived pages in {archive.directory}")
+        return 0
+    
+    from src.batch_importer import BatchImporter
+    from src.problem_creator import ProblemCreator
+    if args.no_open:
+        config.config['auto_open_files'] = False
+    creator = ProblemCreator(config)
+    importer = BatchImporter(creator, processes=args.processes or config.get('batch.processes'))
+    failed = 0
+    # Replay in chunks so only a bounded number of pages is held in memory
+    for start in range(0, len(pages), args.chunk_size):
+        chunk = pages[start:start + args.chunk_size]
+        batch = []
+        for url, html_hash in chunk:
+            html = archive.load(html_hash)
+            if html is None:
+                print(f"Missing archived page {html_hash} for {url}")
+                failed += 1
+                continue
+            batch.append({'html': html, 'url': url})
+        for entry in importer.import_pages(batch):
+            if entry['status'] != 'created':
+                failed += 1
+                print(f"{str(entry['problem_id']):<12} failed   {entry['error']}")
+        print(f"Replayed {min(start + args.chunk_size, len(pages))}/{len(pages)} pages")
+    creator.file_opener.flush()
+    print(f"Replayed {len(pages) - failed}/{len(pages)} pages successfully")
+    return 1 if failed else 0
+
+def cmd_cache(args, config):
+    from src.judge import Judge
+    cache = Judge(config).compile_cache
+    if args.action == 'clear':
+        cache.clear()
+        print(f"Cleared compile cache in {cache.cache_directory}")
+        return 0
+    if args.action == 'pch':
+        pch_directory = cache.get_pch_directory()
+        print(f"Precompiled header: {pch_directory}" if pch_directory else "Precompiled header unavailable")
+        return 0 if pch_directory else 1
+    stats = cache.get_stats()
+    print(f"Cache directory:   {cache.cache_directory}")
+    print(f"Cached binaries:   {stats['binaries']}")
+    print(f"Hits / misses:     {stats['hits']} / {stats['misses']} ({stats['hit_rate']:.0%} hit rate)")
+    print(f"Mean compile time: {stats['mean_miss_seconds']:.2f}s on miss, {stats['mean_hit_seconds'] * 1000:.1f}ms on hit")
+    print(f"Total compiling:   {stats['compile_seconds']:.1f}s")
+    print(f"PCH builds:        {stats['pch_builds']} ({stats['pch_build_seconds']:.1f}s)")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Codeforces automation command line tools")
+    parser.add_argument('--config', default="config/settings.json", help="Path to settings.json")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    import_parser = subparsers.add_parser('import', help="Import many saved problem pages at once")
+    import_parser.add_argument('paths', nargs='*', help="Saved .html pages or directories containing them")
+    import_parser.add_argument('--json', help="JSON file with a list of {html, url} pages")
+    import_parser.add_argument('--processes', type=int, help="Parser processes (default: CPU count)")
+    import_parser.add_argument('--no-open', action='store_true', help="Do not open the created files")
+    import_parser.set_defaults(func=cmd_import)
+    
+    ingest_parser = subparsers.add_parser('ingest', help="Import a large archive of saved pages, resumable after interruption")
+    ingest_parser.add_argument('paths', nargs='+', help="Directories, tarballs or .html files")
+    ingest_parser.add_argument('--processes', type=int, help="Parser processes (default: CPU count)")
+    ingest_parser.add_argument('--window', type=int, help="Pages in flight at once (default: 4 per process)")
+    ingest_parser.add_argument('--checkpoint', help="Checkpoint file (default: <output_directory>/.ingest-checkpoint.jsonl)")
+    ingest_parser.add_argument('--restart', action='store_true', help="Ignore the checkpoint and start over")
+    ingest_parser.set_defaults(func=cmd_ingest)
+    
+    judge_parser = subparsers.add_parser('judge', help="Compile a solution and run it on all tests")
+    judge_parser.add_argument('problem_dir', help="Problem directory, e.g. problems/1850A")
+    judge_parser.add_argument('--tests', nargs='+', help="Only run these test numbers")
+    judge_parser.add_argument('--workers', type=int, help="Parallel test runs (default: CPU count)")
+    add_checker_arguments(judge_parser)
+    judge_parser.set_defaults(func=cmd_judge)
+    
+    watch_parser = subparsers.add_parser('watch', help="Recompile and rerun tests whenever a solution or test is saved")
+    watch_parser.add_argument('path', nargs='?', help="Problem directory, or a directory of problems (default: output_directory)")
+    watch_parser.add_argument('--poll', action='store_true', help="Poll for changes instead of using inotify")
+    watch_parser.add_argument('--stop-on-failure', action='store_true', help="Stop a run at the first failing test")
+    watch_parser.add_argument('--debounce', type=float, help="Seconds to wait for saves to settle (default: 0.15)")
+    watch_parser.add_argument('--workers', type=int, help="Parallel test runs (default: CPU count)")
+    add_checker_arguments(watch_parser)
+    watch_parser.set_defaults(func=cmd_watch)
+    
+    check_parser = subparsers.add_parser('check', help="Compare an output file with the expected output")
+    check_parser.add_argument('actual', help="Program output")
+    check_parser.add_argument('expected', help="Expected output, e.g. out1")
+    add_checker_arguments(check_parser)
+    check_parser.set_defaults(func=cmd_check)
+    
+    stress_parser = subparsers.add_parser('stress', help="Compare the solution with a brute force on random inputs")
+    stress_parser.add_argument('problem_dir', help="Problem directory, e.g. problems/1850A")
+    stress_parser.add_argument('--gen', help="Generator source, called as `gen <seed> [size]` (default: gen.cpp/gen.py)")
+    stress_parser.add_argument('--brute', help="Brute force source (default: brute.cpp/brute.py)")
+    stress_parser.add_argument('--validator', help="Input validator source, exits non-zero on a malformed input "
+                                                   "(default: validator.cpp/validator.py if present)")
+    stress_parser.add_argument('-n', '--iterations', type=int, default=10000, help="Maximum number of iterations")
+    stress_parser.add_argument('--seed', type=int, help="First generator seed (default: random)")
+    stress_parser.add_argument('--workers', type=int, help="Parallel workers (default: CPU count)")
+    stress_parser.add_argument('--no-shrink', action='store_true', help="Do not minimize the failing input")
+    stress_parser.add_argument('--no-save', action='store_true', help="Do not save the failing input as a test")
+    add_checker_arguments(stress_parser)
+    stress_parser.set_defaults(func=cmd_stress)
+    
+    profile_parser = subparsers.add_parser('profile', help="Time a solution on generated inputs of growing size against the limits")
+    profile_parser.add_argument('problem_dir', help="Problem directory containing solution.cpp")
+    profile_parser.add_argument('--gen', help="Generator source, called as `gen <seed> <size>` (default: gen.cpp/gen.py)")
+    profile_parser.add_argument('--start-size', type=int, help="Smallest size generated")
+    profile_parser.add_argument('--max-size', type=int, help="Largest size generated")
+    profile_parser.add_argument('--growth', type=float, help="Factor between consecutive sizes")
+    profile_parser.add_argument('--repeat', type=int, help="Runs per size; the fastest is kept")
+    profile_parser.add_argument('--target-size', type=int, help="Size to project to, i.e. the maximum n of the problem (default: --max-size)")
+    profile_parser.set_defaults(func=cmd_profile)
+    
+    history_parser = subparsers.add_parser('history', help="List recorded runs of a solution or compare two revisions")
+    history_parser.add_argument('problem_dir', help="Problem directory")
+    history_parser.add_argument('--compare', nargs='*', metavar='SOURCE',
+                                help="Compare two source hashes (default: the last two revisions)")
+    history_parser.add_argument('--threshold', type=float, help="Relative slowdown that is reported (default: history.threshold)")
+    history_parser.set_defaults(func=cmd_history)
+    
+    compact_parser = subparsers.add_parser('compact', help="Compress large test files in existing problem directories")
+    compact_parser.add_argument('paths', nargs='*', help="Problem directories (default: every problem in output_directory)")
+    compact_parser.add_argument('--format', choices=['gzip', 'lzma'], help="Compression format (default: test_storage.format)")
+    compact_parser.add_argument('--threshold', type=int, help="Only compress files of at least this many bytes")
+    compact_parser.add_argument('--workers', type=int, help="Parallel compression processes (default: CPU count)")
+    compact_parser.set_defaults(func=cmd_compact)
+    
+    index_parser = subparsers.add_parser('index', help="Search the problem index or rebuild it from disk")
+    index_parser.add_argument('action', choices=['search', 'rebuild'], nargs='?', default='search')
+    index_parser.add_argument('--id', help="Problem id prefix, e.g. 1850")
+    index_parser.add_argument('--name', help="Substring of the problem name")
+    index_parser.add_argument('--contest', help="Contest number")
+    index_parser.add_argument('--since', help="Created on or after this date (YYYY-MM-DD)")
+    index_parser.add_argument('--until', help="Created on or before this date (YYYY-MM-DD)")
+    index_parser.add_argument('--limit', type=int, default=50, help="Maximum number of results")
+    index_parser.add_argument('--workers', type=int, default=8, help="Parallel directory scans for rebuild")
+    index_parser.set_defaults(func=cmd_index)
+    
+    archive_parser = subparsers.add_parser('archive', help="List archived pages or re-import them with the current parser")
+    archive_parser.add_argument('action', choices=['list', 'replay'])
+    archive_parser.add_argument('--processes', type=int, help="Parser processes for replay (default: CPU count)")
+    archive_parser.add_argument('--chunk-size', type=int, default=64, help="Pages loaded per replay batch")
+    archive_parser.add_argument('--no-open', action='store_true', help="Do not open the created files")
+    archive_parser.set_defaults(func=cmd_archive)
+    
+    cache_parser = subparsers.add_parser('cache', help="Inspect or clear the shared compile cache")
+    cache_parser.add_argument('action', choices=['stats', 'clear', 'pch'], nargs='?', default='stats',
+                              help="Show hit-rate stats, clear the cache, or build the precompiled header now")
+    cache_parser.set_defaults(func=cmd_cache)
+    
+    args = parser.parse_args()
+    config = ConfigParser(args.config)
+    return args.func(args, config)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,47 +1,292 @@
-import sys
 import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "src")))
-
-from flask import Flask, request
+import argparse
+import importlib.util
+import json
+import signal
+import threading
+import time
+import zlib
+from flask import Flask, Response, request, jsonify, abort
 from flask_cors import CORS
-from src.problem_creator import ProblemCreator
-from src.utils.config_parser import ConfigParser
+from werkzeug.exceptions import HTTPException
+from src.app_context import AppContext
+from src.html_archive import HtmlArchive
 from src.html_parser import CodeforcesHTMLParser
-import re
+from src.job_queue import JobQueue
+from src.metrics import metrics, RequestTrace
 
 app = Flask(__name__)
 CORS(app)
+context = AppContext()
 
-@app.route('/receive', methods=['POST'])
-def receive():
-    data = request.get_json()
+def process_problem(data):
     html = data.get('html', '')
     url = data.get('url', '')
-    # Save the HTML for debugging and further processing
-    with open('last_problem.html', 'w', encoding='utf-8') as f:
-        f.write(html)
+    html_hash = data.get('hash')
+    trace = data.get('trace') or RequestTrace()
+    metrics.set_trace(trace)
+    metrics.record('queue', time.perf_counter() - data.get('submitted', trace.started))
+    archive = context.archive
+    result = None
+    try:
+        if archive:
+            with metrics.timed('archive'):
+                archive.store(html, html_hash)
+        result = create_problem(html, url)
+    finally:
+        if archive:
+            archive.record(url, html_hash, result or None)
+        metrics.finish(trace, 'created' if result else 'failed')
+        metrics.set_trace(None)
+    return result
+
+def create_problem(html, url):
     # Parse the HTML
-    parsed = CodeforcesHTMLParser.parse_problem(html)
+    with metrics.timed('parse'):
+        parsed = CodeforcesHTMLParser.parse_problem_fast(html, verify=context.config.get('parser.verify', False))
     # Extract problem_id from URL (support gym, contest, and problemset)
-    match = re.search(r'/problemset/problem/(\d+)/([A-Z])|/contest/(\d+)/problem/([A-Z])|/gym/(\d+)/problem/([A-Z])', url)
-    if match:
-        if match.group(1) and match.group(2):
-            problem_id = f"{match.group(1)}{match.group(2)}"
-        elif match.group(3) and match.group(4):
-            problem_id = f"{match.group(3)}{match.group(4)}"
-        elif match.group(5) and match.group(6):
-            problem_id = f"{match.group(5)}{match.group(6)}"
-        else:
-            problem_id = parsed['problem_name'].replace(' ', '_')
-    else:
+    problem_id = CodeforcesHTMLParser.extract_problem_id(url)
+    if not problem_id:
         problem_id = parsed['problem_name'].replace(' ', '_')
     parsed['problem_id'] = problem_id
     parsed['url'] = url
+    metrics.annotate(problem_id=problem_id, url=url, test_case_count=len(parsed['test_cases']))
     # Create the problem files
-    config = ConfigParser()
-    creator = ProblemCreator(config)
-    creator.create_problem(problem_id, parsed)
+    creator = context.get_creator()
+    if not creator.create_problem(problem_id, parsed):
+        return False
+    return {
+        'problem_id': problem_id,
+        'problem_name': parsed['problem_name'],
+        'test_case_count': len(parsed['test_cases']),
+        'problem_dir': os.path.join(creator.config.get('output_directory'), problem_id)
+    }
+
+def process_batch(data):
+    from src.batch_importer import BatchImporter, is_page
+    pages = data['pages']
+    trace = data['trace']
+    metrics.set_trace(trace)
+    metrics.record('queue', time.perf_counter() - data['submitted'])
+    try:
+        creator = context.get_creator()
+        archive = context.archive
+        importer = BatchImporter(creator, processes=context.config.get('batch.processes'))
+        with metrics.timed('batch_import'):
+            summary = importer.import_pages(pages)
+        if archive:
+            with metrics.timed('archive'):
+                for page, entry in zip(pages, summary):
+                    if not is_page(page):
+                        continue
+                    html_hash = archive.store(page.get('html', ''))
+                    result = None
+                    if entry['status'] == 'created':
+                        result = dict(entry, problem_dir=os.path.join(creator.config.get('output_directory'), entry['problem_id']))
+                    archive.record(page.get('url', ''), html_hash, result)
+        created = sum(1 for entry in summary if entry['status'] == 'created')
+        metrics.annotate(page_count=len(pages), created=created, failed=len(summary) - created)
+        metrics.finish(trace, 'created' if created == len(summary) else 'partial')
+        return summary
+    except Exception:
+        metrics.finish(trace, 'failed')
+        raise
+    finally:
+        metrics.set_trace(None)
+
+jobs = JobQueue(
+    process_problem,
+    workers=context.config.get('server.workers', 2),
+    max_size=context.config.get('server.queue_size', 32)
+)
+
+@app.errorhandler(HTTPException)
+def handle_http_error(e):
+    return jsonify({'error': e.description}), e.code
+
+# Upper bound on a decompressed request body, so a malformed body cannot exhaust memory
+MAX_BODY_SIZE = 64 * 1024 * 1024
+
+def decompress_body(body, encoding):
+    if encoding == 'gzip':
+        wbits = [16 + zlib.MAX_WBITS]
+    elif encoding == 'deflate':
+        # Browsers send zlib-wrapped deflate, some clients send raw deflate
+        wbits = [zlib.MAX_WBITS, -zlib.MAX_WBITS]
+    else:
+        abort(415, f"Unsupported Content-Encoding: {encoding}")
+    for i, window in enumerate(wbits):
+        decompressor = zlib.decompressobj(window)
+        try:
+            data = decompressor.decompress(body, MAX_BODY_SIZE)
+            break
+        except zlib.error:
+            if i == len(wbits) - 1:
+                raise
+    if decompressor.unconsumed_tail:
+        abort(413, "Decompressed body too large")
+    return data
+
+def get_payload():
+    """Decode the JSON request body, which may be gzip or deflate compressed"""
+    encoding = request.headers.get('Content-Encoding', '').strip().lower()
+    if encoding in ('', 'identity'):
+        return request.get_json()
+    try:
+        return json.loads(decompress_body(request.get_data(), encoding))
+    except (zlib.error, ValueError) as e:
+        abort(400, f"Invalid compressed body: {e}")
+
+def decode_payload(trace):
+    """Decode the request body, timing it as part of the given request"""
+    metrics.set_trace(trace)
+    try:
+        with metrics.timed('decode'):
+            return get_payload()
+    finally:
+        metrics.set_trace(None)
+
+@app.route('/receive', methods=['POST'])
+def receive():
+    trace = RequestTrace('receive')
+    data = decode_payload(trace)
+    if not isinstance(data, dict) or not isinstance(data.get('html', ''), str) \
+            or not isinstance(data.get('url', ''), str):
+        metrics.finish(trace, 'invalid')
+        return jsonify({'error': 'Expected a JSON object with string html and url'}), 400
+    html = data.get('html', '')
+    url = data.get('url', '')
+    html_hash = HtmlArchive.get_hash(html)
+    problem_id = CodeforcesHTMLParser.extract_problem_id(url)
+    trace.fields.update(problem_id=problem_id, url=url, html_bytes=len(html))
+    # The exact same page was imported before and its files are still there
+    archive = context.archive
+    if archive:
+        previous = archive.get_result(url, html_hash)
+        if previous and os.path.isdir(previous.get('problem_dir', '')):
+            metrics.finish(trace, 'unchanged')
+            return jsonify({'job_id': None, 'problem_id': previous['problem_id'], 'status': 'unchanged',
+                            'result': previous}), 200
+    # Submissions for the same problem share one job; the one that will not be processed is finished here
+    job = jobs.submit(problem_id or url or None,
+                      {'html': html, 'url': url, 'hash': html_hash, 'trace': trace, 'submitted': time.perf_counter()},
+                      on_merge=lambda payload: metrics.finish(payload['trace'], 'merged'))
+    if job is None:
+        metrics.finish(trace, 'rejected')
+        return jsonify({'error': 'Job queue is full, try again later'}), 503
+    trace.fields['job_id'] = job.id
+    return jsonify({'job_id': job.id, 'problem_id': problem_id, 'status': job.status}), 202
+
+@app.route('/receive_batch', methods=['POST'])
+def receive_batch():
+    trace = RequestTrace('receive_batch')
+    data = decode_payload(trace)
+    pages = data.get('pages', []) if isinstance(data, dict) else data
+    if not isinstance(pages, list) or not pages:
+        metrics.finish(trace, 'invalid')
+        return jsonify({'error': 'Expected a non-empty list of {html, url} pages'}), 400
+    job = jobs.submit(None, {'pages': pages, 'trace': trace, 'submitted': time.perf_counter()}, handler=process_batch)
+    if job is None:
+        metrics.finish(trace, 'rejected')
+        return jsonify({'error': 'Job queue is full, try again later'}), 503
+    trace.fields['job_id'] = job.id
+    return jsonify({'job_id': job.id, 'page_count': len(pages), 'status': job.status}), 202
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': f'Job not found: {job_id}'}), 404
+    return jsonify(job.to_dict())
+
+# Set while the server accepts requests; cleared as soon as shutdown starts
+ready = threading.Event()
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    status = {'status': 'ok' if ready.is_set() else 'unavailable', 'pending_jobs': jobs.pending_count()}
+    return jsonify(status), 200 if ready.is_set() else 503
+
+@app.route('/reload', methods=['POST'])
+def reload():
+    context.reload()
     return 'OK'
 
+def prewarm():
+    """Parse and render a built-in page once so the first real request does not start cold"""
+    with metrics.timed('prewarm'):
+        parsed = CodeforcesHTMLParser.warm_up(verify=context.config.get('parser.verify', False))
+        parsed.update(problem_id='warmup', url='', language=context.config.get('default_language', 'cpp'))
+        template_manager = context.get_creator().template_manager
+        template_manager.render_solution(parsed)
+        template_manager.render_metadata(parsed)
+        # Route one request through Flask so its first-request setup is done too
+        app.test_client().get('/healthz')
+
+def drain(timeout):
+    """Let the job workers finish everything already queued"""
+    pending = jobs.pending_count()
+    if pending:
+        print(f"Waiting for {pending} job(s) to finish")
+    if not jobs.shutdown(wait=True, timeout=timeout):
+        print(f"Stopped with {jobs.pending_count()} unfinished job(s)")
+    # Files of the last jobs may still be waiting to be opened
+    context.creator.file_opener.flush(timeout)
+
+def stop_on_signal(signum, frame):
+    raise KeyboardInterrupt
+
+def serve(host, port, threads, drain_timeout):
+    """Serve with waitress until interrupted, then stop accepting and drain in-flight jobs"""
+    from waitress.server import create_server
+    server = create_server(app, host=host, port=port, threads=threads)
+    signal.signal(signal.SIGTERM, stop_on_signal)
+    if hasattr(signal, 'SIGBREAK'):
+        # Sent by the GUI on Windows, where the server runs in its own process group
+        signal.signal(signal.SIGBREAK, stop_on_signal)
+    ready.set()
+    print(f"Serving on http://{host}:{port} with {threads} threads")
+    try:
+        server.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ready.clear()
+        print("Shutting down")
+        server.close()
+        server.task_dispatcher.shutdown(cancel_pending=False, timeout=drain_timeout)
+        drain(drain_timeout)
+
+def main():
+    parser = argparse.ArgumentParser(description='Receive Codeforces problem pages from the browser extension')
+    parser.add_argument('--host', default=context.config.get('server.host', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=context.config.get('server.port', 8765))
+    parser.add_argument('--threads', type=int, default=context.config.get('server.threads', 8),
+                        help='HTTP request threads')
+    parser.add_argument('--dev', action='store_true', help="Use Flask's development server")
+    parser.add_argument('--no-prewarm', dest='prewarm', action='store_false',
+                        default=context.config.get('server.prewarm', True),
+                        help='Skip parsing a sample page before accepting requests')
+    args = parser.parse_args()
+    if args.prewarm:
+        prewarm()
+    drain_timeout = context.config.get('server.drain_timeout', 30)
+    if not args.dev and importlib.util.find_spec('waitress') is None:
+        print("waitress is not installed, using the development server (pip install waitress)")
+        args.dev = True
+    if not args.dev:
+        serve(args.host, args.port, args.threads, drain_timeout)
+        return
+    ready.set()
+    try:
+        app.run(host=args.host, port=args.port, threaded=True)
+    finally:
+        ready.clear()
+        drain(drain_timeout)
+
 if __name__ == '__main__':
-    app.run(port=8765) 
\ No newline at end of file
+    main()
@@ -0,0 +1,57 @@
+import threading
+from src.utils.config_parser import ConfigParser
+from src.problem_creator import ProblemCreator
+from src.html_archive import HtmlArchive
+from src.metrics import metrics
+
+class AppContext:
+    """Process-wide holder for the configuration, problem creator and page archive.
+    
+    Building a ConfigParser and a ProblemCreator reads settings.json and every
+    template from disk, so they are built once and only rebuilt when the
+    underlying files change.
+    """
+    
+    def __init__(self, config_path: str = "config/settings.json"):
+        self.config_path = config_path
+        self.lock = threading.Lock()
+        self.config = None
+        self.creator = None
+        self.archive = None
+        self.reload()
+    
+    def reload(self) -> None:
+        """Rebuild everything from disk"""
+        with self.lock:
+            self.build()
+    
+    def build(self) -> None:
+        """Build the configuration, problem creator and archive, and swap them in; call with the lock held.
+        
+        Nothing is replaced if any part fails to build. The editor launcher is
+        kept and reconfigured, so files it has already queued are still opened.
+        """
+        config = ConfigParser(self.config_path)
+        creator = ProblemCreator(config)
+        archive = HtmlArchive(HtmlArchive.get_directory(config)) if config.get('archive.enabled', True) else None
+        metrics.configure(config)
+        if self.creator:
+            creator.file_opener = self.creator.file_opener
+            creator.file_opener.configure(config.get_editor_config())
+        self.config = config
+        self.creator = creator
+        self.archive = archive
+    
+    def get_creator(self) -> ProblemCreator:
+        """Get the shared problem creator, reloading it if config or templates changed"""
+        with self.lock:
+            if self.config.is_modified():
+                print("Configuration changed, reloading")
+                try:
+                    self.build()
+                except Exception as e:
+                    # Keep serving with the last good configuration and try again on the next request
+                    print(f"Failed to reload configuration: {e}")
+            elif self.creator.template_manager.reload_if_changed():
+                print("Templates changed, reloaded")
+            return self.creator
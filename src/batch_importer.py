@@ -0,0 +1,118 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, List
+from src.html_parser import CodeforcesHTMLParser
+from src.problem_creator import ProblemCreator
+
+# Imports run on receiver worker threads, and a forked child can inherit locks held by other threads.
+# Not forkserver: it preloads the receiver module, worker threads included, and forks children from that
+START_METHOD = 'spawn'
+
+def is_page(page: Any) -> bool:
+    """Check that a batch entry is an {html, url} object that can be parsed"""
+    return isinstance(page, dict) and isinstance(page.get('html', ''), str) and isinstance(page.get('url', ''), str)
+
+def parse_page(page: Dict[str, str]) -> Dict[str, Any]:
+    """Parse one {html, url} page; runs inside a worker process"""
+    if not is_page(page):
+        # One malformed entry fails on its own instead of failing the whole batch
+        return {'problem_id': None, 'url': '', 'error': 'Expected an object with string html and url'}
+    url = page.get('url', '')
+    try:
+        parsed = CodeforcesHTMLParser.parse_problem_fast(page.get('html', ''))
+        problem_id = CodeforcesHTMLParser.extract_problem_id(url)
+        if not problem_id and parsed['problem_name'] == 'Unknown Problem':
+            return {'problem_id': None, 'url': url, 'error': 'No problem statement found in page'}
+        if not problem_id:
+            problem_id = parsed['problem_name'].replace(' ', '_')
+        parsed['problem_id'] = problem_id
+        parsed['url'] = url
+        return {'problem_id': problem_id, 'url': url, 'data': parsed}
+    except Exception as e:
+        return {'problem_id': None, 'url': url, 'error': f"Failed to parse page: {e}"}
+
+class BatchImporter:
+    """Parses many problem pages in a process pool and writes them concurrently"""
+    
+    def __init__(self, creator: ProblemCreator, processes: int = None, writers: int = 4):
+        self.creator = creator
+        self.processes = processes or os.cpu_count() or 1
+        self.writers = writers
+    
+    def import_pages(self, pages: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Import all pages, returning one summary entry per page in input order"""
+        if not pages:
+            return []
+        
+        # BeautifulSoup/lxml parsing is CPU-bound, so it goes to separate processes
+        if len(pages) == 1:
+            results = [parse_page(pages[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.processes, len(pages)),
+                                     mp_context=multiprocessing.get_context(START_METHOD)) as pool:
+                results = list(pool.map(parse_page, pages))
+        
+        # Only the last page for a given problem is written
+        last_index = {}
+        for index, result in enumerate(results):
+            if 'error' not in result:
+                last_index[result['problem_id']] = index
+        for index, result in enumerate(results):
+            if 'error' not in result and last_index[result['problem_id']] != index:
+                result['error'] = 'Duplicate page, a later page for this problem was imported'
+        
+        to_write = [result for result in results if 'error' not in result]
+        with ThreadPoolExecutor(max_workers=self.writers) as pool:
+            created = list(pool.map(self.write_problem, to_write))
+        for result, ok in zip(to_write, created):
+            if not ok:
+                result['error'] = 'Failed to create problem files'
+        
+        return [self.summarize(result) for result in results]
+    
+    def write_problem(self, result: Dict[str, Any]) -> bool:
+        """Materialize one parsed problem"""
+        try:
+            return self.creator.create_problem(result['problem_id'], result['data'])
+        except Exception as e:
+            print(f"Failed to create problem {result['problem_id']}: {e}")
+            return False
+    
+    @staticmethod
+    def summarize(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the per-problem summary entry"""
+        summary = {
+            'problem_id': result['problem_id'],
+            'url': result['url'],
+            'status': 'failed' if 'error' in result else 'created'
+        }
+        if 'error' in result:
+            summary['error'] = result['error']
+        else:
+            summary['problem_name'] = result['data']['problem_name']
+            summary['test_case_count'] = len(result['data']['test_cases'])
+        return summary
+    
+    @staticmethod
+    def load_pages(paths: List[str]) -> List[Dict[str, str]]:
+        """Load saved .html pages from files and directories"""
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                for filename in sorted(os.listdir(path)):
+                    if filename.endswith(('.html', '.htm')):
+                        files.append(os.path.join(path, filename))
+            else:
+                files.append(path)
+        
+        pages = []
+        for file_path in files:
+            try:
+                with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                    html = f.read()
+            except OSError as e:
+                print(f"Failed to read page {file_path}: {e}")
+                continue
+            pages.append({'html': html, 'url': CodeforcesHTMLParser.extract_page_url(html)})
+        return pages
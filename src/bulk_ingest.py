@@ -0,0 +1,177 @@
+import json
+import os
+import re
+import tarfile
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Iterator, List, Optional, Set
+from src.batch_importer import parse_page
+from src.html_parser import CodeforcesHTMLParser
+from src.problem_creator import ProblemCreator
+
+PAGE_EXTENSIONS = ('.html', '.htm')
+# Saved pages named <contest>_<letter>.html, e.g. 1850_A.html or 104114_B.htm
+PAGE_NAME_PATTERN = re.compile(r'^(\d+)_([A-Z])\.html?$')
+# Contest numbers from here on belong to gyms
+FIRST_GYM_CONTEST = 100000
+
+def url_from_filename(filename: str) -> str:
+    """Build the problem URL for a page saved as <contest>_<letter>.html"""
+    match = PAGE_NAME_PATTERN.match(os.path.basename(filename))
+    if not match:
+        return ''
+    contest, letter = match.groups()
+    kind = 'gym' if int(contest) >= FIRST_GYM_CONTEST else 'contest'
+    return f"https://codeforces.com/{kind}/{contest}/problem/{letter}"
+
+def ingest_page(job: Dict[str, str]) -> Dict[str, Any]:
+    """Read (if needed) and parse one page; runs inside a worker process"""
+    html = job.get('html')
+    if html is None:
+        try:
+            with open(job['path'], 'r', encoding='utf-8', errors='replace') as f:
+                html = f.read()
+        except OSError as e:
+            return {'source': job['source'], 'problem_id': None, 'url': '', 'error': f"Failed to read page: {e}",
+                    'retry': True}
+    # The embedded canonical URL wins; the file name is the fallback
+    url = CodeforcesHTMLParser.extract_page_url(html) or url_from_filename(job['source'])
+    if not CodeforcesHTMLParser.extract_problem_id(url):
+        return {'source': job['source'], 'problem_id': None, 'url': url,
+                'error': 'No problem URL in page and file name is not <contest>_<letter>.html'}
+    result = parse_page({'html': html, 'url': url})
+    if 'data' in result and result['data']['problem_name'] == 'Unknown Problem':
+        result = {'problem_id': result['problem_id'], 'url': url, 'error': 'No problem statement found in page'}
+    result['source'] = job['source']
+    return result
+
+class BulkIngester:
+    """Imports large collections of saved pages through a bounded, resumable pipeline.
+    
+    Pages are read one at a time from directories or tarballs, parsed in a
+    process pool with at most `window` pages in flight, and written as soon
+    as they are parsed. Every finished page is appended to a checkpoint file,
+    so an interrupted run skips those pages when started again. Pages that
+    failed for a reason that may pass, such as a read error or a failed write,
+    are marked for retry and run again on the next start.
+    """
+    
+    def __init__(self, creator: ProblemCreator, checkpoint_path: str, processes: Optional[int] = None,
+                 window: Optional[int] = None):
+        self.creator = creator
+        self.checkpoint_path = checkpoint_path
+        self.processes = processes or os.cpu_count() or 1
+        self.window = window or self.processes * 4
+    
+    @staticmethod
+    def get_checkpoint_path(output_directory: str) -> str:
+        """Default checkpoint location, inside output_directory"""
+        return os.path.join(output_directory, '.ingest-checkpoint.jsonl')
+    
+    def load_checkpoint(self) -> Set[str]:
+        """Get the sources finished by earlier runs, leaving out failures marked for retry"""
+        done = set()
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        source = entry['source']
+                    except (ValueError, KeyError, TypeError):
+                        # A line cut short by an interrupted run
+                        continue
+                    if entry.get('retry'):
+                        done.discard(source)
+                    else:
+                        done.add(source)
+        except FileNotFoundError:
+            pass
+        return done
+    
+    @staticmethod
+    def iter_jobs(paths: List[str]) -> Iterator[Dict[str, str]]:
+        """Yield one job per saved page; tarball members are read here, files by the workers"""
+        for path in paths:
+            if os.path.isdir(path):
+                for directory, subdirectories, filenames in os.walk(path):
+                    subdirectories.sort()
+                    for filename in sorted(filenames):
+                        if filename.endswith(PAGE_EXTENSIONS):
+                            file_path = os.path.join(directory, filename)
+                            yield {'source': file_path, 'path': file_path}
+            elif tarfile.is_tarfile(path):
+                # Stream mode reads the archive front to back without an index of its members
+                with tarfile.open(path, 'r|*') as tar:
+                    for member in tar:
+                        if member.isfile() and member.name.endswith(PAGE_EXTENSIONS):
+                            data = tar.extractfile(member).read()
+                            yield {'source': f"{path}:{member.name}", 'html': data.decode('utf-8', errors='replace')}
+            else:
+                yield {'source': path, 'path': path}
+    
+    def write(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Materialize one parsed page and build its checkpoint entry"""
+        entry = {'source': result['source'], 'problem_id': result.get('problem_id')}
+        if 'error' in result:
+            entry.update(status='failed', error=result['error'])
+            if result.get('retry'):
+                entry['retry'] = True
+            return entry
+        try:
+            created = self.creator.create_problem(result['problem_id'], result['data'])
+        except Exception as e:
+            print(f"Failed to create problem {result['problem_id']}: {e}")
+            created = False
+        if created:
+            entry['status'] = 'created'
+        else:
+            # Disk full, permissions, a broken template, ...: worth another try on the next run
+            entry.update(status='failed', error='Failed to create problem files', retry=True)
+        return entry
+    
+    def run(self, paths: List[str], restart: bool = False) -> Dict[str, int]:
+        """Import every page under the given paths, resuming from the checkpoint unless restart is set"""
+        if restart and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        done = self.load_checkpoint()
+        if done:
+            print(f"Resuming, {len(done)} page(s) already done according to {self.checkpoint_path}")
+        os.makedirs(os.path.dirname(os.path.abspath(self.checkpoint_path)), exist_ok=True)
+        
+        counts = {'created': 0, 'failed': 0, 'skipped': 0}
+        start = time.monotonic()
+        last_report = start
+        with open(self.checkpoint_path, 'a', encoding='utf-8') as checkpoint, \
+                ProcessPoolExecutor(max_workers=self.processes) as pool:
+            pending = set()
+            
+            def collect(block: bool) -> None:
+                nonlocal pending, last_report
+                finished, pending = wait(pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    entry = self.write(future.result())
+                    counts[entry['status']] += 1
+                    if entry['status'] == 'failed':
+                        print(f"\r{entry['source']}: {entry['error']}")
+                    checkpoint.write(json.dumps(entry) + '\n')
+                checkpoint.flush()
+                now = time.monotonic()
+                if now - last_report >= 1.0:
+                    last_report = now
+                    processed = counts['created'] + counts['failed']
+                    print(f"\r{processed} pages, {counts['failed']} failed, "
+                          f"{processed / (now - start):.0f} pages/s", end='', flush=True)
+            
+            for job in self.iter_jobs(paths):
+                if job['source'] in done:
+                    counts['skipped'] += 1
+                    continue
+                # Bounded memory: never more than `window` pages waiting in the pipeline
+                while len(pending) >= self.window:
+                    collect(block=True)
+                pending.add(pool.submit(ingest_page, job))
+                collect(block=False)
+            while pending:
+                collect(block=True)
+        print()
+        return counts
@@ -0,0 +1,185 @@
+import mmap
+import os
+import re
+import shutil
+import tempfile
+from typing import Dict, Any, Iterator, Optional, Tuple
+from src.utils.file_utils import FileUtils
+
+TOKEN_PATTERN = re.compile(rb'\S+')
+WHITESPACE_PATTERN = re.compile(rb'\s')
+NUMBER_PATTERN = re.compile(rb'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+CHUNK_SIZE = 1 << 20
+
+class MappedFile:
+    """Read-only memory map of a file that also works for empty files.
+    
+    A compressed file is stream-decompressed into an anonymous temporary file
+    first, so it is mapped like any other file instead of being read into memory.
+    """
+    
+    def __init__(self, path: str):
+        if FileUtils.is_compressed(path):
+            self.file = tempfile.TemporaryFile()
+            with FileUtils.open_binary(path) as source:
+                shutil.copyfileobj(source, self.file, CHUNK_SIZE)
+            self.file.flush()
+        else:
+            self.file = open(path, 'rb')
+        size = os.fstat(self.file.fileno()).st_size
+        # mmap cannot map an empty file
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+    
+    def __enter__(self):
+        return self.data
+    
+    def __exit__(self, *exc_info):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+class OutputChecker:
+    """Compares a program's output with the expected output without loading either into memory.
+    
+    Both files are memory-mapped and scanned lazily, so memory use stays
+    constant whatever the output size. Comparison stops at the first
+    difference, which is reported with its token index, line and byte offset.
+    
+    Modes:
+        tokens: whitespace-insensitive token comparison (like Codeforces' default checker)
+        exact:  byte-for-byte comparison
+    In tokens mode, numeric tokens that differ are accepted if they are within
+    abs_eps or rel_eps of each other.
+    """
+    
+    def __init__(self, mode: str = 'tokens', abs_eps: float = 0.0, rel_eps: float = 0.0):
+        if mode not in ('tokens', 'exact'):
+            raise ValueError(f"Unknown checker mode: {mode}")
+        self.mode = mode
+        self.abs_eps = abs_eps or 0.0
+        self.rel_eps = rel_eps or 0.0
+    
+    def check(self, actual_path: str, expected_path: str) -> Dict[str, Any]:
+        """Compare two files, returning {'ok': bool, 'message': str, ...position of the first difference}"""
+        with MappedFile(actual_path) as actual, MappedFile(expected_path) as expected:
+            return self.check_data(actual, expected)
+    
+    def check_data(self, actual, expected) -> Dict[str, Any]:
+        """Compare two in-memory outputs (bytes or mmap)"""
+        if self.mode == 'exact':
+            return self.check_exact(actual, expected)
+        return self.check_tokens(actual, expected)
+    
+    def check_tokens(self, actual, expected) -> Dict[str, Any]:
+        """Compare whitespace-separated tokens, a block of tokens at a time"""
+        actual_blocks = self.token_blocks(actual)
+        expected_blocks = self.token_blocks(expected)
+        actual_start, actual_tokens, actual_pos = 0, [], 0
+        expected_start, expected_tokens, expected_pos = 0, [], 0
+        index = 0
+        while True:
+            while actual_tokens is not None and actual_pos == len(actual_tokens):
+                actual_start, actual_tokens = next(actual_blocks, (len(actual), None))
+                actual_pos = 0
+            while expected_tokens is not None and expected_pos == len(expected_tokens):
+                expected_start, expected_tokens = next(expected_blocks, (len(expected), None))
+                expected_pos = 0
+            
+            if actual_tokens is None and expected_tokens is None:
+                return {'ok': True, 'message': f"{index} tokens match", 'tokens': index}
+            if expected_tokens is None:
+                offset = self.token_offset(actual, actual_start, actual_pos)
+                return self.difference(actual, offset, index,
+                                       f"Extra output after {index} tokens: {self.preview(actual_tokens[actual_pos])}")
+            if actual_tokens is None:
+                return self.difference(actual, len(actual), index,
+                                       f"Output ended after {index} tokens, "
+                                       f"expected {self.preview(expected_tokens[expected_pos])}")
+            
+            count = min(len(actual_tokens) - actual_pos, len(expected_tokens) - expected_pos)
+            actual_slice = actual_tokens[actual_pos:actual_pos + count]
+            expected_slice = expected_tokens[expected_pos:expected_pos + count]
+            # List comparison runs in C; only walk token by token when something differs
+            if actual_slice != expected_slice:
+                for i, (actual_token, expected_token) in enumerate(zip(actual_slice, expected_slice)):
+                    if actual_token != expected_token and not self.numbers_close(actual_token, expected_token):
+                        offset = self.token_offset(actual, actual_start, actual_pos + i)
+                        return self.difference(actual, offset, index + i,
+                                               f"Token {index + i + 1} differs: expected "
+                                               f"{self.preview(expected_token)}, found {self.preview(actual_token)}")
+            actual_pos += count
+            expected_pos += count
+            index += count
+    
+    @staticmethod
+    def token_blocks(data) -> Iterator[Tuple[int, list]]:
+        """Yield (block offset, tokens) for blocks of about CHUNK_SIZE bytes split on whitespace"""
+        start = 0
+        length = len(data)
+        while start < length:
+            end = min(start + CHUNK_SIZE, length)
+            if end < length:
+                # Extend the block to the next whitespace so no token is cut in half
+                match = WHITESPACE_PATTERN.search(data, end)
+                end = match.start() if match else length
+            yield start, data[start:end].split()
+            start = end
+    
+    @staticmethod
+    def token_offset(data, block_start: int, position: int) -> int:
+        """Byte offset of the position-th token of the block starting at block_start"""
+        for i, match in enumerate(TOKEN_PATTERN.finditer(data, block_start)):
+            if i == position:
+                return match.start()
+        return len(data)
+    
+    def check_exact(self, actual, expected) -> Dict[str, Any]:
+        """Compare byte for byte, chunk by chunk"""
+        length = min(len(actual), len(expected))
+        for start in range(0, length, CHUNK_SIZE):
+            actual_chunk = actual[start:start + CHUNK_SIZE]
+            expected_chunk = expected[start:start + CHUNK_SIZE]
+            if actual_chunk != expected_chunk:
+                offset = start + next(i for i, (a, b) in enumerate(zip(actual_chunk, expected_chunk)) if a != b)
+                return self.difference(actual, offset, None, f"Byte {offset} differs")
+        if len(actual) != len(expected):
+            return self.difference(actual, length, None,
+                                   f"Output is {len(actual)} bytes, expected {len(expected)}")
+        return {'ok': True, 'message': f"{length} bytes match"}
+    
+    def numbers_close(self, actual: bytes, expected: bytes) -> bool:
+        """Check whether two numeric tokens are within the configured tolerance"""
+        if not (self.abs_eps or self.rel_eps):
+            return False
+        if not (NUMBER_PATTERN.fullmatch(actual) and NUMBER_PATTERN.fullmatch(expected)):
+            return False
+        difference = abs(float(actual) - float(expected))
+        return difference <= self.abs_eps or difference <= self.rel_eps * abs(float(expected))
+    
+    @staticmethod
+    def preview(token: bytes, limit: int = 40) -> str:
+        """Printable, truncated form of a token for messages"""
+        text = token[:limit].decode('utf-8', errors='replace')
+        return repr(text + ('...' if len(token) > limit else ''))
+    
+    @staticmethod
+    def line_and_column(data, offset: int) -> Tuple[int, int]:
+        """Get the 1-based line and column of a byte offset, scanning in chunks"""
+        line = 1
+        line_start = 0
+        for start in range(0, offset, CHUNK_SIZE):
+            chunk = data[start:min(start + CHUNK_SIZE, offset)]
+            newlines = chunk.count(b'\n')
+            if newlines:
+                line += newlines
+                line_start = start + chunk.rindex(b'\n') + 1
+        return line, offset - line_start + 1
+    
+    def difference(self, actual, offset: int, index: Optional[int], message: str) -> Dict[str, Any]:
+        """Build the result for the first difference"""
+        line, column = self.line_and_column(actual, offset)
+        result = {'ok': False, 'message': f"{message} (line {line}, column {column})",
+                  'offset': offset, 'line': line, 'column': column}
+        if index is not None:
+            result['token_index'] = index
+        return result
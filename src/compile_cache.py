@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+PCH_HEADER = 'bits/stdc++.h'
+# #include "..." directives; these name local headers that are part of the solution
+LOCAL_INCLUDE_PATTERN = re.compile(rb'^[ \t]*#[ \t]*include[ \t]*"([^"\n]+)"', re.MULTILINE)
+
+class CompilationError(Exception):
+    """Raised when the solution does not compile"""
+
+class CompileCache:
+    """Content-addressed binary cache and precompiled header store shared by all problems.
+    
+    Binaries are keyed by a hash of the source, the local headers it includes,
+    the compiler version and flags, so an unchanged source is never compiled
+    twice, whichever problem it is in.
+    """
+    
+    def __init__(self, cache_directory: str, compiler: str = 'g++', flags: Optional[List[str]] = None,
+                 precompiled_header: bool = True, max_binaries: int = 200):
+        self.cache_directory = cache_directory
+        self.compiler = compiler
+        self.flags = flags if flags is not None else ['-O2', '-std=c++17']
+        self.precompiled_header = precompiled_header
+        self.max_binaries = max_binaries
+        self.binary_directory = os.path.join(cache_directory, 'bin')
+        self.stats_file = os.path.join(cache_directory, 'stats.jsonl')
+        self.compiler_version = None
+    
+    def get_compiler_version(self) -> str:
+        """Get the compiler's version banner, so upgrades invalidate cached artifacts"""
+        if self.compiler_version is None:
+            try:
+                process = subprocess.run([self.compiler, '--version'], capture_output=True, text=True)
+                self.compiler_version = process.stdout.strip()
+            except OSError:
+                self.compiler_version = ''
+        return self.compiler_version
+    
+    def get_key(self, *parts: bytes) -> str:
+        """Hash the given content together with the compiler version and flags"""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part)
+            digest.update(b'\0')
+        digest.update('\0'.join([self.compiler, self.get_compiler_version()] + self.flags).encode())
+        return digest.hexdigest()[:24]
+    
+    @staticmethod
+    def get_local_includes(source: str, content: bytes) -> List[bytes]:
+        """Collect the name and content of every header a source includes with quotes, recursively"""
+        parts = []
+        seen = set()
+        pending = [(os.path.dirname(os.path.abspath(source)), content)]
+        while pending:
+            directory, text = pending.pop()
+            for match in LOCAL_INCLUDE_PATTERN.finditer(text):
+                path = os.path.normpath(os.path.join(directory, match.group(1).decode('utf-8', errors='replace')))
+                if path in seen:
+                    continue
+                seen.add(path)
+                try:
+                    with open(path, 'rb') as f:
+                        header = f.read()
+                except OSError:
+                    # Not next to the source (e.g. found through -I); the compiler decides
+                    parts.append(match.group(1))
+                    continue
+                parts += [match.group(1), header]
+                pending.append((os.path.dirname(path), header))
+        return parts
+    
+    def get_pch_directory(self) -> Optional[str]:
+        """Get an include directory holding bits/stdc++.h.gch for the current compiler and flags.
+        
+        GCC looks for header.gch in each include directory before the header
+        itself, so passing this directory with -I makes #include <bits/stdc++.h>
+        load the precompiled header. Returns None if it cannot be built.
+        """
+        if not self.precompiled_header:
+            return None
+        pch_directory = os.path.abspath(os.path.join(self.cache_directory, f"pch-{self.get_key(PCH_HEADER.encode())}"))
+        gch_file = os.path.join(pch_directory, f"{PCH_HEADER}.gch")
+        if os.path.exists(gch_file):
+            return pch_directory
+        if os.path.exists(os.path.join(pch_directory, 'failed')):
+            return None
+        
+        os.makedirs(os.path.dirname(gch_file), exist_ok=True)
+        wrapper = os.path.join(pch_directory, 'stdc++.h')
+        with open(wrapper, 'w', encoding='utf-8') as f:
+            f.write(f"#include <{PCH_HEADER}>\n")
+        temp_gch = f"{gch_file}.{os.getpid()}.tmp"
+        print(f"Building precompiled header for {self.compiler} {' '.join(self.flags)}")
+        start = time.perf_counter()
+        process = subprocess.run([self.compiler] + self.flags + ['-x', 'c++-header', wrapper, '-o', temp_gch],
+                                 capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        if process.returncode != 0:
+            # Not GCC, or the header is unavailable: remember so we don't retry on every compile
+            print(f"Failed to build precompiled header: {process.stderr.strip()}")
+            open(os.path.join(pch_directory, 'failed'), 'w').close()
+            return None
+        os.replace(temp_gch, gch_file)
+        self.record({'event': 'pch_build', 'seconds': elapsed})
+        return pch_directory
+    
+    def compile(self, source: str) -> Tuple[str, bool]:
+        """Compile source, returning the cached binary path and whether it was a cache hit"""
+        start = time.perf_counter()
+        with open(source, 'rb') as f:
+            content = f.read()
+        # Editing an included local header must rebuild the binary too
+        key = self.get_key(content, *self.get_local_includes(source, content))
+        os.makedirs(self.binary_directory, exist_ok=True)
+        binary = os.path.abspath(os.path.join(self.binary_directory, key))
+        if os.path.exists(binary):
+            # Refresh the mtime so pruning evicts least recently used binaries first
+            os.utime(binary)
+            self.record({'event': 'hit', 'seconds': time.perf_counter() - start})
+            return binary, True
+        
+        command = [self.compiler] + self.flags
+        pch_directory = self.get_pch_directory()
+        if pch_directory:
+            command += ['-I', pch_directory]
+        temp_binary = f"{binary}.{os.getpid()}.tmp"
+        compile_start = time.perf_counter()
+        process = subprocess.run(command + ['-o', temp_binary, source], capture_output=True, text=True)
+        if process.returncode != 0:
+            raise CompilationError(process.stderr)
+        os.replace(temp_binary, binary)
+        elapsed = time.perf_counter() - compile_start
+        print(f"Compiled {source} in {elapsed:.2f}s")
+        self.record({'event': 'miss', 'seconds': elapsed, 'pch': bool(pch_directory)})
+        self.prune()
+        return binary, False
+    
+    def prune(self) -> None:
+        """Delete the least recently used binaries beyond max_binaries"""
+        try:
+            entries = [entry for entry in os.scandir(self.binary_directory)
+                       if entry.is_file() and not entry.name.endswith('.tmp')]
+        except OSError:
+            return
+        if len(entries) <= self.max_binaries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_binaries]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+    
+    def record(self, event: Dict[str, Any]) -> None:
+        """Append a timing event to the stats log"""
+        event['time'] = time.time()
+        try:
+            os.makedirs(self.cache_directory, exist_ok=True)
+            with open(self.stats_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(event) + '\n')
+        except OSError as e:
+            print(f"Failed to record compile stats: {e}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Summarize the stats log: hit rate and time spent compiling"""
+        stats = {'hits': 0, 'misses': 0, 'hit_rate': 0.0, 'compile_seconds': 0.0,
+                 'mean_miss_seconds': 0.0, 'mean_hit_seconds': 0.0, 'pch_builds': 0,
+                 'pch_build_seconds': 0.0, 'binaries': 0}
+        hit_seconds = 0.0
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue
+                    if event.get('event') == 'hit':
+                        stats['hits'] += 1
+                        hit_seconds += event['seconds']
+                    elif event.get('event') == 'miss':
+                        stats['misses'] += 1
+                        stats['compile_seconds'] += event['seconds']
+                    elif event.get('event') == 'pch_build':
+                        stats['pch_builds'] += 1
+                        stats['pch_build_seconds'] += event['seconds']
+        except OSError:
+            pass
+        total = stats['hits'] + stats['misses']
+        if total:
+            stats['hit_rate'] = stats['hits'] / total
+        if stats['misses']:
+            stats['mean_miss_seconds'] = stats['compile_seconds'] / stats['misses']
+        if stats['hits']:
+            stats['mean_hit_seconds'] = hit_seconds / stats['hits']
+        if os.path.isdir(self.binary_directory):
+            stats['binaries'] = sum(1 for name in os.listdir(self.binary_directory) if not name.endswith('.tmp'))
+        return stats
+    
+    def clear(self) -> None:
+        """Remove all cached binaries, precompiled headers and stats"""
+        for name in os.listdir(self.cache_directory) if os.path.isdir(self.cache_directory) else []:
+            path = os.path.join(self.cache_directory, name)
+            if name == 'bin' or name.startswith('pch-') or name == 'stats.jsonl':
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    os.remove(path)
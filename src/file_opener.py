@@ -1,60 +1,146 @@
 import subprocess
 import os
-from typing import Dict, Any
+import threading
+import time
+from typing import Dict, Any, List, Optional
 
 class FileOpener:
-    """Handles opening files in the user's preferred editor"""
+    """Handles opening files in the user's preferred editor.
+    
+    Files requested through open_problem_files are handed to a launcher
+    thread, which waits until no more files arrive for batch_delay seconds
+    and then opens all of them with a single editor invocation.
+    """
+    
+    # Arguments that make an editor open files in its running window instead of a new instance.
+    # Geany and Sublime Text already do this by default (Geany through its socket).
+    REUSE_ARGS = {
+        'code': ['--reuse-window'],
+        'code-insiders': ['--reuse-window'],
+        'codium': ['--reuse-window'],
+        'cursor': ['--reuse-window'],
+        'kate': ['--use'],
+        'gvim': ['--remote-tab-silent']
+    }
+    
+    # Upper bound on how long a steady stream of files can delay the launch
+    MAX_BATCH_WAIT = 5.0
     
     def __init__(self, editor_config: Dict[str, Any]):
-        self.editor_config = editor_config
-        self.editor_command = editor_config.get('command', 'code')
-        self.editor_args = editor_config.get('args', [])
+        self.pending = []
+        self.launching = False
+        self.condition = threading.Condition()
+        self.thread = None
+        self.configure(editor_config)
     
-    def open_file(self, file_path: str) -> bool:
-        """Open a file with the configured editor"""
-        try:
-            if not os.path.exists(file_path):
+    def configure(self, editor_config: Dict[str, Any]) -> None:
+        """Apply editor settings; files already queued are opened with the new ones"""
+        reuse_args = editor_config.get('reuse_args')
+        if reuse_args is None:
+            command = editor_config.get('command', 'code')
+            reuse_args = self.get_reuse_args(command) if editor_config.get('reuse_instance', True) else []
+        with self.condition:
+            self.editor_config = editor_config
+            self.editor_command = editor_config.get('command', 'code')
+            self.editor_args = editor_config.get('args', [])
+            self.reuse_args = reuse_args
+            self.batch_delay = editor_config.get('batch_delay', 0.2)
+    
+    @staticmethod
+    def get_reuse_args(command: str) -> List[str]:
+        """Get the arguments that make a known editor reuse its running instance"""
+        name = os.path.splitext(os.path.basename(command))[0].lower()
+        return list(FileOpener.REUSE_ARGS.get(name, []))
+    
+    def open_files(self, file_paths: List[str]) -> bool:
+        """Open files with the configured editor in a single invocation"""
+        existing = []
+        for file_path in file_paths:
+            if os.path.exists(file_path):
+                existing.append(file_path)
+            else:
                 print(f"File not found: {file_path}")
-                return False
-            
+        if not existing:
+            return False
+        try:
             # Build the command
-            cmd = [self.editor_command] + self.editor_args + [file_path]
+            with self.condition:
+                cmd = [self.editor_command] + self.reuse_args + self.editor_args + existing
             
-            # Open the file
+            # Open the files
             subprocess.Popen(cmd, start_new_session=True)
-            print(f"Opened file: {file_path}")
             return True
-            
+        
         except FileNotFoundError:
             print(f"Editor command not found: {self.editor_command}")
             print("Please check your editor configuration in settings.json")
             return False
         except Exception as e:
-            print(f"Failed to open file {file_path}: {e}")
+            print(f"Failed to open files {', '.join(existing)}: {e}")
             return False
     
+    def open_file(self, file_path: str) -> bool:
+        """Open a file with the configured editor"""
+        return self.open_files([file_path])
+    
+    def open_files_later(self, file_paths: List[str]) -> None:
+        """Queue files for the launcher thread, which opens them together with other queued files"""
+        with self.condition:
+            for file_path in file_paths:
+                if file_path not in self.pending:
+                    self.pending.append(file_path)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.launcher, name="editor-launcher", daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+    
+    def launcher(self) -> None:
+        """Open queued files once requests stop adding to them"""
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                self.launching = True
+                deadline = time.monotonic() + self.MAX_BATCH_WAIT
+                while time.monotonic() < deadline:
+                    count = len(self.pending)
+                    self.condition.wait(self.batch_delay)
+                    if len(self.pending) == count:
+                        break
+                file_paths, self.pending = self.pending, []
+            try:
+                self.open_files(file_paths)
+            finally:
+                with self.condition:
+                    self.launching = False
+                    self.condition.notify_all()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued file has been handed to the editor"""
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.pending and not self.launching, timeout)
+    
+    def get_problem_files(self, problem_dir: str, file_naming: Dict[str, str]) -> List[str]:
+        """Get the files of a problem that are configured to be opened"""
+        file_paths = []
+        # Open solution file if configured
+        if self.editor_config.get('open_solution', True):
+            file_paths.append(os.path.join(problem_dir, file_naming.get('solution_file', 'solution.cpp')))
+        # Optionally open first test case
+        if self.editor_config.get('open_testcase', False):
+            testcase_file = os.path.join(problem_dir, 'in1')
+            if os.path.exists(testcase_file):
+                file_paths.append(testcase_file)
+        # Optionally open metadata
+        if self.editor_config.get('open_metadata', False):
+            file_paths.append(os.path.join(problem_dir, file_naming.get('metadata_file', 'metadata.json')))
+        return file_paths
+    
     def open_problem_files(self, problem_dir: str, problem_id: str, file_naming: Dict[str, str]) -> None:
-        """Open relevant files after problem creation"""
+        """Open relevant files after problem creation, batched with other problems opened around the same time"""
         try:
-            # Open solution file if configured
-            if self.editor_config.get('open_solution', True):
-                solution_file = os.path.join(problem_dir, file_naming.get('solution_file', 'solution.cpp'))
-                if os.path.exists(solution_file):
-                    self.open_file(solution_file)
-                else:
-                    print(f"Solution file not found: {solution_file}")
-            
-            # Optionally open first test case
-            if self.editor_config.get('open_testcase', False):
-                testcase_file = os.path.join(problem_dir, 'in1')
-                if os.path.exists(testcase_file):
-                    self.open_file(testcase_file)
-            
-            # Optionally open metadata
-            if self.editor_config.get('open_metadata', False):
-                metadata_file = os.path.join(problem_dir, file_naming.get('metadata_file', 'metadata.json'))
-                if os.path.exists(metadata_file):
-                    self.open_file(metadata_file)
-        
+            file_paths = self.get_problem_files(problem_dir, file_naming)
+            if file_paths:
+                self.open_files_later(file_paths)
         except Exception as e:
-            print(f"Failed to open problem files: {e}") 
\ No newline at end of file
+            print(f"Failed to open problem files: {e}")
@@ -0,0 +1,93 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+from src.utils.config_parser import ConfigParser
+
+class HtmlArchive:
+    """Content-addressed store of every received problem page.
+    
+    Pages are stored gzip-compressed under their SHA-256, and an append-only
+    manifest maps (url, hash) to the result of importing that page, so a page
+    that was already imported can be recognized without parsing it again.
+    """
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.manifest_file = os.path.join(directory, 'manifest.jsonl')
+        self.lock = threading.Lock()
+        self.results = {}
+        self.latest = {}
+        self.load_manifest()
+    
+    @staticmethod
+    def get_directory(config: ConfigParser) -> str:
+        """Get the archive location, by default inside output_directory"""
+        return config.get('archive.directory') or os.path.join(config.get('output_directory'), '.archive')
+    
+    @staticmethod
+    def get_hash(html: str) -> str:
+        """Get the content hash of a page"""
+        return hashlib.sha256(html.encode('utf-8')).hexdigest()
+    
+    def get_path(self, html_hash: str) -> str:
+        """Get the blob path of a page, fanned out by hash prefix"""
+        return os.path.join(self.directory, html_hash[:2], f"{html_hash}.html.gz")
+    
+    def load_manifest(self) -> None:
+        """Load the (url, hash) -> result map from the manifest"""
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.results[(entry['url'], entry['hash'])] = entry.get('result')
+                    self.latest[entry['url'] or entry['hash']] = (entry['url'], entry['hash'])
+        except OSError:
+            pass
+    
+    def store(self, html: str, html_hash: Optional[str] = None) -> str:
+        """Store a page if it is not archived yet and return its hash"""
+        html_hash = html_hash or self.get_hash(html)
+        path = self.get_path(html_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(temp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+                f.write(html)
+            os.replace(temp_path, path)
+        return html_hash
+    
+    def load(self, html_hash: str) -> Optional[str]:
+        """Read an archived page back"""
+        try:
+            with gzip.open(self.get_path(html_hash), 'rt', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    def get_result(self, url: str, html_hash: str) -> Optional[Dict[str, Any]]:
+        """Get the result of a previous successful import of exactly this page"""
+        with self.lock:
+            return self.results.get((url, html_hash))
+    
+    def record(self, url: str, html_hash: str, result: Optional[Dict[str, Any]]) -> None:
+        """Append an import result to the manifest"""
+        entry = {'url': url, 'hash': html_hash, 'received': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                 'result': result}
+        with self.lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.manifest_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+            self.results[(url, html_hash)] = result
+            self.latest[url or html_hash] = (url, html_hash)
+    
+    def get_latest_pages(self) -> List[Tuple[str, str]]:
+        """Get (url, hash) of the most recent page received for every URL"""
+        with self.lock:
+            return list(self.latest.values())
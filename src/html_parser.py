@@ -1,11 +1,64 @@
-from bs4 import BeautifulSoup
-from typing import Dict, Any
+from lxml import etree, html as lxml_html
+from typing import Dict, Any, Optional, Iterator
 from datetime import datetime
 import re
 
+PROBLEM_URL_PATTERN = re.compile(r'/problemset/problem/(\d+)/([A-Z])|/contest/(\d+)/problem/([A-Z])|/gym/(\d+)/problem/([A-Z])')
+PAGE_URL_PATTERN = re.compile(r'<(?:link[^>]+rel="canonical"[^>]+href|meta[^>]+property="og:url"[^>]+content)="([^"]+)"')
+
+def _class_xpath(class_name: str) -> str:
+    """XPath predicate matching a div whose class list contains class_name"""
+    return f"//div[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+# Precompiled queries mirroring the BeautifulSoup find/find_all calls in parse_problem
+TITLE_XPATH = etree.XPath(f"({_class_xpath('title')})[1]")
+TIME_LIMIT_XPATH = etree.XPath(f"({_class_xpath('time-limit')})[1]")
+MEMORY_LIMIT_XPATH = etree.XPath(f"({_class_xpath('memory-limit')})[1]")
+INPUTS_XPATH = etree.XPath(_class_xpath('input'))
+OUTPUTS_XPATH = etree.XPath(_class_xpath('output'))
+PRE_XPATH = etree.XPath("(.//pre)[1]")
+
+# Elements whose text BeautifulSoup does not report from get_text()
+SKIPPED_TEXT_TAGS = {'script', 'style', 'template'}
+
+# A small statement in the extension's format, parsed at startup to warm up the parser
+WARMUP_PAGE = (
+    '<div class="problem-statement"><div class="header"><div class="title">A. Warm Up</div>'
+    '<div class="time-limit"><div class="property-title">time limit per test</div>1 second</div>'
+    '<div class="memory-limit"><div class="property-title">memory limit per test</div>256 megabytes</div></div>'
+    '<div class="sample-tests"><div class="sample-test">'
+    '<div class="input"><div class="title">Input</div><pre>'
+    '<div class="test-example-line test-example-line-odd test-example-line-0">2</div>'
+    '<div class="test-example-line test-example-line-even test-example-line-1">1 2</div>'
+    '<div class="test-example-line test-example-line-odd test-example-line-2">3 4</div></pre></div>'
+    '<div class="output"><div class="title">Output</div><pre>3<br />7</pre></div>'
+    '</div></div></div>'
+)
+
 class CodeforcesHTMLParser:
+    @staticmethod
+    def extract_problem_id(url: str) -> Optional[str]:
+        """Get the problem id (e.g. 1850A) from a problemset, contest or gym URL"""
+        match = PROBLEM_URL_PATTERN.search(url)
+        if match:
+            if match.group(1) and match.group(2):
+                return f"{match.group(1)}{match.group(2)}"
+            elif match.group(3) and match.group(4):
+                return f"{match.group(3)}{match.group(4)}"
+            elif match.group(5) and match.group(6):
+                return f"{match.group(5)}{match.group(6)}"
+        return None
+
+    @staticmethod
+    def extract_page_url(html: str) -> str:
+        """Get the canonical URL embedded in a saved page, if any"""
+        match = PAGE_URL_PATTERN.search(html)
+        return match.group(1) if match else ''
+
     @staticmethod
     def parse_problem(html: str) -> Dict[str, Any]:
+        # Imported on first use, the lxml fast path does not need BeautifulSoup
+        from bs4 import BeautifulSoup
         soup = BeautifulSoup(html, 'lxml')
         data = {}
         # Problem name
@@ -41,4 +94,93 @@ class CodeforcesHTMLParser:
         data['test_cases'] = test_cases
         # Created date with hour, minute, and second
         data['created_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        return data 
\ No newline at end of file
+        return data
+
+    @staticmethod
+    def _iter_strings(element) -> Iterator[str]:
+        """Yield the text nodes under an lxml element the way BeautifulSoup's get_text sees them"""
+        if not isinstance(element.tag, str) or element.tag in SKIPPED_TEXT_TAGS:
+            return
+        if element.text:
+            yield element.text
+        for child in element:
+            yield from CodeforcesHTMLParser._iter_strings(child)
+            if child.tail:
+                yield child.tail
+
+    @staticmethod
+    def _get_text(element, separator: str = '') -> str:
+        """Equivalent of BeautifulSoup's get_text(separator, strip=True) for lxml elements"""
+        strings = (text.strip() for text in CodeforcesHTMLParser._iter_strings(element))
+        return separator.join(text for text in strings if text)
+
+    @staticmethod
+    def parse_problem_lxml(html: str) -> Dict[str, Any]:
+        """Parse a problem page with lxml and precompiled XPath, skipping BeautifulSoup entirely"""
+        root = lxml_html.document_fromstring(html)
+        get_text = CodeforcesHTMLParser._get_text
+        data = {}
+        # Problem name
+        title = TITLE_XPATH(root)
+        data['problem_name'] = get_text(title[0]) if title else 'Unknown Problem'
+        # Time limit
+        time_limit = TIME_LIMIT_XPATH(root)
+        if time_limit:
+            text = get_text(time_limit[0], " ")
+            match = re.search(r'(\d+\.?\d*)\s*(second|seconds)', text)
+            data['time_limit'] = f"{match.group(1)} {match.group(2)}" if match else 'Unknown'
+        else:
+            data['time_limit'] = 'Unknown'
+        # Memory limit
+        memory_limit = MEMORY_LIMIT_XPATH(root)
+        if memory_limit:
+            text = get_text(memory_limit[0], " ")
+            match = re.search(r'(\d+)\s*(megabyte|megabytes)', text)
+            data['memory_limit'] = f"{match.group(1)} {match.group(2)}" if match else 'Unknown'
+        else:
+            data['memory_limit'] = 'Unknown'
+        # Test cases
+        test_cases = []
+        for inp, out in zip(INPUTS_XPATH(root), OUTPUTS_XPATH(root)):
+            in_pre = PRE_XPATH(inp)
+            out_pre = PRE_XPATH(out)
+            test_cases.append({
+                'input': get_text(in_pre[0], '\n') if in_pre else '',
+                'output': get_text(out_pre[0], '\n') if out_pre else ''
+            })
+        data['test_cases'] = test_cases
+        # Created date with hour, minute, and second
+        data['created_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return data
+
+    @staticmethod
+    def parse_problem_fast(html: str, verify: bool = False) -> Dict[str, Any]:
+        """Parse with the lxml fast path, falling back to BeautifulSoup on failure.
+        
+        With verify enabled both parsers run and the BeautifulSoup result is
+        returned whenever the two disagree.
+        """
+        try:
+            data = CodeforcesHTMLParser.parse_problem_lxml(html)
+        except Exception as e:
+            print(f"Fast parser failed, falling back to BeautifulSoup: {e}")
+            return CodeforcesHTMLParser.parse_problem(html)
+        
+        if verify:
+            reference = CodeforcesHTMLParser.parse_problem(html)
+            if not CodeforcesHTMLParser.results_match(data, reference):
+                print("Fast parser result differs from BeautifulSoup, using BeautifulSoup result")
+                return reference
+        return data
+
+    @staticmethod
+    def warm_up(verify: bool = False) -> Dict[str, Any]:
+        """Parse a built-in sample page so the first real request does not pay for cold initialization"""
+        return CodeforcesHTMLParser.parse_problem_fast(WARMUP_PAGE, verify=verify)
+
+    @staticmethod
+    def results_match(first: Dict[str, Any], second: Dict[str, Any]) -> bool:
+        """Compare two parse results, ignoring the creation timestamp"""
+        ignored = {'created_date'}
+        return ({k: v for k, v in first.items() if k not in ignored} ==
+                {k: v for k, v in second.items() if k not in ignored}) 
\ No newline at end of file
@@ -0,0 +1,158 @@
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Optional, Callable
+
+class Job:
+    """A single unit of work submitted to the job queue"""
+    
+    def __init__(self, key: Optional[str], payload: Any, handler: Optional[Callable[[Any], Any]] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.payload = payload
+        self.handler = handler
+        self.status = 'queued'
+        self.result = None
+        self.error = None
+        self.submissions = 1
+        self.created = datetime.now().isoformat()
+        self.started = None
+        self.finished = None
+    
+    def is_active(self) -> bool:
+        """Check whether the job is still waiting or running"""
+        return self.status in ('queued', 'running')
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a JSON-serializable view of the job"""
+        return {
+            'job_id': self.id,
+            'key': self.key,
+            'status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'submissions': self.submissions,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished
+        }
+
+class JobQueue:
+    """Bounded in-process queue processed by a pool of worker threads.
+    
+    Jobs submitted with the same key while an earlier one is still queued or
+    running are merged into that job instead of running the handler twice.
+    """
+    
+    def __init__(self, handler: Callable[[Any], Any], workers: int = 2,
+                 max_size: int = 32, history_size: int = 256):
+        self.handler = handler
+        self.queue = queue.Queue(maxsize=max_size)
+        self.history_size = history_size
+        self.jobs = OrderedDict()
+        self.active = {}
+        # Queued or running jobs, keyed or not
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.threads = []
+        for i in range(workers):
+            thread = threading.Thread(target=self.worker, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+    
+    def submit(self, key: Optional[str], payload: Any, handler: Optional[Callable[[Any], Any]] = None,
+               on_merge: Optional[Callable[[Any], None]] = None) -> Optional[Job]:
+        """Queue a payload, returning the existing job if one with the same key is active.
+        
+        The job runs the queue's default handler unless one is given.
+        When the payload is merged into an active job, on_merge is called with
+        whichever payload will now never be processed. Returns None if the
+        queue is full.
+        """
+        dropped = None
+        with self.lock:
+            if key is not None and key in self.active:
+                job = self.active[key]
+                job.submissions += 1
+                dropped = payload
+                if job.status == 'queued':
+                    # Not started yet, so process the most recent payload
+                    dropped = job.payload
+                    job.payload = payload
+            else:
+                job = Job(key, payload, handler or self.handler)
+                try:
+                    self.queue.put_nowait(job)
+                except queue.Full:
+                    return None
+                
+                self.jobs[job.id] = job
+                self.pending += 1
+                if key is not None:
+                    self.active[key] = job
+                while len(self.jobs) > self.history_size:
+                    oldest_id, oldest = next(iter(self.jobs.items()))
+                    if oldest.is_active():
+                        break
+                    del self.jobs[oldest_id]
+        # Outside the lock, since the callback may do I/O
+        if dropped is not None and on_merge:
+            on_merge(dropped)
+        return job
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by id"""
+        with self.lock:
+            return self.jobs.get(job_id)
+    
+    def worker(self) -> None:
+        """Process jobs until a stop sentinel is received"""
+        while True:
+            job = self.queue.get()
+            if job is None:
+                self.queue.task_done()
+                return
+            
+            with self.lock:
+                job.status = 'running'
+                job.started = datetime.now().isoformat()
+                payload = job.payload
+            
+            try:
+                result = job.handler(payload)
+                status, error = ('done', None) if result is not False else ('failed', 'Handler reported failure')
+            except Exception as e:
+                print(f"Job {job.id} failed: {e}")
+                result, status, error = None, 'failed', str(e)
+            
+            with self.lock:
+                job.result = result if result is not False else None
+                job.status = status
+                job.error = error
+                job.finished = datetime.now().isoformat()
+                job.payload = None
+                self.pending -= 1
+                if job.key is not None and self.active.get(job.key) is job:
+                    del self.active[job.key]
+            self.queue.task_done()
+    
+    def pending_count(self) -> int:
+        """Number of jobs that are queued or running"""
+        with self.lock:
+            return self.pending
+    
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = None) -> bool:
+        """Stop the workers, optionally waiting up to timeout seconds for queued jobs to finish.
+        
+        Returns False if workers were still busy when the timeout ran out.
+        """
+        for _ in self.threads:
+            self.queue.put(None)
+        if wait:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            for thread in self.threads:
+                thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return not any(thread.is_alive() for thread in self.threads)
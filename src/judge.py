@@ -0,0 +1,358 @@
+import hashlib
+import json
+import math
+import os
+import re
+import resource
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple, Union
+from src.utils.config_parser import ConfigParser
+from src.utils.file_utils import FileUtils
+from src.compile_cache import CompileCache, CompilationError
+from src.checker import OutputChecker
+from src.languages import LanguageProfiles
+from src.run_history import RunHistory
+from src.warm_pool import WarmPool
+
+BUILD_DIRECTORY = '.judge'
+DEFAULT_TIME_LIMIT = 2.0
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024
+
+def parse_time_limit(text: str, default: float = DEFAULT_TIME_LIMIT) -> float:
+    """Convert a limit like '2 seconds' from metadata.json into seconds"""
+    match = re.search(r'(\d+\.?\d*)', str(text))
+    return float(match.group(1)) if match else default
+
+def parse_memory_limit(text: str, default: int = DEFAULT_MEMORY_LIMIT) -> int:
+    """Convert a limit like '256 megabytes' from metadata.json into bytes"""
+    match = re.search(r'(\d+)', str(text))
+    return int(match.group(1)) * 1024 * 1024 if match else default
+
+def allocation_failed(stderr_path: str) -> bool:
+    """Check whether a crashed program died because the address-space limit refused an allocation"""
+    try:
+        with open(stderr_path, 'rb') as f:
+            head = f.read(65536)
+        return b'std::bad_alloc' in head or b'MemoryError' in head or b'OutOfMemoryError' in head
+    except OSError:
+        return False
+
+def new_result(test: Dict[str, str]) -> Dict[str, Any]:
+    """An empty result row for a test"""
+    return {'test': test['name'], 'verdict': None, 'wall_ms': 0.0, 'cpu_ms': 0.0,
+            'peak_rss_kb': 0, 'exit_code': None, 'detail': ''}
+
+def check_result(result: Dict[str, Any], test: Dict[str, str], time_limit: float, memory_limit: int,
+                 timed_out: bool, checker: Optional[OutputChecker] = None) -> Dict[str, Any]:
+    """Set the verdict of a finished run from its usage, exit code and output"""
+    if timed_out or result['cpu_ms'] > time_limit * 1000 or result['exit_code'] == -signal.SIGXCPU:
+        result['verdict'] = 'TLE'
+    elif result['peak_rss_kb'] * 1024 > memory_limit or \
+            (result['exit_code'] != 0 and allocation_failed(test['stderr'])):
+        result['verdict'] = 'MLE'
+    elif result['exit_code'] != 0:
+        result['verdict'] = 'RE'
+        if result['exit_code'] < 0:
+            result['detail'] = f"Killed by {signal.Signals(-result['exit_code']).name}"
+        else:
+            result['detail'] = f"Exit code {result['exit_code']}"
+    elif not os.path.exists(test['expected']):
+        result['verdict'] = 'OK'
+        result['detail'] = 'No expected output'
+    else:
+        check = (checker or OutputChecker()).check(test['actual'], test['expected'])
+        result['verdict'] = 'OK' if check['ok'] else 'WA'
+        if not check['ok']:
+            result['detail'] = check['message']
+    return result
+
+def feed_input(source, pipe) -> None:
+    """Stream a decompressed test input into a program's stdin; runs on a helper thread"""
+    try:
+        with source, pipe:
+            for chunk in iter(lambda: source.read(1 << 20), b''):
+                pipe.write(chunk)
+    except (BrokenPipeError, OSError):
+        # The program exited (or was killed) without reading all of its input
+        pass
+
+def run_test(program: Union[str, List[str]], test: Dict[str, str], time_limit: float, memory_limit: int,
+             runner: Optional[str] = None, checker: Optional[OutputChecker] = None,
+             limit_address_space: bool = True) -> Dict[str, Any]:
+    """Run a binary (or a command list) on one test under CPU and memory rlimits; runs inside a worker process.
+    
+    With a run_limited runner the program is launched through it so the
+    reported peak RSS does not include this Python process. Without
+    limit_address_space only the measured peak RSS is held to the limit,
+    for runtimes like the JVM that reserve much more than they use.
+    """
+    cpu_seconds = math.ceil(time_limit) + 1
+    address_limit = memory_limit if limit_address_space else 0
+    
+    def apply_limits():
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+        if address_limit:
+            resource.setrlimit(resource.RLIMIT_AS, (address_limit, address_limit))
+            resource.setrlimit(resource.RLIMIT_STACK, (address_limit, address_limit))
+    
+    result = new_result(test)
+    stats_file = f"{test['actual']}.stats"
+    program = [program] if isinstance(program, str) else list(program)
+    if runner:
+        command = [runner, str(cpu_seconds), str(address_limit), stats_file] + program
+        preexec_fn = None
+    else:
+        command = program
+        preexec_fn = apply_limits
+    
+    timed_out = threading.Event()
+    feeder = None
+    try:
+        # A compressed input is decompressed on the fly into a pipe instead of being inflated on disk
+        compressed = FileUtils.is_compressed(test['input'])
+        with (FileUtils.open_binary(test['input']) if compressed else open(test['input'], 'rb')) as stdin, \
+                open(test['actual'], 'wb') as stdout, \
+                open(test['stderr'], 'wb') as stderr:
+            start = time.perf_counter()
+            process = subprocess.Popen(command, stdin=subprocess.PIPE if compressed else stdin, stdout=stdout,
+                                       stderr=stderr, preexec_fn=preexec_fn, start_new_session=True)
+            if compressed:
+                feeder = threading.Thread(target=feed_input, args=(stdin, process.stdin), daemon=True)
+                feeder.start()
+            
+            def kill():
+                timed_out.set()
+                os.killpg(process.pid, signal.SIGKILL)
+            
+            # CPU rlimit does not catch a program that sleeps or blocks, so also bound wall time
+            timer = threading.Timer(time_limit * 2 + 1, kill)
+            timer.start()
+            try:
+                _, status, usage = os.wait4(process.pid, 0)
+            finally:
+                timer.cancel()
+            result['wall_ms'] = (time.perf_counter() - start) * 1000
+            if feeder:
+                feeder.join()
+        process.returncode = os.waitstatus_to_exitcode(status)
+        cpu_time = usage.ru_utime + usage.ru_stime
+        peak_rss_kb = usage.ru_maxrss
+        if runner and not timed_out.is_set():
+            with open(stats_file, 'r') as f:
+                status, user_us, system_us, peak_rss_kb = (int(value) for value in f.read().split())
+            process.returncode = os.waitstatus_to_exitcode(status)
+            cpu_time = (user_us + system_us) / 1e6
+    except (OSError, ValueError) as e:
+        result['verdict'] = 'RE'
+        result['detail'] = f"Failed to run solution: {e}"
+        return result
+    
+    result['cpu_ms'] = cpu_time * 1000
+    result['peak_rss_kb'] = peak_rss_kb
+    result['exit_code'] = process.returncode
+    return check_result(result, test, time_limit, memory_limit, timed_out.is_set(), checker)
+
+RESULT_HEADER = f"{'test':<6} {'verdict':<8} {'wall ms':>9} {'cpu ms':>9} {'peak MB':>8}  detail"
+
+def format_result(result: Dict[str, Any]) -> str:
+    """One row of the results table printed under RESULT_HEADER"""
+    return (f"{result['test']:<6} {result['verdict']:<8} {result['wall_ms']:>9.1f} {result['cpu_ms']:>9.1f} "
+            f"{result['peak_rss_kb'] / 1024:>8.1f}  {result['detail']}")
+
+class Judge:
+    """Compiles a problem's solution once and runs all of its tests in parallel.
+    
+    The solution's language comes from the language profiles: C++ is built
+    through the shared compile cache, other compiled languages with their
+    profile's compile command, and interpreted languages with a warm pool
+    run in pre-started interpreter processes instead of a fresh one per test.
+    """
+    
+    def __init__(self, config: ConfigParser):
+        self.config = config
+        self.file_naming = config.get_file_naming()
+        self.compiler = config.get('judge.compiler', 'g++')
+        self.flags = config.get('judge.flags', ['-O2', '-std=c++17'])
+        self.workers = config.get('judge.workers') or os.cpu_count() or 1
+        self.cache_directory = config.get('judge.cache_directory') or \
+            os.path.join(config.get('output_directory'), '.cache')
+        self.runner = None
+        self.profiles = LanguageProfiles(config)
+        self.warm_pools = {}
+        self.checker = OutputChecker(
+            mode=config.get('checker.mode', 'tokens'),
+            abs_eps=config.get('checker.abs_eps', 0.0),
+            rel_eps=config.get('checker.rel_eps', 0.0)
+        )
+        self.history = RunHistory(RunHistory.get_directory(config), self.file_naming) \
+            if config.get('history.enabled', True) else None
+        self.compile_cache = CompileCache(
+            self.cache_directory,
+            compiler=self.compiler,
+            flags=self.flags,
+            precompiled_header=config.get('judge.precompiled_header', True),
+            max_binaries=config.get('judge.cache_max_binaries', 200)
+        )
+    
+    def get_limits(self, problem_dir: str) -> Tuple[float, int]:
+        """Read the time limit (seconds) and memory limit (bytes) from metadata.json"""
+        metadata_file = os.path.join(problem_dir, self.file_naming.get('metadata_file', 'metadata.json'))
+        try:
+            with open(metadata_file, 'r', encoding='utf-8') as f:
+                constraints = json.load(f).get('constraints', {})
+        except (OSError, ValueError) as e:
+            print(f"Failed to read limits from {metadata_file}, using defaults: {e}")
+            constraints = {}
+        return (parse_time_limit(constraints.get('time_limit', '')),
+                parse_memory_limit(constraints.get('memory_limit', '')))
+    
+    def find_tests(self, problem_dir: str) -> List[Dict[str, str]]:
+        """Find the in{i}/out{i} pairs in a problem directory, ordered by number"""
+        output_prefix = self.file_naming.get('output_prefix', 'out')
+        build_dir = os.path.join(problem_dir, BUILD_DIRECTORY)
+        return [{
+            'name': number,
+            'input': input_path,
+            'expected': output_path,
+            'actual': os.path.join(build_dir, f"{output_prefix}{number}.actual"),
+            'stderr': os.path.join(build_dir, f"{output_prefix}{number}.stderr")
+        } for number, input_path, output_path in FileUtils.list_test_files(problem_dir, self.file_naming)]
+    
+    def compile(self, problem_dir: str) -> Tuple[Dict[str, Any], bool]:
+        """Build the solution in whichever language the problem directory holds.
+        
+        Returns the program to run (its language, source, command, and whether
+        it runs in a warm pool) and whether the build came from the cache.
+        """
+        profile = self.profiles.detect(problem_dir)
+        source = os.path.abspath(os.path.join(problem_dir, profile.solution_file))
+        os.makedirs(os.path.join(problem_dir, BUILD_DIRECTORY), exist_ok=True)
+        values = {'source': source, 'binary': '', 'build': '',
+                  'memory_mb': self.get_limits(problem_dir)[1] // (1024 * 1024)}
+        cached = False
+        if profile.is_compiled_natively():
+            values['binary'], cached = self.compile_cache.compile(source)
+            if cached:
+                print(f"Using cached binary: {values['binary']}")
+        elif profile.compile_command:
+            values['build'], cached = self.compile_with_profile(profile, source, values)
+        else:
+            self.check_syntax(profile, source)
+        return {
+            'language': profile.name,
+            'source': source,
+            'command': profile.format_command(profile.run_command, values),
+            'warm': profile.warm_pool and bool(profile.interpreter),
+            'interpreter': profile.interpreter,
+            'limit_address_space': profile.limit_address_space
+        }, cached
+    
+    def compile_with_profile(self, profile, source: str, values: Dict[str, Any]) -> Tuple[str, bool]:
+        """Run a profile's compile command into a build directory keyed by the source hash"""
+        digest = FileUtils.get_file_hash(source)
+        if not digest:
+            raise OSError(f"Cannot read {source}")
+        key = hashlib.sha256(json.dumps([digest, profile.compile_command]).encode('utf-8')).hexdigest()[:16]
+        build = os.path.join(self.cache_directory, profile.name, key)
+        if os.path.isdir(build):
+            print(f"Using cached build: {build}")
+            return build, True
+        os.makedirs(os.path.dirname(build), exist_ok=True)
+        staging = tempfile.mkdtemp(dir=os.path.dirname(build), prefix=f".{key}-")
+        try:
+            command = profile.format_command(profile.compile_command, dict(values, build=staging))
+            process = subprocess.run(command, capture_output=True)
+            if process.returncode != 0:
+                raise CompilationError((process.stdout + process.stderr).decode('utf-8', errors='replace'))
+            try:
+                os.rename(staging, build)
+            except OSError:
+                # Another run built the same source first
+                if not os.path.isdir(build):
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return build, False
+    
+    @staticmethod
+    def check_syntax(profile, source: str) -> None:
+        """Report syntax errors of an interpreted solution before running every test"""
+        if profile.extension != '.py':
+            return
+        with open(source, 'rb') as f:
+            code = f.read()
+        try:
+            compile(code, source, 'exec')
+        except SyntaxError as e:
+            raise CompilationError(f"{source}:{e.lineno}:{e.offset}: {e.msg}\n{(e.text or '').rstrip()}")
+    
+    def get_warm_pool(self, interpreter: str) -> Optional[WarmPool]:
+        """Start (once) the warm pool of an interpreter; None falls back to a fresh process per test"""
+        if interpreter not in self.warm_pools:
+            try:
+                self.warm_pools[interpreter] = WarmPool(interpreter, self.workers)
+            except OSError as e:
+                print(f"Failed to start warm {interpreter} workers, starting one per test: {e}")
+                self.warm_pools[interpreter] = None
+        return self.warm_pools[interpreter]
+    
+    def submit(self, executor: Executor, program: Dict[str, Any], test: Dict[str, str], time_limit: float,
+               memory_limit: int) -> Future:
+        """Queue one test of a compiled program, on its warm pool if it has one"""
+        pool = self.get_warm_pool(program['interpreter']) if program['warm'] else None
+        if pool:
+            return pool.submit(program['source'], test, time_limit, memory_limit,
+                               program['limit_address_space'], self.checker)
+        return executor.submit(run_test, program['command'], test, time_limit, memory_limit, self.get_runner(),
+                               self.checker, program['limit_address_space'])
+    
+    def close(self) -> None:
+        """Stop the warm pools"""
+        for pool in self.warm_pools.values():
+            if pool:
+                pool.close()
+        self.warm_pools = {}
+    
+    def get_runner(self) -> Optional[str]:
+        """Build (once) the run_limited launcher used for accurate peak RSS"""
+        if self.runner:
+            return self.runner
+        source = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'native', 'run_limited.c')
+        try:
+            with open(source, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()[:16]
+            runner = os.path.join(self.cache_directory, f"run_limited-{digest}")
+            if not os.path.exists(runner):
+                os.makedirs(self.cache_directory, exist_ok=True)
+                compiler = self.config.get('judge.runner_compiler', 'cc')
+                subprocess.run([compiler, '-O2', '-o', f"{runner}.tmp", source],
+                               check=True, capture_output=True)
+                os.replace(f"{runner}.tmp", runner)
+            self.runner = os.path.abspath(runner)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"Failed to build run_limited, peak memory will include launcher overhead: {e}")
+        return self.runner
+    
+    def run(self, problem_dir: str, test_names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Run all (or the selected) tests in parallel and return one result per test"""
+        program, _ = self.compile(problem_dir)
+        time_limit, memory_limit = self.get_limits(problem_dir)
+        tests = self.find_tests(problem_dir)
+        if test_names:
+            tests = [test for test in tests if test['name'] in test_names]
+        if not tests:
+            return []
+        
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(tests))) as pool:
+            futures = [self.submit(pool, program, test, time_limit, memory_limit) for test in tests]
+            results = [future.result() for future in futures]
+        if self.history:
+            self.history.record(problem_dir, results, source=program['source'])
+        return results
+    
\ No newline at end of file
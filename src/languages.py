@@ -0,0 +1,100 @@
+import copy
+import os
+from typing import Dict, Any, List, Optional
+from src.utils.config_parser import ConfigParser
+
+# Built-in profiles; settings.json `languages.<name>` entries override or extend them.
+# Placeholders in commands: {source} solution file, {binary} compiled program,
+# {build} per-source build directory, {memory_mb} memory limit in megabytes.
+DEFAULT_PROFILES = {
+    'cpp': {
+        'extension': '.cpp',
+        'template': 'cpp_template',
+        'run': ['{binary}']
+    },
+    'python': {
+        'extension': '.py',
+        'template': 'python_template',
+        'interpreter': 'python3',
+        'run': ['{interpreter}', '{source}'],
+        'warm_pool': True
+    },
+    'pypy': {
+        'extension': '.py',
+        'template': 'python_template',
+        'interpreter': 'pypy3',
+        'run': ['{interpreter}', '{source}'],
+        'warm_pool': True
+    },
+    'java': {
+        'extension': '.java',
+        'template': 'java_template',
+        'solution_file': 'Main.java',
+        'compile': ['javac', '-encoding', 'UTF-8', '-d', '{build}', '{source}'],
+        'run': ['java', '-Xss256m', '-Xmx{memory_mb}m', '-XX:+UseSerialGC', '-cp', '{build}', 'Main'],
+        # The JVM reserves far more address space than it uses; memory is bounded by -Xmx instead
+        'limit_address_space': False
+    }
+}
+
+class LanguageProfile:
+    """How to name, build and run a solution in one language"""
+    
+    def __init__(self, name: str, settings: Dict[str, Any], file_naming: Dict[str, str]):
+        self.name = name
+        self.settings = settings
+        self.extension = settings.get('extension', '')
+        self.template = settings.get('template', f"{name}_template")
+        self.compile_command = settings.get('compile')
+        self.run_command = settings.get('run', ['{binary}'])
+        self.interpreter = settings.get('interpreter')
+        self.warm_pool = settings.get('warm_pool', False)
+        self.limit_address_space = settings.get('limit_address_space', True)
+        configured = file_naming.get('solution_file', 'solution.cpp')
+        if settings.get('solution_file'):
+            self.solution_file = settings['solution_file']
+        elif configured.endswith(self.extension):
+            self.solution_file = configured
+        else:
+            # solution.cpp becomes solution.py, solution.java, ...
+            self.solution_file = os.path.splitext(configured)[0] + self.extension
+    
+    def is_compiled_natively(self) -> bool:
+        """C++ goes through the shared compile cache; other compiled languages use their compile command"""
+        return self.name == 'cpp'
+    
+    def format_command(self, command: List[str], values: Dict[str, Any]) -> List[str]:
+        """Fill the placeholders of a command template"""
+        values = dict(values, interpreter=self.interpreter or '')
+        return [part.format(**values) for part in command]
+
+class LanguageProfiles:
+    """The configured language profiles, and which one a problem directory uses"""
+    
+    def __init__(self, config: ConfigParser):
+        self.default_language = config.get('default_language', 'cpp')
+        file_naming = config.get_file_naming()
+        settings = copy.deepcopy(DEFAULT_PROFILES)
+        for name, overrides in (config.get('languages') or {}).items():
+            settings.setdefault(name, {}).update(overrides or {})
+        self.profiles = {name: LanguageProfile(name, profile, file_naming) for name, profile in settings.items()}
+        if self.default_language not in self.profiles:
+            raise ValueError(f"No language profile for default_language '{self.default_language}'")
+    
+    def get(self, language: Optional[str] = None) -> LanguageProfile:
+        """Get a profile by name, or the default language's profile"""
+        return self.profiles[language or self.default_language]
+    
+    def get_solution_files(self) -> List[str]:
+        """Every solution file name any profile uses"""
+        return sorted({profile.solution_file for profile in self.profiles.values()})
+    
+    def detect(self, problem_dir: str) -> LanguageProfile:
+        """Get the profile whose solution file exists in a problem directory, preferring the default language"""
+        default = self.get()
+        if os.path.exists(os.path.join(problem_dir, default.solution_file)):
+            return default
+        for profile in self.profiles.values():
+            if os.path.exists(os.path.join(problem_dir, profile.solution_file)):
+                return profile
+        return default
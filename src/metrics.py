@@ -0,0 +1,150 @@
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Tuple
+
+# Histogram bucket upper bounds in seconds, from sub-millisecond parses to slow editor launches
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class RequestTrace:
+    """Stage timings and details collected for a single request"""
+    
+    def __init__(self, kind: str = 'receive'):
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.fields = {}
+    
+    def record(self, stage: str, seconds: float) -> None:
+        """Add time spent in a stage"""
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a JSON-serializable view of the trace"""
+        data = {'event': self.kind}
+        data.update(self.fields)
+        data['stages_ms'] = {stage: round(seconds * 1000, 3) for stage, seconds in self.stages.items()}
+        data['total_ms'] = round((time.perf_counter() - self.started) * 1000, 3)
+        return data
+
+class Metrics:
+    """Process-wide stage duration histograms and event counters in Prometheus text format.
+    
+    Code on the import pipeline wraps its work in timed(stage); the duration
+    goes into the histogram for that stage and into the request trace that is
+    active on the current thread, if any.
+    """
+    
+    def __init__(self, buckets: Tuple[float, ...] = STAGE_BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+        self.local = threading.local()
+        self.log_stream = None
+    
+    def configure(self, config) -> None:
+        """Apply the metrics section of the configuration"""
+        log_file = config.get('metrics.log_file')
+        if not config.get('metrics.log_requests', False):
+            log_stream = None
+        elif log_file:
+            log_stream = open(log_file, 'a', encoding='utf-8', buffering=1)
+        else:
+            log_stream = sys.stdout
+        # Swapped under the lock so a request finishing meanwhile never writes to a closed file
+        with self.lock:
+            old_stream, self.log_stream = self.log_stream, log_stream
+        if old_stream not in (None, sys.stdout):
+            old_stream.close()
+    
+    def observe(self, stage: str, seconds: float) -> None:
+        """Record one stage duration"""
+        with self.lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram['counts'][i] += 1
+                    break
+            histogram['sum'] += seconds
+            histogram['count'] += 1
+    
+    def increment(self, name: str, **labels: str) -> None:
+        """Increase a counter by one"""
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + 1
+    
+    def get_trace(self) -> Optional[RequestTrace]:
+        """Get the request trace active on this thread"""
+        return getattr(self.local, 'trace', None)
+    
+    def set_trace(self, trace: Optional[RequestTrace]) -> None:
+        """Make a request trace active on this thread, or clear it"""
+        self.local.trace = trace
+    
+    def annotate(self, **fields: Any) -> None:
+        """Attach details to the active request trace"""
+        trace = self.get_trace()
+        if trace is not None:
+            trace.fields.update(fields)
+    
+    def record(self, stage: str, seconds: float) -> None:
+        """Record a stage duration in its histogram and the active request trace"""
+        self.observe(stage, seconds)
+        trace = self.get_trace()
+        if trace is not None:
+            trace.record(stage, seconds)
+    
+    @contextmanager
+    def timed(self, stage: str):
+        """Time the enclosed block as one pipeline stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+    
+    def finish(self, trace: RequestTrace, status: str) -> None:
+        """Count a finished request and write its log line if enabled"""
+        self.observe('total', time.perf_counter() - trace.started)
+        self.increment('cf_requests_total', kind=trace.kind, status=status)
+        trace.fields['status'] = status
+        if self.log_stream is not None:
+            line = json.dumps(trace.to_dict())
+            with self.lock:
+                if self.log_stream is not None:
+                    self.log_stream.write(line + '\n')
+                    self.log_stream.flush()
+    
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = [
+            '# HELP cf_stage_duration_seconds Time spent in each import pipeline stage',
+            '# TYPE cf_stage_duration_seconds histogram'
+        ]
+        with self.lock:
+            for stage in sorted(self.histograms):
+                histogram = self.histograms[stage]
+                cumulative = 0
+                for bound, count in zip(self.buckets, histogram['counts']):
+                    cumulative += count
+                    lines.append(f'cf_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'cf_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram["count"]}')
+                lines.append(f'cf_stage_duration_seconds_sum{{stage="{stage}"}} {histogram["sum"]:.6f}')
+                lines.append(f'cf_stage_duration_seconds_count{{stage="{stage}"}} {histogram["count"]}')
+            names = sorted({name for name, _ in self.counters})
+            for name in names:
+                lines.append(f'# TYPE {name} counter')
+                for (counter, labels), value in sorted(self.counters.items()):
+                    if counter != name:
+                        continue
+                    label_text = ','.join(f'{key}="{label}"' for key, label in labels)
+                    lines.append(f'{name}{{{label_text}}} {value}')
+        return '\n'.join(lines) + '\n'
+
+metrics = Metrics()
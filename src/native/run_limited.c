@@ -0,0 +1,69 @@
+/*
+ * Runs a program under CPU and memory limits and reports its resource usage.
+ *
+ * Usage: run_limited <cpu_seconds> <memory_bytes> <stats_file> <program> [args...]
+ *
+ * The program is forked from this small process instead of from Python
+ * because on Linux a child's ru_maxrss includes the RSS of the process it
+ * was forked from. The program is looked up on PATH, so interpreters can be
+ * given by name. A memory_bytes of 0 leaves the address space unlimited.
+ * stats_file receives one line:
+ *     <wait status> <user time us> <system time us> <peak rss kb>
+ */
+#include <stdio.h>
+#include <stdlib.h>
+#include <sys/resource.h>
+#include <sys/types.h>
+#include <sys/wait.h>
+#include <unistd.h>
+
+static void set_limit(int resource, rlim_t soft, rlim_t hard) {
+    struct rlimit limit;
+    limit.rlim_cur = soft;
+    limit.rlim_max = hard;
+    setrlimit(resource, &limit);
+}
+
+int main(int argc, char **argv) {
+    if (argc < 5) {
+        fprintf(stderr, "usage: %s <cpu_seconds> <memory_bytes> <stats_file> <program> [args...]\n", argv[0]);
+        return 2;
+    }
+    rlim_t cpu_seconds = strtoull(argv[1], NULL, 10);
+    rlim_t memory_bytes = strtoull(argv[2], NULL, 10);
+
+    pid_t pid = fork();
+    if (pid < 0) {
+        perror("fork");
+        return 2;
+    }
+    if (pid == 0) {
+        set_limit(RLIMIT_CPU, cpu_seconds, cpu_seconds + 1);
+        if (memory_bytes) {
+            set_limit(RLIMIT_AS, memory_bytes, memory_bytes);
+            set_limit(RLIMIT_STACK, memory_bytes, memory_bytes);
+        }
+        execvp(argv[4], argv + 4);
+        perror("execvp");
+        _exit(127);
+    }
+
+    int status;
+    struct rusage usage;
+    if (wait4(pid, &status, 0, &usage) < 0) {
+        perror("wait4");
+        return 2;
+    }
+
+    FILE *stats = fopen(argv[3], "w");
+    if (!stats) {
+        perror("fopen");
+        return 2;
+    }
+    fprintf(stats, "%d %lld %lld %ld\n", status,
+            (long long)usage.ru_utime.tv_sec * 1000000 + usage.ru_utime.tv_usec,
+            (long long)usage.ru_stime.tv_sec * 1000000 + usage.ru_stime.tv_usec,
+            usage.ru_maxrss);
+    fclose(stats);
+    return 0;
+}
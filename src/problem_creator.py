@@ -1,9 +1,14 @@
+import json
 import os
 from typing import Dict, Any, Optional
 from src.utils.config_parser import ConfigParser
 from src.utils.file_utils import FileUtils
+from src.sample_splitter import split_test_case
 from src.template_manager import TemplateManager
+from src.languages import LanguageProfiles
 from src.file_opener import FileOpener
+from src.problem_index import ProblemIndex
+from src.metrics import metrics
 
 class ProblemCreator:
     """Main class that coordinates problem creation"""
@@ -13,55 +18,105 @@ class ProblemCreator:
         self.template_manager = TemplateManager(config.get('template_directory'))
         self.file_opener = FileOpener(config.get_editor_config())
         self.file_naming = config.get_file_naming()
+        self.profiles = LanguageProfiles(config)
+        self.index = None
+        if config.get('index.enabled', True):
+            try:
+                self.index = ProblemIndex(ProblemCreator.get_index_path(config))
+            except Exception as e:
+                print(f"Failed to open problem index: {e}")
+    
+    @staticmethod
+    def get_index_path(config: ConfigParser) -> str:
+        """Get the problem index location, by default inside output_directory"""
+        return config.get('index.path') or os.path.join(config.get('output_directory'), '.index.sqlite')
     
     def create_problem(self, problem_id: str, problem_data: Dict[str, Any]) -> bool:
         """Create a complete problem setup from browser extension/server workflow"""
         try:
-            print(f"Creating problem: {problem_id}")
             # Add problem ID to data
             problem_data['problem_id'] = problem_id
-            problem_data['language'] = self.config.get('default_language', 'cpp')
-            # Create problem directory
+            profile = self.profiles.get()
+            problem_data['language'] = profile.name
             output_dir = self.config.get('output_directory')
-            problem_dir = FileUtils.create_problem_directory(output_dir, problem_id)
-            print(f"Created problem directory: {problem_dir}")
-            # Create solution file
-            solution_file = os.path.join(problem_dir, self.file_naming.get('solution_file', 'solution.cpp'))
-            if not self.template_manager.create_solution_file(problem_data, solution_file):
+            problem_dir = os.path.join(output_dir, problem_id)
+            solution_name = profile.solution_file
+            metadata_name = self.file_naming.get('metadata_file', 'metadata.json')
+            # Keep the original creation date so re-importing leaves metadata untouched
+            created_date = self.get_created_date(os.path.join(problem_dir, metadata_name))
+            if created_date:
+                problem_data['created_date'] = created_date
+            # Render every file before touching the problem directory
+            with metrics.timed('render'):
+                solution = self.template_manager.render_solution(problem_data, profile.template)
+                metadata = self.template_manager.render_metadata(problem_data)
+            if not solution:
                 print("Failed to create solution file")
                 return False
-            print(f"Created solution file: {solution_file}")
-            # Create test case files
-            self.create_test_case_files(problem_dir, problem_data.get('test_cases', []))
-            # Create metadata file
-            metadata_file = os.path.join(problem_dir, self.file_naming.get('metadata_file', 'metadata.json'))
-            if not self.template_manager.create_metadata_file(problem_data, metadata_file):
+            if not metadata:
                 print("Failed to create metadata file")
                 return False
-            print(f"Created metadata file: {metadata_file}")
+            files = {solution_name: solution}
+            files.update(self.build_test_case_files(problem_data.get('test_cases', [])))
+            files[metadata_name] = metadata
+            # The solution may already hold work in progress, so it is never overwritten
+            with metrics.timed('write'):
+                status = FileUtils.write_files_atomic(problem_dir, files, preserve={solution_name})
+            counts = {}
+            for file_status in status.values():
+                counts[file_status] = counts.get(file_status, 0) + 1
+            metrics.annotate(problem_id=problem_id, problem_dir=problem_dir, files=counts)
+            # Update the problem index
+            if self.index:
+                try:
+                    with metrics.timed('index'):
+                        self.index.add_problem(problem_id, problem_data, problem_dir)
+                except Exception as e:
+                    print(f"Failed to index problem {problem_id}: {e}")
             # Open files if configured
             if self.config.get('auto_open_files', True):
-                self.file_opener.open_problem_files(problem_dir, problem_id, self.file_naming)
-            print(f"Successfully created problem: {problem_id}")
+                with metrics.timed('open'):
+                    self.file_opener.open_problem_files(problem_dir, problem_id,
+                                                        dict(self.file_naming, solution_file=solution_name))
             return True
         except Exception as e:
             print(f"Failed to create problem {problem_id}: {e}")
             return False
     
+    @staticmethod
+    def get_created_date(metadata_file: str) -> Optional[str]:
+        """Get the creation date recorded in an existing metadata file"""
+        content = FileUtils.read_file(metadata_file)
+        if not content:
+            return None
+        try:
+            return json.loads(content).get('date') or None
+        except (ValueError, AttributeError):
+            return None
+    
+    def build_test_case_files(self, test_cases: list) -> Dict[str, str]:
+        """Map test case file names to their contents"""
+        input_prefix = self.file_naming.get('input_prefix', 'in')
+        output_prefix = self.file_naming.get('output_prefix', 'out')
+        start_number = self.config.get('test_cases.start_number', 1)
+        split = self.config.get('test_cases.split_multitest', False)
+        max_cases = self.config.get('test_cases.max_split_cases', 100)
+        files = {}
+        for i, test_case in enumerate(test_cases, start_number):
+            files[f"{input_prefix}{i}"] = test_case.get('input', '')
+            files[f"{output_prefix}{i}"] = test_case.get('output', '')
+            # Also write each case of a multi-test sample as its own test, numbered i.1, i.2, ...
+            for j, case in enumerate((split_test_case(test_case, max_cases) if split else None) or [], 1):
+                files[f"{input_prefix}{i}.{j}"] = case['input']
+                files[f"{output_prefix}{i}.{j}"] = case['output']
+        return files
+    
     def create_test_case_files(self, problem_dir: str, test_cases: list) -> None:
         """Create test case input and output files"""
         try:
-            input_prefix = self.file_naming.get('input_prefix', 'in')
-            output_prefix = self.file_naming.get('output_prefix', 'out')
-            start_number = self.config.get('test_cases.start_number', 1)
-            for i, test_case in enumerate(test_cases, start_number):
-                # Create input file
-                input_file = os.path.join(problem_dir, f"{input_prefix}{i}")
-                if FileUtils.write_file(input_file, test_case.get('input', '')):
-                    print(f"Created input file: {input_file}")
-                # Create output file
-                output_file = os.path.join(problem_dir, f"{output_prefix}{i}")
-                if FileUtils.write_file(output_file, test_case.get('output', '')):
-                    print(f"Created output file: {output_file}")
+            files = self.build_test_case_files(test_cases)
+            status = FileUtils.write_files_atomic(problem_dir, files)
+            for name in files:
+                print(f"{status[name].capitalize()} test file: {os.path.join(problem_dir, name)}")
         except Exception as e:
-            print(f"Failed to create test case files: {e}") 
\ No newline at end of file
+            print(f"Failed to create test case files: {e}")
@@ -0,0 +1,198 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+from src.utils.file_utils import FileUtils
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS problems (
+    problem_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    url TEXT,
+    contest TEXT,
+    time_limit TEXT,
+    memory_limit TEXT,
+    test_count INTEGER,
+    created_date TEXT,
+    content_hash TEXT,
+    directory TEXT,
+    indexed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS problems_contest ON problems (contest);
+CREATE INDEX IF NOT EXISTS problems_created_date ON problems (created_date);
+"""
+
+COLUMNS = ['problem_id', 'name', 'url', 'contest', 'time_limit', 'memory_limit',
+           'test_count', 'created_date', 'content_hash', 'directory', 'indexed_at']
+
+CONTEST_PATTERN = re.compile(r'/(?:contest|gym|problemset/problem)/(\d+)')
+PROBLEM_ID_PATTERN = re.compile(r'^(\d+)[A-Z]\d*$')
+
+class ProblemIndex:
+    """SQLite index of the problems under output_directory for fast lookup and search"""
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self.connect() as connection:
+            connection.executescript(SCHEMA)
+    
+    def connect(self) -> sqlite3.Connection:
+        """Open a connection; one per call keeps the index safe to use from worker threads"""
+        connection = sqlite3.connect(self.db_path, timeout=10)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+    
+    @staticmethod
+    def get_contest(problem_id: str, url: str) -> Optional[str]:
+        """Derive the contest number from the URL or the problem id"""
+        match = CONTEST_PATTERN.search(url or '') or PROBLEM_ID_PATTERN.match(problem_id or '')
+        return match.group(1) if match else None
+    
+    @staticmethod
+    def get_content_hash(name: str, time_limit: str, memory_limit: str, test_cases: List[Dict[str, str]]) -> str:
+        """Hash the statement fields and tests, so re-imports of identical content can be recognized"""
+        digest = hashlib.sha256()
+        for part in [name, time_limit, memory_limit]:
+            digest.update(str(part).encode('utf-8') + b'\0')
+        for test_case in test_cases:
+            digest.update(test_case.get('input', '').encode('utf-8') + b'\0')
+            digest.update(test_case.get('output', '').encode('utf-8') + b'\0')
+        return digest.hexdigest()
+    
+    @staticmethod
+    def get_stored_content_hash(name: str, time_limit: str, memory_limit: str, test_files: List[Tuple[str, str]]) -> str:
+        """Same hash as get_content_hash, computed by streaming (possibly compressed) test files from disk"""
+        digest = hashlib.sha256()
+        for part in [name, time_limit, memory_limit]:
+            digest.update(str(part).encode('utf-8') + b'\0')
+        for input_path, output_path in test_files:
+            for path in (input_path, output_path):
+                try:
+                    with FileUtils.open_binary(path) as f:
+                        for chunk in iter(lambda: f.read(1 << 20), b''):
+                            digest.update(chunk)
+                except OSError:
+                    pass
+                digest.update(b'\0')
+        return digest.hexdigest()
+    
+    def build_row(self, problem_id: str, problem_data: Dict[str, Any], problem_dir: str) -> Dict[str, Any]:
+        """Build an index row from parsed problem data"""
+        test_cases = problem_data.get('test_cases', [])
+        name = problem_data.get('problem_name', 'Unknown Problem')
+        time_limit = problem_data.get('time_limit', 'Unknown')
+        memory_limit = problem_data.get('memory_limit', 'Unknown')
+        return {
+            'problem_id': problem_id,
+            'name': name,
+            'url': problem_data.get('url', ''),
+            'contest': self.get_contest(problem_id, problem_data.get('url', '')),
+            'time_limit': time_limit,
+            'memory_limit': memory_limit,
+            'test_count': problem_data.get('test_count', len(test_cases)),
+            'created_date': problem_data.get('created_date', ''),
+            'content_hash': problem_data.get('content_hash') or
+                            self.get_content_hash(name, time_limit, memory_limit, test_cases),
+            'directory': os.path.abspath(problem_dir),
+            'indexed_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+    
+    def add_problem(self, problem_id: str, problem_data: Dict[str, Any], problem_dir: str) -> None:
+        """Insert or update one problem"""
+        self.upsert([self.build_row(problem_id, problem_data, problem_dir)])
+    
+    def upsert(self, rows: List[Dict[str, Any]], replace_all: bool = False) -> None:
+        """Write rows in one transaction, optionally replacing the whole index"""
+        placeholders = ', '.join(f":{column}" for column in COLUMNS)
+        with self.connect() as connection:
+            if replace_all:
+                connection.execute("DELETE FROM problems")
+            connection.executemany(
+                f"INSERT OR REPLACE INTO problems ({', '.join(COLUMNS)}) VALUES ({placeholders})", rows)
+    
+    def get(self, problem_id: str) -> Optional[Dict[str, Any]]:
+        """Get one problem by exact id"""
+        with self.connect() as connection:
+            row = connection.execute("SELECT * FROM problems WHERE problem_id = ?", (problem_id,)).fetchone()
+        return dict(row) if row else None
+    
+    def search(self, id_prefix: Optional[str] = None, name: Optional[str] = None,
+               contest: Optional[str] = None, since: Optional[str] = None,
+               until: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Search by id prefix, name substring, contest and created date range (YYYY-MM-DD[ HH:MM:SS])"""
+        conditions = []
+        parameters = []
+        if id_prefix:
+            conditions.append("problem_id LIKE ? ESCAPE '\\'")
+            parameters.append(self.escape_like(id_prefix) + '%')
+        if name:
+            conditions.append("name LIKE ? ESCAPE '\\'")
+            parameters.append('%' + self.escape_like(name) + '%')
+        if contest:
+            conditions.append("contest = ?")
+            parameters.append(str(contest))
+        if since:
+            conditions.append("created_date >= ?")
+            parameters.append(since)
+        if until:
+            # A bare date includes the whole day
+            conditions.append("created_date <= ?")
+            parameters.append(until if len(until) > 10 else f"{until} 23:59:59")
+        query = "SELECT * FROM problems"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created_date DESC LIMIT ?"
+        parameters.append(limit)
+        with self.connect() as connection:
+            return [dict(row) for row in connection.execute(query, parameters)]
+    
+    @staticmethod
+    def escape_like(text: str) -> str:
+        """Escape LIKE wildcards in user input"""
+        return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    
+    def scan_problem(self, problem_dir: str, file_naming: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Build an index row from a problem directory on disk"""
+        metadata_file = os.path.join(problem_dir, file_naming.get('metadata_file', 'metadata.json'))
+        try:
+            with open(metadata_file, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Tests can be large (or compressed), so they are hashed as streams rather than read into problem_data
+        # Split cases (3.1, 3.2, ...) are copies of a sample and were not part of the imported problem
+        test_files = [(input_path, output_path)
+                      for number, input_path, output_path in FileUtils.list_test_files(problem_dir, file_naming)
+                      if '.' not in number]
+        constraints = metadata.get('constraints', {})
+        problem_data = {
+            'problem_name': metadata.get('problem_name', 'Unknown Problem'),
+            'url': metadata.get('url', ''),
+            'time_limit': constraints.get('time_limit', 'Unknown'),
+            'memory_limit': constraints.get('memory_limit', 'Unknown'),
+            'created_date': metadata.get('date', ''),
+            'test_count': len(test_files)
+        }
+        problem_data['content_hash'] = self.get_stored_content_hash(
+            problem_data['problem_name'], problem_data['time_limit'], problem_data['memory_limit'], test_files)
+        return self.build_row(metadata.get('problem_id') or os.path.basename(problem_dir), problem_data, problem_dir)
+    
+    def rebuild(self, output_directory: str, file_naming: Dict[str, str], workers: int = 8) -> int:
+        """Rescan every problem directory in parallel and replace the index contents"""
+        if not os.path.isdir(output_directory):
+            self.upsert([], replace_all=True)
+            return 0
+        directories = [entry.path for entry in os.scandir(output_directory)
+                       if entry.is_dir() and not entry.name.startswith('.')]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            rows = [row for row in pool.map(lambda path: self.scan_problem(path, file_naming), directories) if row]
+        self.upsert(rows, replace_all=True)
+        return len(rows)
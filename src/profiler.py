@@ -0,0 +1,182 @@
+import math
+import os
+import subprocess
+import sys
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from src.utils.config_parser import ConfigParser
+from src.judge import Judge, BUILD_DIRECTORY, run_test
+
+# Candidate growth curves, from slowest to fastest growing
+COMPLEXITIES: List[Tuple[str, Callable[[float], float]]] = [
+    ('O(log n)', lambda n: math.log2(n)),
+    ('O(sqrt n)', lambda n: math.sqrt(n)),
+    ('O(n)', lambda n: n),
+    ('O(n log n)', lambda n: n * math.log2(n)),
+    ('O(n sqrt n)', lambda n: n ** 1.5),
+    ('O(n log^2 n)', lambda n: n * math.log2(n) ** 2),
+    ('O(n^2)', lambda n: n ** 2),
+    ('O(n^2 log n)', lambda n: n ** 2 * math.log2(n)),
+    ('O(n^3)', lambda n: n ** 3)
+]
+# Runs are allowed this multiple of the time limit, so slow sizes are still measured rather than cut off
+TIME_LIMIT_FACTOR = 3
+# Times below this are dominated by process startup and carry no growth information
+NOISE_FLOOR_MS = 1.0
+
+def fit_growth(sizes: List[int], values: List[float], floor: float = NOISE_FLOOR_MS) -> Optional[Dict[str, Any]]:
+    """Fit value = a + b * f(n) for every candidate f and return the one with the smallest relative error.
+    
+    The constant a absorbs process startup. Values below floor count as floor
+    when weighting errors. Returns None with fewer than three points, since
+    any curve fits two.
+    """
+    if len(sizes) < 3:
+        return None
+    if max(values) - min(values) <= max(floor, 0.05 * max(values)):
+        # Flat within measurement noise; a curve fitted through it would be meaningless
+        return {'complexity': 'O(1)', 'growth': lambda n: 0.0, 'intercept': max(values), 'slope': 0.0, 'error': 0.0}
+    best = None
+    for name, growth in COMPLEXITIES:
+        xs = [growth(n) for n in sizes]
+        mean_x = sum(xs) / len(xs)
+        mean_y = sum(values) / len(values)
+        variance = sum((x - mean_x) ** 2 for x in xs)
+        if variance == 0:
+            continue
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, values)) / variance
+        if slope <= 0:
+            continue
+        intercept = max(mean_y - slope * mean_x, 0.0)
+        error = sum(((intercept + slope * x - y) / max(y, floor)) ** 2 for x, y in zip(xs, values))
+        if best is None or error < best['error']:
+            best = {'complexity': name, 'growth': growth, 'intercept': intercept, 'slope': slope, 'error': error}
+    return best
+
+def local_exponent(sizes: List[int], values: List[float], floor: float = NOISE_FLOOR_MS) -> Optional[float]:
+    """Slope of log(value) against log(n) over the larger half of the sizes, i.e. k in n^k"""
+    points = [(math.log(n), math.log(v)) for n, v in zip(sizes, values) if v >= floor]
+    points = points[len(points) // 2:]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if variance == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+class PerformanceProfiler:
+    """Runs a solution on generated inputs of growing size and projects its cost at the maximum size.
+    
+    The generator is called as `gen <seed> <size>`, like for stress testing.
+    Each size is run `repeat` times and the fastest run is kept. CPU time and
+    peak RSS come from the rusage of the solution process. A growth curve is
+    fitted to both and extrapolated to the target size, and the result is
+    compared with the limits in metadata.json.
+    """
+    
+    def __init__(self, config: ConfigParser):
+        self.config = config
+        self.judge = Judge(config)
+        self.start_size = config.get('profile.start_size', 1000)
+        self.max_size = config.get('profile.max_size', 200000)
+        self.growth = config.get('profile.growth', 2.0)
+        self.repeat = config.get('profile.repeat', 3)
+        self.min_headroom = config.get('profile.min_headroom', 1.5)
+    
+    def build(self, source: str) -> List[str]:
+        """Get the command that runs a source file, compiling C++ through the shared cache"""
+        if source.endswith('.py'):
+            return [sys.executable, os.path.abspath(source)]
+        binary, _ = self.judge.compile_cache.compile(source)
+        return [binary]
+    
+    def get_sizes(self) -> List[int]:
+        """Geometric series of sizes from start_size up to and including max_size"""
+        sizes = []
+        size = self.start_size
+        while size < self.max_size:
+            sizes.append(int(size))
+            size = max(size * self.growth, size + 1)
+        sizes.append(self.max_size)
+        return sizes
+    
+    def generate(self, generator: List[str], size: int, path: str) -> bool:
+        """Write the generator's input for a size straight to a file"""
+        try:
+            with open(path, 'wb') as f:
+                process = subprocess.run(generator + ['1', str(size)], stdout=f, stderr=subprocess.PIPE, timeout=60)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            print(f"Generator failed for size {size}: {e}")
+            return False
+        if process.returncode != 0:
+            print(f"Generator failed for size {size}: {process.stderr.decode('utf-8', errors='replace').strip()}")
+            return False
+        return True
+    
+    def measure(self, program: Dict[str, Any], size: int, input_path: str, time_limit: float,
+                memory_limit: int) -> Dict[str, Any]:
+        """Run the solution repeat times on one input and keep the fastest run"""
+        profile_dir = os.path.dirname(input_path)
+        test = {'name': str(size), 'input': input_path,
+                'expected': os.path.join(profile_dir, 'none'),
+                'actual': os.path.join(profile_dir, f"size{size}.out"),
+                'stderr': os.path.join(profile_dir, f"size{size}.stderr")}
+        runner = self.judge.get_runner()
+        best = None
+        for _ in range(self.repeat):
+            result = run_test(program['command'], test, time_limit * TIME_LIMIT_FACTOR, memory_limit * 2, runner,
+                              limit_address_space=program['limit_address_space'])
+            if best is None or result['cpu_ms'] < best['cpu_ms']:
+                best = result
+            if result['verdict'] != 'OK':
+                break
+        best['size'] = size
+        best['input_bytes'] = os.path.getsize(input_path)
+        return best
+    
+    def run(self, problem_dir: str, generator_source: str, target_size: Optional[int] = None) -> Dict[str, Any]:
+        """Profile the solution and return the measurements, fitted curves and projected headroom"""
+        generator = self.build(generator_source)
+        program, _ = self.judge.compile(problem_dir)
+        time_limit, memory_limit = self.judge.get_limits(problem_dir)
+        target_size = target_size or self.max_size
+        profile_dir = os.path.join(problem_dir, BUILD_DIRECTORY, 'profile')
+        os.makedirs(profile_dir, exist_ok=True)
+        
+        runs = []
+        stopped = None
+        for size in self.get_sizes():
+            input_path = os.path.join(profile_dir, f"size{size}.in")
+            if not self.generate(generator, size, input_path):
+                stopped = f"generator failed at n={size}"
+                break
+            run = self.measure(program, size, input_path, time_limit, memory_limit)
+            os.remove(input_path)
+            runs.append(run)
+            print(f"n={size:<10} {run['verdict']:<4} {run['wall_ms']:>9.1f} ms wall {run['cpu_ms']:>9.1f} ms cpu "
+                  f"{run['peak_rss_kb'] / 1024:>8.1f} MB", flush=True)
+            if run['verdict'] != 'OK':
+                stopped = f"{run['verdict']} at n={size}"
+                break
+            if run['cpu_ms'] > time_limit * 1000 or run['peak_rss_kb'] * 1024 > memory_limit:
+                # Larger inputs only get slower; the answer is already known
+                stopped = f"over the limits at n={size}"
+                break
+        
+        report = {'solution': program['source'], 'time_limit_ms': time_limit * 1000, 'memory_limit_mb': memory_limit / 2 ** 20,
+                  'target_size': target_size, 'runs': runs, 'stopped': stopped, 'time': None, 'memory': None}
+        ok_runs = [run for run in runs if run['verdict'] == 'OK']
+        sizes = [run['size'] for run in ok_runs]
+        for key, values, limit in (('time', [run['cpu_ms'] for run in ok_runs], time_limit * 1000),
+                                   ('memory', [run['peak_rss_kb'] / 1024 for run in ok_runs], memory_limit / 2 ** 20)):
+            # 1 ms and 1 MB are both below what a single run can resolve
+            fit = fit_growth(sizes, values, floor=1.0)
+            if not fit:
+                continue
+            projected = fit['intercept'] + fit['slope'] * fit['growth'](target_size)
+            report[key] = {'complexity': fit['complexity'], 'exponent': local_exponent(sizes, values, floor=1.0),
+                           'projected': projected, 'headroom': limit / projected if projected > 0 else math.inf}
+        checks = [report[key]['headroom'] for key in ('time', 'memory') if report[key]]
+        report['ok'] = stopped is None and bool(checks) and min(checks) >= self.min_headroom
+        return report
@@ -0,0 +1,125 @@
+import json
+import os
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+from src.utils.config_parser import ConfigParser
+from src.utils.file_utils import FileUtils
+
+# Fields stored per test, in order; rows are lists to keep the store compact
+TEST_FIELDS = ['test', 'verdict', 'cpu_ms', 'wall_ms', 'peak_rss_kb']
+
+class RunHistory:
+    """Append-only record of every local run of a solution.
+    
+    Each problem gets one JSON-lines file named after the problem_id in its
+    metadata.json. Every judge or watch run appends one line holding the
+    solution's source hash and a row per test. Comparing the fastest time of
+    each test under two source hashes shows what a change did to performance.
+    """
+    
+    def __init__(self, directory: str, file_naming: Dict[str, str]):
+        self.directory = directory
+        self.file_naming = file_naming
+    
+    @staticmethod
+    def get_directory(config: ConfigParser) -> str:
+        """Get the history location, by default inside output_directory"""
+        return config.get('history.directory') or os.path.join(config.get('output_directory'), '.history')
+    
+    def get_problem(self, problem_dir: str) -> Tuple[str, str]:
+        """Get the problem_id and url recorded in metadata.json, falling back to the directory name"""
+        metadata_file = os.path.join(problem_dir, self.file_naming.get('metadata_file', 'metadata.json'))
+        try:
+            with open(metadata_file, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            metadata = {}
+        problem_id = metadata.get('problem_id') or os.path.basename(os.path.normpath(problem_dir))
+        return problem_id, metadata.get('url', '')
+    
+    def get_path(self, problem_id: str) -> str:
+        """Get the history file of a problem"""
+        return os.path.join(self.directory, f"{FileUtils.sanitize_filename(problem_id)}.jsonl")
+    
+    @staticmethod
+    def get_source_hash(source: str) -> Optional[str]:
+        """Short content hash identifying a revision of the solution"""
+        digest = FileUtils.get_file_hash(source)
+        return digest[:12] if digest else None
+    
+    def record(self, problem_dir: str, results: List[Dict[str, Any]],
+               source: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Append one run of the solution (by default the configured solution file) to the problem's history"""
+        if not results:
+            return None
+        source = source or os.path.join(problem_dir, self.file_naming.get('solution_file', 'solution.cpp'))
+        problem_id, url = self.get_problem(problem_dir)
+        entry = {
+            'at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'problem_id': problem_id,
+            'url': url,
+            'source': self.get_source_hash(source),
+            'tests': [[result['test'], result['verdict'], round(result['cpu_ms'], 2), round(result['wall_ms'], 2),
+                       result['peak_rss_kb']] for result in results]
+        }
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # One write per line on an O_APPEND file, so concurrent runs do not interleave
+            with open(self.get_path(problem_id), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        except OSError as e:
+            print(f"Failed to record run history: {e}")
+            return None
+        return entry
+    
+    def load(self, problem_id: str) -> List[Dict[str, Any]]:
+        """Get every recorded run of a problem, oldest first"""
+        entries = []
+        try:
+            with open(self.get_path(problem_id), 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    entry['tests'] = [dict(zip(TEST_FIELDS, row)) for row in entry.get('tests', [])]
+                    entries.append(entry)
+        except FileNotFoundError:
+            pass
+        return entries
+    
+    @staticmethod
+    def get_revisions(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Summarize runs per source hash, in the order the revisions were first run"""
+        revisions = {}
+        for entry in entries:
+            revision = revisions.setdefault(entry['source'], {'source': entry['source'], 'first_run': entry['at'],
+                                                              'runs': 0, 'tests': {}})
+            revision['runs'] += 1
+            revision['last_run'] = entry['at']
+            for test in entry['tests']:
+                # The fastest accepted run of each test is the least noisy estimate of its cost
+                best = revision['tests'].get(test['test'])
+                if test['verdict'] == 'OK' and (best is None or test['cpu_ms'] < best['cpu_ms']):
+                    revision['tests'][test['test']] = test
+        return list(revisions.values())
+    
+    @staticmethod
+    def compare(before: Dict[str, Any], after: Dict[str, Any], threshold: float = 0.1,
+                min_difference_ms: float = 2.0) -> List[Dict[str, Any]]:
+        """Compare the best CPU time of each test between two revisions.
+        
+        A test counts as slower or faster only if the change exceeds both the
+        relative threshold and min_difference_ms, which keeps timer noise on
+        tiny tests from being reported.
+        """
+        rows = []
+        for name in sorted(set(before['tests']) & set(after['tests']), key=FileUtils.get_test_sort_key):
+            old = before['tests'][name]['cpu_ms']
+            new = after['tests'][name]['cpu_ms']
+            change = (new - old) / old if old else 0.0
+            status = 'same'
+            if abs(new - old) >= min_difference_ms and abs(change) > threshold:
+                status = 'slower' if new > old else 'faster'
+            rows.append({'test': name, 'before_ms': old, 'after_ms': new, 'change': change, 'status': status})
+        return rows
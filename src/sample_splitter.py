@@ -0,0 +1,94 @@
+from typing import Dict, List, Optional
+
+# A case length is a header token plus one of these, e.g. "n" followed by n lines is n + 1
+HEADER_OFFSETS = (0, 1, 2, 3)
+MAX_FIXED_LINES = 50
+
+def get_lines(text: str) -> List[str]:
+    """Non-empty lines of a sample, without trailing whitespace"""
+    return [line.rstrip() for line in text.split('\n') if line.strip()]
+
+def is_integer(token: str) -> bool:
+    """Check whether a token is a (possibly negative) integer"""
+    return token.lstrip('-').isdigit()
+
+def partition_fixed(lines: List[str], count: int) -> Optional[List[int]]:
+    """Case lengths if every case has the same number of lines starting with lines of the same shape"""
+    if len(lines) % count:
+        return None
+    length = len(lines) // count
+    if length > MAX_FIXED_LINES:
+        return None
+    shapes = {len(lines[i].split()) for i in range(0, len(lines), length)}
+    return [length] * count if len(shapes) == 1 else None
+
+def partition_by_header(lines: List[str], count: int, index: int, offset: int) -> Optional[List[int]]:
+    """Case lengths if every case starts with a header of integers whose index-th token plus offset is its length"""
+    lengths = []
+    position = 0
+    header_size = len(lines[0].split())
+    for _ in range(count):
+        if position >= len(lines):
+            return None
+        header = lines[position].split()
+        if len(header) != header_size or not all(is_integer(token) for token in header):
+            return None
+        length = int(header[index]) + offset
+        if length < 1 or position + length > len(lines):
+            return None
+        lengths.append(length)
+        position += length
+    return lengths if position == len(lines) else None
+
+def partition_cases(lines: List[str], count: int) -> Optional[List[int]]:
+    """Find the line count of each case; None unless exactly one consistent structure explains the input"""
+    candidates = set()
+    fixed = partition_fixed(lines, count)
+    if fixed:
+        candidates.add(tuple(fixed))
+    for index in range(len(lines[0].split())):
+        for offset in HEADER_OFFSETS:
+            lengths = partition_by_header(lines, count, index, offset)
+            if lengths:
+                candidates.add(tuple(lengths))
+    # Different structures that split the input differently cannot be told apart
+    return list(candidates.pop()) if len(candidates) == 1 else None
+
+def split_test_case(test_case: Dict[str, str], max_cases: int = 100) -> Optional[List[Dict[str, str]]]:
+    """Split a sample whose input starts with a test count T into T single-case samples.
+    
+    The input must have a line with only T, followed by lines that divide into
+    T cases in exactly one consistent way: either every case has the same
+    number of lines, or every case starts with an integer header that gives
+    its length. The expected output must divide evenly into T cases as well.
+    Returns None when the sample cannot be split with confidence, or when it
+    has more than max_cases cases.
+    """
+    input_lines = get_lines(test_case.get('input', ''))
+    output_lines = get_lines(test_case.get('output', ''))
+    if len(input_lines) < 3:
+        return None
+    first = input_lines[0].split()
+    if len(first) != 1 or not first[0].isdigit():
+        return None
+    count = int(first[0])
+    body = input_lines[1:]
+    if count < 2 or count > min(len(body), max_cases):
+        return None
+    input_lengths = partition_cases(body, count)
+    output_lengths = partition_fixed(output_lines, count) if output_lines else None
+    if not input_lengths or not output_lengths:
+        return None
+    if all(len(line.split()) == count for line in body):
+        # An n x n grid after its size looks exactly like n one-line cases
+        return None
+    
+    cases = []
+    input_position = output_position = 0
+    for input_length, output_length in zip(input_lengths, output_lengths):
+        case_input = body[input_position:input_position + input_length]
+        case_output = output_lines[output_position:output_position + output_length]
+        cases.append({'input': '1\n' + '\n'.join(case_input) + '\n', 'output': '\n'.join(case_output) + '\n'})
+        input_position += input_length
+        output_position += output_length
+    return cases
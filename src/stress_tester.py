@@ -0,0 +1,246 @@
+import os
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, List, Optional, Tuple
+from src.utils.config_parser import ConfigParser
+from src.checker import OutputChecker
+from src.judge import Judge
+from src.test_storage import TestStorage
+
+def run_program(command: List[str], input_data: bytes, timeout: float) -> Tuple[Optional[int], bytes]:
+    """Run a program on the given input; the exit code is None if it timed out"""
+    try:
+        process = subprocess.run(command, input=input_data, capture_output=True, timeout=timeout)
+        return process.returncode, process.stdout
+    except subprocess.TimeoutExpired:
+        return None, b''
+
+def check_input(solution: List[str], brute: List[str], input_data: bytes, timeout: float,
+                checker: OutputChecker) -> Optional[Dict[str, Any]]:
+    """Run both programs on one input, returning a failure description or None if they agree.
+    
+    Returns {'invalid': True} when the brute force itself fails, since the
+    input then cannot be trusted.
+    """
+    brute_code, expected = run_program(brute, input_data, timeout * 10)
+    if brute_code != 0:
+        return {'invalid': True, 'reason': 'Brute force failed' if brute_code is not None else 'Brute force timed out'}
+    solution_code, actual = run_program(solution, input_data, timeout)
+    if solution_code is None:
+        reason = 'Solution timed out'
+    elif solution_code != 0:
+        reason = f"Solution exited with code {solution_code}"
+    else:
+        check = checker.check_data(actual, expected)
+        if check['ok']:
+            return None
+        reason = check['message']
+    return {'input': input_data, 'expected': expected, 'actual': actual, 'reason': reason}
+
+def stress_batch(generator: List[str], solution: List[str], brute: List[str], seeds: List[int],
+                 size: Optional[int], timeout: float, checker: OutputChecker) -> Dict[str, Any]:
+    """Run one batch of random iterations; runs inside a worker process"""
+    for done, seed in enumerate(seeds, 1):
+        arguments = [str(seed)] if size is None else [str(seed), str(size)]
+        code, input_data = run_program(generator + arguments, b'', timeout * 10)
+        if code != 0:
+            return {'iterations': done, 'error': f"Generator failed on seed {seed}"}
+        failure = check_input(solution, brute, input_data, timeout, checker)
+        if failure and failure.get('invalid'):
+            return {'iterations': done, 'error': f"{failure['reason']} on seed {seed}"}
+        if failure:
+            failure['seed'] = seed
+            return {'iterations': done, 'failure': failure}
+    return {'iterations': len(seeds)}
+
+class StressTester:
+    """Runs generator / brute force / solution in parallel until the outputs disagree.
+    
+    The generator is called as `gen <seed> [size]` and must print one input.
+    When a mismatch is found the input is shrunk and saved as the next
+    in{N}/out{N} pair of the problem.
+    """
+    
+    def __init__(self, config: ConfigParser):
+        self.config = config
+        self.judge = Judge(config)
+        self.file_naming = config.get_file_naming()
+        self.workers = config.get('stress.workers') or os.cpu_count() or 1
+        self.batch_size = config.get('stress.batch_size', 20)
+        self.timeout = config.get('stress.timeout', 2.0)
+        self.shrink_seconds = config.get('stress.shrink_seconds', 30.0)
+        self.storage = TestStorage(config)
+    
+    def build(self, source: str) -> List[str]:
+        """Get the command that runs a source file, compiling C++ through the shared cache"""
+        if source.endswith('.py'):
+            return [sys.executable, os.path.abspath(source)]
+        binary, _ = self.judge.compile_cache.compile(source)
+        return [binary]
+    
+    def run_parallel(self, generator: List[str], solution: List[str], brute: List[str],
+                     seeds, size: Optional[int] = None, report: bool = True) -> Dict[str, Any]:
+        """Run iterations over the given seeds on a process pool, stopping at the first failure"""
+        seeds = iter(seeds)
+        iterations = 0
+        start = last_report = time.perf_counter()
+        result = {'iterations': 0, 'failure': None, 'error': None}
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = set()
+            exhausted = False
+            while True:
+                # Keep every worker busy with a couple of batches queued
+                while not exhausted and len(pending) < self.workers * 2:
+                    batch = [seed for _, seed in zip(range(self.batch_size), seeds)]
+                    if not batch:
+                        exhausted = True
+                        break
+                    pending.add(pool.submit(stress_batch, generator, solution, brute, batch,
+                                            size, self.timeout, self.judge.checker))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch_result = future.result()
+                    iterations += batch_result['iterations']
+                    if batch_result.get('failure') and not result['failure']:
+                        result['failure'] = batch_result['failure']
+                    if batch_result.get('error') and not result['error']:
+                        result['error'] = batch_result['error']
+                if result['failure'] or result['error']:
+                    for future in pending:
+                        future.cancel()
+                    break
+                now = time.perf_counter()
+                if report and now - last_report >= 0.5:
+                    last_report = now
+                    print(f"\r{iterations} iterations, {iterations / (now - start):.0f} it/s", end='', flush=True)
+        elapsed = time.perf_counter() - start
+        result['iterations'] = iterations
+        result['seconds'] = elapsed
+        result['rate'] = iterations / elapsed if elapsed else 0.0
+        if report:
+            print(f"\r{iterations} iterations, {result['rate']:.0f} it/s")
+        return result
+    
+    def shrink_by_size(self, generator: List[str], solution: List[str], brute: List[str],
+                       failure: Dict[str, Any], deadline: float, seeds_per_size: int = 32) -> Dict[str, Any]:
+        """Look for a failure at small generator sizes, if the generator accepts a size argument"""
+        _, small = run_program(generator + ['1', '1'], b'', self.timeout * 10)
+        _, large = run_program(generator + ['1', '1000000'], b'', self.timeout * 10)
+        if small == large:
+            return failure
+        size = 1
+        while size < len(failure['input']) and time.perf_counter() < deadline:
+            seeds = range(size * seeds_per_size, (size + 1) * seeds_per_size)
+            result = self.run_parallel(generator, solution, brute, seeds, size=size, report=False)
+            if result['failure'] and len(result['failure']['input']) < len(failure['input']):
+                print(f"Found a failing input with generator size {size}")
+                return result['failure']
+            size *= 2
+        return failure
+    
+    def shrink_lines(self, solution: List[str], brute: List[str], failure: Dict[str, Any],
+                     deadline: float, validator: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Delta-debug the input line by line while the programs keep disagreeing.
+        
+        Candidates that the validator (if any) rejects, or on which the brute
+        force fails, are rejected as malformed. Without a validator a brute
+        force that reads leniently can let malformed inputs through.
+        """
+        def attempt(lines: List[bytes]) -> Optional[Dict[str, Any]]:
+            if time.perf_counter() > deadline:
+                return None
+            candidate = b'\n'.join(lines) + b'\n'
+            if validator and run_program(validator, candidate, self.timeout * 10)[0] != 0:
+                return None
+            result = check_input(solution, brute, candidate, self.timeout, self.judge.checker)
+            return result if result and not result.get('invalid') else None
+        
+        lines = failure['input'].rstrip(b'\n').split(b'\n')
+        if len(lines) > 1 and lines[0].strip().isdigit():
+            # With a leading test count, whole cases can be dropped while keeping the input well-formed:
+            # lowering the count drops trailing cases, cutting a prefix of the body drops leading ones
+            count = int(lines[0])
+            for smaller in range(1, count):
+                result = attempt([str(smaller).encode()] + lines[1:])
+                if result:
+                    count, lines[0], failure = smaller, str(smaller).encode(), result
+                    break
+            while count > 1:
+                for cut in range(1, len(lines) - 1):
+                    candidate = [str(count - 1).encode()] + lines[1 + cut:]
+                    result = attempt(candidate)
+                    if result:
+                        count, lines, failure = count - 1, candidate, result
+                        break
+                else:
+                    break
+        
+        chunks = 2
+        while len(lines) >= 2 and time.perf_counter() < deadline:
+            chunk_size = max(1, len(lines) // chunks)
+            reduced = False
+            for start in range(0, len(lines), chunk_size):
+                candidate = lines[:start] + lines[start + chunk_size:]
+                if not candidate:
+                    continue
+                result = attempt(candidate)
+                if result:
+                    lines = candidate
+                    failure = result
+                    chunks = max(chunks - 1, 2)
+                    reduced = True
+                    break
+            if not reduced:
+                if chunk_size == 1:
+                    break
+                chunks = min(chunks * 2, len(lines))
+        return failure
+    
+    def save_failure(self, problem_dir: str, failure: Dict[str, Any]) -> str:
+        """Save the failing input and the brute-force output as the next test pair"""
+        tests = self.judge.find_tests(problem_dir)
+        start_number = self.config.get('test_cases.start_number', 1)
+        number = max([int(test['name'].split('.')[0]) for test in tests], default=start_number - 1) + 1
+        input_file = os.path.join(problem_dir, f"{self.file_naming.get('input_prefix', 'in')}{number}"
+                                               f"{self.file_naming.get('input_suffix', '')}")
+        output_file = os.path.join(problem_dir, f"{self.file_naming.get('output_prefix', 'out')}{number}"
+                                                f"{self.file_naming.get('output_suffix', '')}")
+        # Large inputs are stored compressed when test_storage.compress is enabled
+        self.storage.write_test_file(input_file, failure['input'])
+        self.storage.write_test_file(output_file, failure['expected'])
+        return str(number)
+    
+    def run(self, problem_dir: str, generator_source: str, brute_source: str, iterations: int = 1000,
+            seed: Optional[int] = None, shrink: bool = True, save: bool = True,
+            validator_source: Optional[str] = None) -> Dict[str, Any]:
+        """Stress the problem's solution and return the run summary.
+        
+        The optional validator reads an input on stdin and exits non-zero if it
+        is malformed; shrinking then only keeps inputs it accepts.
+        """
+        generator = self.build(generator_source)
+        brute = self.build(brute_source)
+        validator = self.build(validator_source) if validator_source else None
+        solution = self.judge.compile(problem_dir)[0]['command']
+        
+        base_seed = seed if seed is not None else random.randrange(1 << 30)
+        result = self.run_parallel(generator, solution, brute, range(base_seed, base_seed + iterations))
+        failure = result['failure']
+        if failure and shrink:
+            original_size = len(failure['input'])
+            deadline = time.perf_counter() + self.shrink_seconds
+            failure = self.shrink_by_size(generator, solution, brute, failure, deadline)
+            shrunk = self.shrink_lines(solution, brute, failure, deadline, validator)
+            # Only line-level reductions can be malformed; generator outputs are valid by construction
+            result['unvalidated'] = shrunk is not failure and not validator
+            failure = shrunk
+            print(f"Shrunk failing input from {original_size} to {len(failure['input'])} bytes")
+            result['failure'] = failure
+        if failure and save:
+            result['saved_test'] = self.save_failure(problem_dir, failure)
+        return result
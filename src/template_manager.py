@@ -1,69 +1,131 @@
 import os
+import re
+import threading
 from typing import Dict, Any, Optional
-from utils.file_utils import FileUtils
+from src.utils.file_utils import FileUtils
+
+class CompiledTemplate:
+    """Template split once into literal text and placeholder names"""
+    
+    PLACEHOLDER_PATTERN = re.compile(r'\{([^{}\s]+)\}')
+    
+    def __init__(self, source: str):
+        parts = self.PLACEHOLDER_PATTERN.split(source)
+        # split() alternates literal, name, literal, ... and always starts and ends with a literal
+        self.literals = parts[0::2]
+        self.names = parts[1::2]
+    
+    def render(self, variables: Dict[str, Any]) -> str:
+        """Substitute all placeholders in a single pass; unknown placeholders are kept as-is"""
+        pieces = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            if name in variables:
+                pieces.append(str(variables[name]))
+            else:
+                pieces.append(f"{{{name}}}")
+            pieces.append(literal)
+        return ''.join(pieces)
 
 class TemplateManager:
     """Handles template loading and customization with problem data"""
     
+    # Compiled templates shared by all instances: path -> (mtime, content, compiled template)
+    compile_cache = {}
+    
     def __init__(self, template_directory: str):
         self.template_directory = template_directory
+        self.lock = threading.Lock()
         self.templates = {}
+        self.compiled_templates = {}
+        self.template_mtimes = {}
         self.load_templates()
     
     def load_templates(self) -> None:
-        """Load all available templates from the template directory"""
+        """Load all available templates from the template directory.
+        
+        The new set is built aside and swapped in at once, so renders running
+        on other threads during a reload see either the old or the new set.
+        """
         try:
+            templates = {}
+            compiled_templates = {}
+            template_mtimes = self.get_template_mtimes()
             if not os.path.exists(self.template_directory):
                 print(f"Template directory not found: {self.template_directory}")
-                return
             
-            for filename in os.listdir(self.template_directory):
-                file_path = os.path.join(self.template_directory, filename)
-                if os.path.isfile(file_path):
-                    template_name = os.path.splitext(filename)[0]
+            for filename, mtime in template_mtimes.items():
+                file_path = os.path.abspath(os.path.join(self.template_directory, filename))
+                template_name = os.path.splitext(filename)[0]
+                cached = TemplateManager.compile_cache.get(file_path)
+                if not cached or cached[0] != mtime:
                     content = FileUtils.read_file(file_path)
-                    if content:
-                        self.templates[template_name] = content
-                        print(f"Loaded template: {template_name}")
+                    if not content:
+                        continue
+                    cached = (mtime, content, CompiledTemplate(content))
+                    TemplateManager.compile_cache[file_path] = cached
+                    print(f"Loaded template: {template_name}")
+                templates[template_name] = cached[1]
+                compiled_templates[template_name] = cached[2]
+            with self.lock:
+                self.templates, self.compiled_templates = templates, compiled_templates
+                self.template_mtimes = template_mtimes
         
         except Exception as e:
             print(f"Failed to load templates: {e}")
     
+    def get_template_mtimes(self) -> Dict[str, int]:
+        """Get the modification time of every file in the template directory"""
+        mtimes = {}
+        try:
+            with os.scandir(self.template_directory) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        mtimes[entry.name] = entry.stat().st_mtime_ns
+        except OSError:
+            pass
+        return mtimes
+    
+    def reload_if_changed(self) -> bool:
+        """Reload templates if any template file was added, removed or modified"""
+        if self.get_template_mtimes() == self.template_mtimes:
+            return False
+        self.load_templates()
+        return True
+    
     def get_template(self, template_name: str) -> Optional[str]:
         """Get a template by name"""
-        return self.templates.get(template_name)
+        with self.lock:
+            return self.templates.get(template_name)
     
     def customize_template(self, template_name: str, variables: Dict[str, Any]) -> Optional[str]:
         """Customize a template with given variables"""
-        template = self.get_template(template_name)
+        with self.lock:
+            template = self.compiled_templates.get(template_name)
         if not template:
             print(f"Template not found: {template_name}")
             return None
         
         try:
-            customized = template
-            for key, value in variables.items():
-                placeholder = f"{{{key}}}"
-                customized = customized.replace(placeholder, str(value))
-            
-            return customized
+            return template.render(variables)
         
         except Exception as e:
             print(f"Failed to customize template {template_name}: {e}")
             return None
     
+    def render_solution(self, problem_data: Dict[str, Any], template_name: Optional[str] = None) -> Optional[str]:
+        """Render the solution file content for a problem"""
+        # Get the appropriate template based on language, unless the language profile names one
+        template_name = template_name or f"{problem_data.get('language', 'cpp')}_template"
+        return self.customize_template(template_name, self.prepare_solution_variables(problem_data))
+    
+    def render_metadata(self, problem_data: Dict[str, Any]) -> Optional[str]:
+        """Render the metadata file content for a problem"""
+        return self.customize_template("metadata_template", self.prepare_metadata_variables(problem_data))
+    
     def create_solution_file(self, problem_data: Dict[str, Any], output_path: str) -> bool:
         """Create a solution file from template"""
         try:
-            # Prepare variables for the template
-            variables = self.prepare_solution_variables(problem_data)
-            
-            # Get the appropriate template based on language
-            language = problem_data.get('language', 'cpp')
-            template_name = f"{language}_template"
-            
-            # Customize the template
-            content = self.customize_template(template_name, variables)
+            content = self.render_solution(problem_data)
             if not content:
                 return False
             
@@ -77,11 +139,7 @@ class TemplateManager:
     def create_metadata_file(self, problem_data: Dict[str, Any], output_path: str) -> bool:
         """Create a metadata file from template"""
         try:
-            # Prepare variables for the template
-            variables = self.prepare_metadata_variables(problem_data)
-            
-            # Customize the metadata template
-            content = self.customize_template("metadata_template", variables)
+            content = self.render_metadata(problem_data)
             if not content:
                 return False
             
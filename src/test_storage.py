@@ -0,0 +1,131 @@
+import gzip
+import lzma
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional
+from src.utils.config_parser import ConfigParser
+from src.utils.file_utils import FileUtils
+
+# Storage formats and the suffix their files get
+FORMATS = {'gzip': '.gz', 'lzma': '.xz'}
+COPY_CHUNK_SIZE = 1 << 20
+
+def open_compressed(fileobj, storage_format: str, level: int):
+    """Wrap an open binary file so bytes written to it are compressed in the given storage format"""
+    if storage_format == 'lzma':
+        return lzma.open(fileobj, 'wb', preset=level)
+    # No file name or timestamp in the header, so equal content compresses to equal bytes
+    return gzip.GzipFile(filename='', mode='wb', compresslevel=level, fileobj=fileobj, mtime=0)
+
+def compact_file(file_path: str, storage_format: str, level: int, threshold: int) -> Optional[Dict[str, Any]]:
+    """Compress one plain test file in place if it is at least threshold bytes; runs inside a worker process.
+    
+    The file is streamed into a hidden temporary file, renamed to its
+    compressed name, and only then is the plain file removed.
+    """
+    try:
+        size = os.path.getsize(file_path)
+        if FileUtils.is_compressed(file_path) or size < threshold:
+            return None
+        directory, name = os.path.split(file_path)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.tmp-")
+        try:
+            with open(file_path, 'rb') as source, os.fdopen(fd, 'wb') as raw, \
+                    open_compressed(raw, storage_format, level) as target:
+                shutil.copyfileobj(source, target, COPY_CHUNK_SIZE)
+            shutil.copymode(file_path, temp_path)
+            compressed_path = file_path + FORMATS[storage_format]
+            os.replace(temp_path, compressed_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        os.remove(file_path)
+        return {'path': file_path, 'stored': compressed_path, 'before': size,
+                'after': os.path.getsize(compressed_path)}
+    except OSError as e:
+        return {'path': file_path, 'error': str(e)}
+
+class TestStorage:
+    """Stores test files compressed once they reach a size threshold.
+    
+    Samples stay plain text. Large tests, like the ones saved by the stress
+    tester, are written as in{i}.gz / out{i}.gz (or .xz for lzma) when
+    test_storage.compress is enabled, and existing directories can be
+    converted with compact(). Readers go through FileUtils.open_binary and
+    FileUtils.list_test_files, which handle both forms.
+    """
+    
+    def __init__(self, config: ConfigParser):
+        self.config = config
+        self.file_naming = config.get_file_naming()
+        self.compress = config.get('test_storage.compress', False)
+        self.format = config.get('test_storage.format', 'gzip')
+        if self.format not in FORMATS:
+            raise ValueError(f"Unknown test storage format: {self.format}")
+        self.threshold = config.get('test_storage.threshold', 1024 * 1024)
+        self.level = config.get('test_storage.level', 6)
+    
+    def write_test_file(self, file_path: str, data: bytes) -> str:
+        """Write a test file, compressed if enabled and large enough; returns the path written"""
+        stored_path = file_path
+        if self.compress and len(data) >= self.threshold:
+            stored_path = file_path + FORMATS[self.format]
+        directory = os.path.dirname(file_path)
+        os.makedirs(directory, exist_ok=True)
+        temp_path = FileUtils.get_temp_path(directory, os.path.basename(file_path))
+        try:
+            with open(temp_path, 'xb') as raw:
+                if stored_path == file_path:
+                    raw.write(data)
+                else:
+                    with open_compressed(raw, self.format, self.level) as target:
+                        target.write(data)
+            os.replace(temp_path, stored_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        # Drop any other stored form of the same test so readers cannot pick up stale data
+        for other in [file_path] + [file_path + suffix for suffix in FORMATS.values()]:
+            if other != stored_path and os.path.exists(other):
+                os.remove(other)
+        return stored_path
+    
+    def find_compactable(self, problem_dirs: List[str]) -> List[str]:
+        """Get the plain test files at or above the threshold in the given problem directories"""
+        files = []
+        for problem_dir in problem_dirs:
+            try:
+                tests = FileUtils.list_test_files(problem_dir, self.file_naming)
+            except OSError:
+                continue
+            for _, input_path, output_path in tests:
+                for path in (input_path, output_path):
+                    if not FileUtils.is_compressed(path) and os.path.exists(path) \
+                            and os.path.getsize(path) >= self.threshold:
+                        files.append(path)
+        return files
+    
+    def compact(self, problem_dirs: List[str], workers: Optional[int] = None) -> Dict[str, Any]:
+        """Compress every large plain test file under the given problem directories in parallel"""
+        files = self.find_compactable(problem_dirs)
+        summary = {'files': 0, 'before': 0, 'after': 0, 'errors': []}
+        if not files:
+            return summary
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(files))) as pool:
+            count = len(files)
+            results = pool.map(compact_file, files, [self.format] * count, [self.level] * count,
+                               [self.threshold] * count)
+            for result in results:
+                if result is None:
+                    continue
+                if 'error' in result:
+                    summary['errors'].append(f"{result['path']}: {result['error']}")
+                    continue
+                summary['files'] += 1
+                summary['before'] += result['before']
+                summary['after'] += result['after']
+        return summary
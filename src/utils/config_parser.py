@@ -7,6 +7,7 @@ class ConfigParser:
     
     def __init__(self, config_path: str = "config/settings.json"):
         self.config_path = config_path
+        self.mtime = self.get_mtime()
         self.config = self.load_config()
     
     def load_config(self) -> Dict[str, Any]:
@@ -73,8 +74,20 @@ class ConfigParser:
         """Get keyboard shortcut configuration"""
         return self.config.get('keyboard_shortcut', {})
     
+    def get_mtime(self) -> Optional[int]:
+        """Get the modification time of the configuration file"""
+        try:
+            return os.stat(self.config_path).st_mtime_ns
+        except OSError:
+            return None
+    
+    def is_modified(self) -> bool:
+        """Check whether the configuration file changed since it was loaded"""
+        return self.get_mtime() != self.mtime
+    
     def reload(self) -> None:
         """Reload configuration from file"""
+        self.mtime = self.get_mtime()
         self.config = self.load_config()
     
     def save_config(self) -> None:
@@ -1,8 +1,16 @@
+import gzip
+import hashlib
+import lzma
 import os
+import re
 import shutil
-from typing import List, Optional
+import uuid
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
 
+# Compressed test files keep their plain name plus one of these suffixes, e.g. in3.gz
+COMPRESSED_SUFFIXES = {'.gz': gzip, '.xz': lzma}
+
 class FileUtils:
     """Utility class for file and directory operations"""
     
@@ -32,6 +40,91 @@ class FileUtils:
             print(f"Failed to write file {file_path}: {e}")
             return False
     
+    @staticmethod
+    def get_file_hash(file_path: str) -> Optional[str]:
+        """Get the SHA-256 of a file's content, decompressed if it is stored compressed, or None if it cannot be read"""
+        try:
+            digest = hashlib.sha256()
+            with FileUtils.open_binary(file_path) as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+            return digest.hexdigest()
+        except OSError:
+            return None
+    
+    @staticmethod
+    def get_temp_path(directory: str, name: str) -> str:
+        """Get a hidden path next to name to stage its content in.
+        
+        Callers create it with open(path, 'xb') or os.mkdir rather than
+        tempfile, so it gets the same permissions as a normally written file.
+        """
+        return os.path.join(directory, f".{name}.tmp-{uuid.uuid4().hex[:12]}")
+    
+    @staticmethod
+    def write_files_atomic(directory: str, files: Dict[str, str], preserve: Optional[Set[str]] = None) -> Dict[str, str]:
+        """Write a set of files into a directory all at once, skipping files whose content is unchanged.
+        
+        A new directory is built in a temporary sibling and renamed into place.
+        In an existing directory only changed files are staged, then each is
+        renamed over its target, so nothing is modified unless every file was
+        written successfully. Files named in preserve are never overwritten.
+        A file kept compressed by TestStorage counts as unchanged when its
+        decompressed content matches; otherwise the new plain file replaces it.
+        Returns {filename: 'created' | 'updated' | 'unchanged' | 'preserved'}.
+        """
+        preserve = preserve or set()
+        encoded = {name: content.encode('utf-8') for name, content in files.items()}
+        parent = os.path.dirname(os.path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        
+        if not os.path.exists(directory):
+            staging = FileUtils.get_temp_path(parent, os.path.basename(directory))
+            os.mkdir(staging)
+            try:
+                for name, data in encoded.items():
+                    with open(os.path.join(staging, name), 'wb') as f:
+                        f.write(data)
+                os.rename(staging, directory)
+                return {name: 'created' for name in encoded}
+            except OSError:
+                shutil.rmtree(staging, ignore_errors=True)
+                # Another writer created the directory first; update it in place instead
+                if not os.path.isdir(directory):
+                    raise
+        
+        status = {}
+        staged = []
+        try:
+            for name, data in encoded.items():
+                target = os.path.join(directory, name)
+                stored = FileUtils.find_stored_file(target)
+                if not os.path.exists(stored):
+                    status[name] = 'created'
+                elif name in preserve:
+                    status[name] = 'preserved'
+                    continue
+                elif FileUtils.get_file_hash(stored) == hashlib.sha256(data).hexdigest():
+                    status[name] = 'unchanged'
+                    continue
+                else:
+                    status[name] = 'updated'
+                temp_path = FileUtils.get_temp_path(directory, name)
+                with open(temp_path, 'xb') as f:
+                    staged.append((temp_path, target))
+                    f.write(data)
+        except OSError:
+            for temp_path, _ in staged:
+                os.remove(temp_path)
+            raise
+        for temp_path, target in staged:
+            os.replace(temp_path, target)
+            # Drop compressed copies of the old content so readers cannot pick up stale data
+            for suffix in COMPRESSED_SUFFIXES:
+                if os.path.exists(target + suffix):
+                    os.remove(target + suffix)
+        return status
+    
     @staticmethod
     def read_file(file_path: str) -> Optional[str]:
         """Read content from a file"""
@@ -72,6 +165,60 @@ class FileUtils:
             print(f"Failed to list files in {directory}: {e}")
             return []
     
+    @staticmethod
+    def is_compressed(file_path: str) -> bool:
+        """Check whether a file is stored compressed, judging by its suffix"""
+        return os.path.splitext(file_path)[1] in COMPRESSED_SUFFIXES
+    
+    @staticmethod
+    def open_binary(file_path: str):
+        """Open a file for reading bytes, decompressing gzip/lzma files as they are read"""
+        module = COMPRESSED_SUFFIXES.get(os.path.splitext(file_path)[1])
+        if module:
+            return module.open(file_path, 'rb')
+        return open(file_path, 'rb')
+    
+    @staticmethod
+    def find_stored_file(file_path: str) -> str:
+        """Get the path a file is stored under: plain if it exists, else a compressed variant, else the plain path"""
+        if os.path.exists(file_path):
+            return file_path
+        for suffix in COMPRESSED_SUFFIXES:
+            if os.path.exists(file_path + suffix):
+                return file_path + suffix
+        return file_path
+    
+    @staticmethod
+    def get_test_sort_key(name: str) -> Tuple[int, ...]:
+        """Sort key for test names like '3' and split cases like '3.2'"""
+        return tuple(int(part) if part.isdigit() else 0 for part in name.split('.'))
+    
+    @staticmethod
+    def list_test_files(problem_dir: str, file_naming: Dict[str, str]) -> List[Tuple[str, str, str]]:
+        """List (number, input path, output path) for the test cases in a problem directory, ordered by number.
+        
+        Either file of a pair may be stored compressed (see COMPRESSED_SUFFIXES).
+        Cases split out of a multi-test sample are numbered like 3.1, 3.2 and
+        sort right after their sample.
+        """
+        input_prefix = file_naming.get('input_prefix', 'in')
+        input_suffix = file_naming.get('input_suffix', '')
+        output_prefix = file_naming.get('output_prefix', 'out')
+        output_suffix = file_naming.get('output_suffix', '')
+        compressed = '|'.join(re.escape(suffix) for suffix in COMPRESSED_SUFFIXES)
+        # in3 is a test, in3.2 the second case split out of it
+        pattern = re.compile(f"^{re.escape(input_prefix)}(\\d+(?:\\.\\d+)?){re.escape(input_suffix)}(?:{compressed})?$")
+        
+        tests = {}
+        for file in sorted(os.listdir(problem_dir)):
+            match = pattern.match(file)
+            # The plain name sorts first, so it wins if compaction was interrupted between its two renames
+            if match and match.group(1) not in tests:
+                number = match.group(1)
+                output_path = os.path.join(problem_dir, f"{output_prefix}{number}{output_suffix}")
+                tests[number] = (number, os.path.join(problem_dir, file), FileUtils.find_stored_file(output_path))
+        return sorted(tests.values(), key=lambda test: FileUtils.get_test_sort_key(test[0]))
+    
     @staticmethod
     def get_file_extension(file_path: str) -> str:
         """Get the file extension"""
@@ -0,0 +1,129 @@
+import json
+import math
+import os
+import queue
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+from src.checker import OutputChecker
+
+# Standalone worker script; it runs under the profile's interpreter, which may not be this one
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'warm_worker.py')
+
+class WarmPool:
+    """Pre-started interpreter processes that run Python solutions without paying interpreter startup.
+    
+    Each worker is a long-lived warm_worker.py with the common modules
+    already imported. A run is a fork of a worker, so it starts from the
+    warm interpreter in well under a millisecond instead of launching a new
+    one. Runs are dispatched from threads, one per worker, and a worker that
+    dies is replaced on the next run.
+    """
+    
+    def __init__(self, interpreter: str, size: int):
+        self.interpreter = interpreter
+        self.size = size
+        self.idle = queue.Queue()
+        self.workers: List[subprocess.Popen] = []
+        self.lock = threading.Lock()
+        self.closed = False
+        try:
+            for _ in range(size):
+                self.idle.put(self.start_worker())
+        except OSError:
+            for worker in list(self.workers):
+                self.stop_worker(worker)
+            raise
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix='warm-pool')
+    
+    def start_worker(self) -> subprocess.Popen:
+        """Launch one worker; raises OSError when the interpreter is missing"""
+        worker = subprocess.Popen([self.interpreter, WORKER_SCRIPT], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                  stderr=subprocess.DEVNULL, start_new_session=True)
+        with self.lock:
+            self.workers.append(worker)
+        return worker
+    
+    def stop_worker(self, worker: subprocess.Popen) -> None:
+        """Kill a worker that failed and forget it"""
+        with self.lock:
+            if worker in self.workers:
+                self.workers.remove(worker)
+        try:
+            worker.kill()
+            worker.wait()
+        except OSError:
+            pass
+    
+    def execute(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one request to an idle worker and wait for its reply"""
+        worker = self.idle.get()
+        try:
+            worker.stdin.write(json.dumps(request).encode('utf-8') + b'\n')
+            worker.stdin.flush()
+            line = worker.stdout.readline()
+            if not line:
+                raise OSError(f"warm {self.interpreter} worker exited")
+            return json.loads(line)
+        except (OSError, ValueError):
+            self.stop_worker(worker)
+            worker = self.start_worker()
+            raise
+        finally:
+            self.idle.put(worker)
+    
+    def run_test(self, source: str, test: Dict[str, str], time_limit: float, memory_limit: int,
+                 limit_address_space: bool = True, checker: Optional[OutputChecker] = None) -> Dict[str, Any]:
+        """Run a Python source on one test in a warm worker; same result shape as judge.run_test"""
+        # Imported here because src.judge imports this module
+        from src.judge import new_result, check_result
+        cpu_seconds = math.ceil(time_limit) + 1
+        result = new_result(test)
+        request = {
+            'source': os.path.abspath(source),
+            'input': os.path.abspath(test['input']),
+            'output': os.path.abspath(test['actual']),
+            'stderr': os.path.abspath(test['stderr']),
+            'cpu_seconds': cpu_seconds,
+            'memory_bytes': memory_limit if limit_address_space else 0,
+            'wall_seconds': time_limit * 2 + 1
+        }
+        try:
+            reply = self.execute(request)
+        except (OSError, ValueError) as e:
+            result['verdict'] = 'RE'
+            result['detail'] = f"Failed to run solution: {e}"
+            return result
+        if 'error' in reply:
+            result['verdict'] = 'RE'
+            result['detail'] = f"Failed to run solution: {reply['error']}"
+            return result
+        result['wall_ms'] = reply['wall_ms']
+        result['cpu_ms'] = reply['cpu_ms']
+        result['peak_rss_kb'] = reply['peak_rss_kb']
+        result['exit_code'] = os.waitstatus_to_exitcode(reply['status'])
+        return check_result(result, test, time_limit, memory_limit, reply['timed_out'], checker)
+    
+    def submit(self, source: str, test: Dict[str, str], time_limit: float, memory_limit: int,
+               limit_address_space: bool = True, checker: Optional[OutputChecker] = None) -> Future:
+        """Queue a run; the future resolves to the test result"""
+        return self.executor.submit(self.run_test, source, test, time_limit, memory_limit, limit_address_space, checker)
+    
+    def close(self) -> None:
+        """Wait for queued runs and stop every worker"""
+        if self.closed:
+            return
+        self.closed = True
+        self.executor.shutdown(wait=True)
+        with self.lock:
+            workers = list(self.workers)
+            self.workers = []
+        for worker in workers:
+            try:
+                # EOF on stdin ends the worker's request loop
+                worker.stdin.close()
+                worker.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                worker.kill()
+                worker.wait()
@@ -0,0 +1,143 @@
+"""Pre-started interpreter that runs Python solutions on tests without paying interpreter startup.
+
+Started by WarmPool with the interpreter of a language profile (python3,
+pypy3, ...), so it only uses the standard library. It reads one JSON request
+per line on stdin and forks a child per request. The child redirects its
+standard streams to the test files, applies the limits and runs the solution
+as __main__. The parent waits for the child and writes one JSON reply line
+with the wait status and the child's resource usage.
+"""
+import atexit
+import gc
+import gzip
+import importlib
+import json
+import lzma
+import os
+import resource
+import runpy
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
+import traceback
+
+# Modules solutions commonly import; loaded once here so every forked run starts with them
+PRELOAD = ['array', 'bisect', 'collections', 'copy', 'decimal', 'fractions', 'functools', 'heapq',
+           'io', 'itertools', 'math', 'operator', 'random', 're', 'string', 'typing']
+COMPRESSED = {'.gz': gzip, '.xz': lzma}
+
+def open_input(path: str) -> int:
+    """Get a readable file descriptor with the test input, decompressing compressed tests to a temporary file"""
+    module = COMPRESSED.get(os.path.splitext(path)[1])
+    if not module:
+        return os.open(path, os.O_RDONLY)
+    # A real file rather than a pipe, so solutions that fstat or os.read fd 0 keep working
+    temp = tempfile.TemporaryFile()
+    with module.open(path, 'rb') as source:
+        shutil.copyfileobj(source, temp, 1 << 20)
+    temp.seek(0)
+    return os.dup(temp.fileno())
+
+def finish_interpreter() -> None:
+    """Do what a normal interpreter exit does before os._exit skips it: wait for threads, run atexit handlers"""
+    # Solutions often run main() in a thread started with a larger stack size and return right away
+    shutdown = getattr(threading, '_shutdown', None)
+    if shutdown:
+        shutdown()
+    else:
+        for thread in threading.enumerate():
+            if thread is not threading.main_thread() and not thread.daemon:
+                thread.join()
+    atexit._run_exitfuncs()
+
+def run_child(request) -> None:
+    """Runs in the forked child: set up the streams and limits, run the solution, never return"""
+    code = 1
+    try:
+        cpu_seconds = request['cpu_seconds']
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+        if request['memory_bytes']:
+            resource.setrlimit(resource.RLIMIT_AS, (request['memory_bytes'], request['memory_bytes']))
+            resource.setrlimit(resource.RLIMIT_STACK, (request['memory_bytes'], request['memory_bytes']))
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+        os.dup2(open_input(request['input']), 0)
+        os.dup2(os.open(request['output'], flags, 0o644), 1)
+        os.dup2(os.open(request['stderr'], flags, 0o644), 2)
+        sys.stdin = open(0, 'r', closefd=False)
+        sys.stdout = open(1, 'w', closefd=False)
+        sys.stderr = open(2, 'w', closefd=False)
+        sys.argv = [request['source']]
+        sys.path[0] = os.path.dirname(request['source'])
+        code = 0
+        try:
+            runpy.run_path(request['source'], run_name='__main__')
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                code = e.code or 0
+            else:
+                print(e.code, file=sys.stderr)
+                code = 1
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finish_interpreter()
+        sys.stdout.flush()
+        sys.stderr.flush()
+    except BaseException:
+        # Flushing a large output can fail too, e.g. with MemoryError
+        try:
+            traceback.print_exc()
+        except BaseException:
+            pass
+        code = 1
+    finally:
+        os._exit(code)
+
+def run(request):
+    """Fork a child for one request and report how it ended"""
+    sys.stdout.flush()
+    start = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        run_child(request)
+    timed_out = threading.Event()
+    
+    def kill():
+        timed_out.set()
+        os.kill(pid, signal.SIGKILL)
+    
+    # The CPU rlimit does not catch a solution that sleeps or blocks, so also bound wall time
+    timer = threading.Timer(request['wall_seconds'], kill)
+    timer.start()
+    try:
+        _, status, usage = os.wait4(pid, 0)
+    finally:
+        timer.cancel()
+        timer.join()
+    return {'status': status, 'wall_ms': (time.perf_counter() - start) * 1000,
+            'cpu_ms': (usage.ru_utime + usage.ru_stime) * 1000, 'peak_rss_kb': usage.ru_maxrss,
+            'timed_out': timed_out.is_set()}
+
+def main() -> None:
+    for name in PRELOAD:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+    if hasattr(gc, 'freeze'):
+        # Keep the preloaded objects out of collections in the children, so their pages stay shared
+        gc.freeze()
+    requests = sys.stdin.buffer
+    for line in requests:
+        try:
+            reply = run(json.loads(line))
+        except Exception as e:
+            reply = {'error': f"{type(e).__name__}: {e}"}
+        sys.stdout.write(json.dumps(reply) + '\n')
+        sys.stdout.flush()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,293 @@
+import ctypes
+import ctypes.util
+import os
+import re
+import select
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Set
+from src.utils.config_parser import ConfigParser
+from src.utils.file_utils import FileUtils, COMPRESSED_SUFFIXES
+from src.judge import Judge, CompilationError, RESULT_HEADER, format_result
+
+# inotify event flags from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct('iIII')
+
+def is_hidden(path: str) -> bool:
+    """Build directories, temp files and staging directories all start with a dot"""
+    return os.path.basename(path).startswith('.')
+
+class InotifyWatcher:
+    """Reports changed paths in a set of directories using Linux inotify"""
+    
+    MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE
+    
+    def __init__(self):
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_init1 failed: {os.strerror(error)}")
+        self.watches = {}
+        self.roots = set()
+    
+    def add(self, directory: str, root: bool = False) -> None:
+        """Watch a directory; subdirectories created inside a root are watched too"""
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"Cannot watch {directory}: {os.strerror(error)}")
+        self.watches[wd] = directory
+        if root:
+            self.roots.add(directory)
+    
+    def wait(self, timeout: Optional[float]) -> List[str]:
+        """Block until something changes or the timeout passes; returns the changed paths"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        data = os.read(self.fd, 64 * 1024)
+        paths = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b'\0')
+            offset += EVENT_HEADER.size + length
+            directory = self.watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                # A new problem directory appeared (or was renamed into place)
+                if mask & (IN_CREATE | IN_MOVED_TO) and directory in self.roots and not is_hidden(path):
+                    self.add(path)
+                continue
+            paths.append(path)
+        return paths
+    
+    def close(self) -> None:
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Reports changed paths by comparing modification times, for systems without inotify"""
+    
+    def __init__(self, interval: float = 0.25):
+        self.interval = interval
+        self.directories = []
+        self.roots = set()
+        self.snapshot = {}
+    
+    @staticmethod
+    def scan(directory: str) -> Dict[str, Any]:
+        """Map each file in a directory to its (mtime, size)"""
+        files = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            pass
+        return files
+    
+    def add(self, directory: str, root: bool = False) -> None:
+        """Watch a directory; subdirectories created inside a root are watched too"""
+        self.directories.append(directory)
+        self.snapshot.update(self.scan(directory))
+        if root:
+            self.roots.add(directory)
+    
+    def wait(self, timeout: Optional[float]) -> List[str]:
+        """Sleep one polling interval (or the timeout) and return the paths that changed"""
+        time.sleep(self.interval if timeout is None else min(self.interval, timeout))
+        for root in self.roots:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    if entry.is_dir() and not is_hidden(entry.path) and entry.path not in self.directories:
+                        self.add(entry.path)
+        current = {}
+        for directory in self.directories:
+            current.update(self.scan(directory))
+        changed = [path for path, stamp in current.items() if self.snapshot.get(path) != stamp]
+        changed.extend(path for path in self.snapshot if path not in current)
+        self.snapshot = current
+        return changed
+    
+    def close(self) -> None:
+        pass
+
+class SolutionWatcher:
+    """Recompiles and retests problems as their solution or test files are saved.
+    
+    A changed solution reruns every test, starting with the ones that failed
+    last time; a changed in{i}/out{i} reruns only that test. Results are
+    printed as soon as each test finishes.
+    """
+    
+    def __init__(self, config: ConfigParser):
+        self.config = config
+        self.judge = Judge(config)
+        self.file_naming = config.get_file_naming()
+        self.solution_files = set(self.judge.profiles.get_solution_files())
+        self.debounce = config.get('watch.debounce', 0.15)
+        self.stop_on_failure = config.get('watch.stop_on_failure', False)
+        self.poll_interval = config.get('watch.poll_interval', 0.25)
+        self.failing = {}
+        self.pool = None
+        input_prefix = re.escape(self.file_naming.get('input_prefix', 'in'))
+        input_suffix = re.escape(self.file_naming.get('input_suffix', ''))
+        output_prefix = re.escape(self.file_naming.get('output_prefix', 'out'))
+        output_suffix = re.escape(self.file_naming.get('output_suffix', ''))
+        compressed = '|'.join(re.escape(suffix) for suffix in COMPRESSED_SUFFIXES)
+        self.test_pattern = re.compile(f"^(?:{input_prefix}(\\d+(?:\\.\\d+)?){input_suffix}|"
+                                       f"{output_prefix}(\\d+(?:\\.\\d+)?){output_suffix})"
+                                       f"(?:{compressed})?$")
+    
+    def create_watcher(self, poll: bool = False):
+        """Use inotify where available, polling otherwise"""
+        if not poll:
+            try:
+                return InotifyWatcher()
+            except (OSError, AttributeError) as e:
+                print(f"inotify unavailable, polling for changes instead: {e}")
+        return PollingWatcher(self.poll_interval)
+    
+    def classify(self, path: str) -> Optional[str]:
+        """Get 'solution', a test number, or None for files that do not affect the results"""
+        name = os.path.basename(path)
+        if name in self.solution_files:
+            return 'solution'
+        match = self.test_pattern.match(name)
+        if match:
+            return match.group(1) or match.group(2)
+        return None
+    
+    def has_solution(self, directory: str) -> bool:
+        """Check whether a directory holds a solution in any configured language"""
+        return any(os.path.exists(os.path.join(directory, name)) for name in self.solution_files)
+    
+    def collect_changes(self, watcher, paths: List[str]) -> Dict[str, Set[str]]:
+        """Wait until saves settle, then group the changes by problem directory"""
+        deadline = time.monotonic() + self.debounce
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            more = watcher.wait(remaining)
+            if more:
+                paths.extend(more)
+                deadline = time.monotonic() + self.debounce
+        changes = {}
+        for path in paths:
+            kind = self.classify(path)
+            if kind is not None:
+                changes.setdefault(os.path.dirname(path), set()).add(kind)
+        return changes
+    
+    def get_pool(self) -> ProcessPoolExecutor:
+        """Start the test workers once and keep them for every run"""
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.judge.workers)
+            # Fork the workers now rather than on the first save
+            list(self.pool.map(abs, range(self.judge.workers)))
+        return self.pool
+    
+    def run_problem(self, problem_dir: str, test_names: Optional[Set[str]] = None) -> Optional[bool]:
+        """Compile if needed and run the given tests (all if None), printing each result as it finishes"""
+        name = os.path.basename(os.path.normpath(problem_dir))
+        if not self.has_solution(problem_dir):
+            return None
+        timestamp = datetime.now().strftime('%H:%M:%S')
+        start = time.perf_counter()
+        try:
+            program, cached = self.judge.compile(problem_dir)
+        except CompilationError as e:
+            print(f"[{timestamp}] {name}: compilation failed")
+            print(e)
+            return False
+        except OSError as e:
+            print(f"[{timestamp}] {name}: failed to compile: {e}")
+            return False
+        compile_ms = (time.perf_counter() - start) * 1000
+        time_limit, memory_limit = self.judge.get_limits(problem_dir)
+        tests = self.judge.find_tests(problem_dir)
+        if test_names is not None:
+            tests = [test for test in tests if test['name'] in test_names]
+        if not tests:
+            print(f"[{timestamp}] {name}: no tests to run")
+            return None
+        # Tests that failed last time first, since they are the likeliest to fail again
+        failing = self.failing.setdefault(problem_dir, set())
+        tests.sort(key=lambda test: (test['name'] not in failing, FileUtils.get_test_sort_key(test['name'])))
+        print(f"[{timestamp}] {name}: {program['language']}, "
+              f"{'cached build' if cached else f'built in {compile_ms:.0f} ms'}, "
+              f"running {len(tests)} test(s)")
+        print(RESULT_HEADER)
+        
+        # A real executor even for warm programs, which fall back to it when their pool cannot start
+        pool = self.get_pool()
+        futures = {self.judge.submit(pool, program, test, time_limit, memory_limit) for test in tests}
+        passed = failed = 0
+        results = []
+        while futures:
+            done, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                results.append(result)
+                print(format_result(result), flush=True)
+                if result['verdict'] == 'OK':
+                    passed += 1
+                    failing.discard(result['test'])
+                else:
+                    failed += 1
+                    failing.add(result['test'])
+            if failed and self.stop_on_failure and futures:
+                for future in futures:
+                    future.cancel()
+                print(f"Stopped after the first failure, {len(futures)} test(s) not run")
+                break
+        print(f"Passed {passed}/{passed + failed} tests in {(time.perf_counter() - start) * 1000:.0f} ms")
+        if self.judge.history:
+            self.judge.history.record(problem_dir, results, source=program['source'])
+        return failed == 0
+    
+    def watch(self, path: str, poll: bool = False) -> None:
+        """Watch a problem directory, or every problem in a directory of problems, until interrupted"""
+        path = os.path.abspath(path)
+        watcher = self.create_watcher(poll)
+        single = self.has_solution(path)
+        try:
+            if single:
+                watcher.add(path)
+            else:
+                watcher.add(path, root=True)
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.is_dir() and not is_hidden(entry.path):
+                            watcher.add(entry.path)
+            print(f"Watching {path} ({type(watcher).__name__}), press Ctrl+C to stop")
+            if single:
+                self.run_problem(path)
+            while True:
+                paths = watcher.wait(None)
+                if not paths:
+                    continue
+                for problem_dir, kinds in self.collect_changes(watcher, paths).items():
+                    self.run_problem(problem_dir, None if 'solution' in kinds else kinds)
+        except KeyboardInterrupt:
+            print()
+        finally:
+            watcher.close()
+            if self.pool:
+                self.pool.shutdown(cancel_futures=True)
+            self.judge.close()
@@ -3,6 +3,31 @@ import subprocess
 import sys
 import os
 import signal
+import urllib.request
+from src.utils.config_parser import ConfigParser
+
+CONFIG_PATH = "config/settings.json"
+# The server bounds each of its shutdown steps (HTTP requests, queued jobs, file opening) by drain_timeout
+SHUTDOWN_STEPS = 3
+# Extra seconds for the server process to exit after draining
+SHUTDOWN_MARGIN = 5
+
+def load_server_settings():
+    """Get the port, health check URL and drain timeout the server will use, from settings.json"""
+    try:
+        server = ConfigParser(CONFIG_PATH).get('server') or {}
+    except Exception as e:
+        print(f"Failed to read {CONFIG_PATH}, using default server settings: {e}")
+        server = {}
+    host = server.get('host', '127.0.0.1')
+    port = server.get('port', 8765)
+    # A server listening on all interfaces is probed through loopback
+    probe_host = '127.0.0.1' if host in ('0.0.0.0', '') else ('[::1]' if host == '::' else host)
+    return {
+        'port': port,
+        'health_url': f"http://{probe_host}:{port}/healthz",
+        'drain_timeout': server.get('drain_timeout', 30)
+    }
 
 # Center the window on the screen
 def center_window(win, width=320, height=140):
@@ -11,9 +36,8 @@ def center_window(win, width=320, height=140):
     y = (win.winfo_screenheight() // 2) - (height // 2)
     win.geometry(f"{width}x{height}+{x}+{y}")
 
-# Free port 8765 before starting server
-def free_port_8765():
-    port = "8765"
+# Free the server port before starting server
+def free_port(port):
     if os.name == 'nt':
         result = subprocess.run(f'netstat -ano | findstr :{port}', shell=True, capture_output=True, text=True)
         for line in result.stdout.splitlines():
@@ -56,33 +80,72 @@ class ServerGUI:
         self.exit_button.pack(pady=(5, 10))
 
         self.server_process = None
+        self.settings = load_server_settings()
         master.protocol("WM_DELETE_WINDOW", self.on_exit)
 
     def start_server(self):
         if not self.server_process:
-            free_port_8765()
+            # Read the settings again, the server picks up any change when it starts
+            self.settings = load_server_settings()
+            free_port(self.settings['port'])
             if os.name == 'nt':
                 self.server_process = subprocess.Popen([sys.executable, 'cf_receiver.py'], creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
             else:
                 self.server_process = subprocess.Popen([sys.executable, 'cf_receiver.py'], preexec_fn=os.setsid)
-            self.status_label.config(text="Status: Running", fg="#5cb85c")
+            self.status_label.config(text="Status: Starting...", fg="#f0ad4e")
             self.start_button.config(state=tk.DISABLED)
             self.stop_button.config(state=tk.NORMAL)
+            self.wait_until_ready(self.server_process)
+
+    def wait_until_ready(self, process):
+        # Only report Running once the server answers its readiness probe
+        if process is not self.server_process:
+            return
+        if process.poll() is not None:
+            self.server_process = None
+            self.set_stopped("Status: Failed to start")
+            return
+        try:
+            with urllib.request.urlopen(self.settings['health_url'], timeout=0.5) as response:
+                if response.status == 200:
+                    self.status_label.config(text="Status: Running", fg="#5cb85c")
+                    return
+        except Exception:
+            pass
+        self.master.after(250, self.wait_until_ready, process)
 
     def stop_server(self):
         if self.server_process:
+            # Ask the server to shut down gracefully so queued problems are still written
             if os.name == 'nt':
-                self.server_process.terminate()
+                self.server_process.send_signal(signal.CTRL_BREAK_EVENT)
             else:
                 os.killpg(os.getpgid(self.server_process.pid), signal.SIGTERM)
+            process = self.server_process
             self.server_process = None
-            self.status_label.config(text="Status: Stopped", fg="#d9534f")
-            self.start_button.config(state=tk.NORMAL)
+            self.status_label.config(text="Status: Stopping...", fg="#f0ad4e")
             self.stop_button.config(state=tk.DISABLED)
+            self.wait_until_stopped(process)
+
+    def wait_until_stopped(self, process):
+        if process.poll() is None:
+            self.master.after(250, self.wait_until_stopped, process)
+        else:
+            self.set_stopped("Status: Stopped")
+
+    def set_stopped(self, text):
+        self.status_label.config(text=text, fg="#d9534f")
+        self.start_button.config(state=tk.NORMAL)
+        self.stop_button.config(state=tk.DISABLED)
 
     def on_exit(self):
-        if self.server_process:
+        process = self.server_process
+        if process:
             self.stop_server()
+            try:
+                process.wait(timeout=self.settings['drain_timeout'] * SHUTDOWN_STEPS + SHUTDOWN_MARGIN)
+            except subprocess.TimeoutExpired:
+                process.kill()
         self.master.destroy()
 
 if __name__ == "__main__":
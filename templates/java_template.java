@@ -0,0 +1,40 @@
+/*
+ * Problem: {problem_name}
+ * Problem ID: {problem_id}
+ * URL: {problem_url}
+ * Created: {date}
+ */
+
+import java.io.*;
+import java.util.*;
+
+public class Main {
+    static BufferedReader in = new BufferedReader(new InputStreamReader(System.in));
+    static PrintWriter out = new PrintWriter(new BufferedWriter(new OutputStreamWriter(System.out)));
+    static StringTokenizer tokens = new StringTokenizer("");
+
+    static String next() throws IOException {
+        while (!tokens.hasMoreTokens()) {
+            tokens = new StringTokenizer(in.readLine());
+        }
+        return tokens.nextToken();
+    }
+
+    static int nextInt() throws IOException {
+        return Integer.parseInt(next());
+    }
+
+    static void solve() throws IOException {
+        
+    }
+
+    public static void main(String[] args) throws IOException {
+        int T = 1;
+        T = nextInt();
+
+        for (int I = 1; I <= T; I++) {
+            solve();
+        }
+        out.flush();
+    }
+}
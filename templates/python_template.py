@@ -0,0 +1,22 @@
+# Problem: {problem_name}
+# Problem ID: {problem_id}
+# URL: {problem_url}
+# Created: {date}
+
+import sys
+input = sys.stdin.readline
+
+
+def solve():
+    pass
+
+
+def main():
+    T = 1
+    T = int(input())
+
+    for I in range(1, T + 1):
+        solve()
+
+
+main()
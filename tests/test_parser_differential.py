@@ -0,0 +1,32 @@
+"""Differential test of the lxml fast parser against the BeautifulSoup parser.
+
+The receiver uses parse_problem_lxml and only falls back to BeautifulSoup
+on a mismatch when parser.verify is enabled, so the two must agree on every
+page in benchmarks/fixtures.
+
+Usage: python3 -m pytest tests
+"""
+import glob
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from src.html_parser import CodeforcesHTMLParser
+
+FIXTURE_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+FIXTURES = sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html")))
+
+def test_fixtures_present():
+    assert FIXTURES, f"No fixtures found in {FIXTURE_DIR}"
+
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+def test_lxml_matches_beautifulsoup(path):
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+    fast = CodeforcesHTMLParser.parse_problem_lxml(html)
+    reference = CodeforcesHTMLParser.parse_problem(html)
+    assert CodeforcesHTMLParser.results_match(fast, reference)